@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -14,4 +15,46 @@ engine = create_engine(
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # 4. "Base" sınıfını BURADA yaratıyoruz.
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
+
+
+# 5. Toplu upsert (INSERT ... ON CONFLICT) - ORM unit of work'e uğramadan, parça parça executemany
+def bulk_insert(db, model, rows, chunk_size=500):
+    """
+    rows (dict listesi) tablosuna core INSERT executemany ile parça parça yazılır
+    (ORM unit of work yok; doğal anahtarı olmayan log tabloları için).
+    Commit çağırana bırakılır.
+    """
+    table = model.__table__
+    for i in range(0, len(rows), chunk_size):
+        db.execute(table.insert(), rows[i:i + chunk_size])
+    return len(rows)
+
+
+def bulk_upsert(db, model, rows, conflict_cols, update_cols=None, chunk_size=500, increment_cols=()):
+    """
+    rows (dict listesi) tablosuna toplu yazılır. conflict_cols çakışırsa
+    update_cols güncellenir (None ise çakışmayan tüm kolonlar, [] ise satır atlanır).
+    increment_cols içindeki kolonlar üzerine yazılmaz, mevcut değere eklenir (sayaç/toplam tabloları).
+    Commit çağırana bırakılır, böylece birden fazla çağrı tek transaction'da kalır.
+    """
+    if not rows:
+        return 0
+    table = model.__table__
+    if update_cols is None:
+        update_cols = [c for c in rows[0].keys() if c not in conflict_cols]
+
+    for i in range(0, len(rows), chunk_size):
+        stmt = sqlite_insert(table)
+        if update_cols:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=conflict_cols,
+                set_={
+                    c: (table.c[c] + stmt.excluded[c]) if c in increment_cols else stmt.excluded[c]
+                    for c in update_cols
+                },
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=conflict_cols)
+        db.execute(stmt, rows[i:i + chunk_size])
+    return len(rows)
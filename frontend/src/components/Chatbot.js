@@ -1,6 +1,6 @@
 import { useState, useEffect, useRef } from 'react';
 import { useAuth } from '../context/AuthContext';
-import { getChatbotFields, sendChatbotMessage } from '../services/api';
+import { getChatbotFields, streamChatbotMessage } from '../services/api';
 import aiIcon from '../assets/icons/ai.png';
 import generativeIcon from '../assets/icons/generative.png';
 import './Chatbot.css';
@@ -11,6 +11,7 @@ const Chatbot = () => {
   const [fields, setFields] = useState([]);
   const [selectedField, setSelectedField] = useState(null);
   const [messages, setMessages] = useState([]);
+  const [conversationId, setConversationId] = useState(null);
   const [input, setInput] = useState('');
   const [loading, setLoading] = useState(false);
   const [fieldsLoading, setFieldsLoading] = useState(false);
@@ -50,6 +51,7 @@ const Chatbot = () => {
 
   const handleFieldSelect = (field) => {
     setSelectedField(field);
+    setConversationId(null);
     setMessages([
       {
         role: 'assistant',
@@ -69,20 +71,25 @@ const Chatbot = () => {
     setLoading(true);
 
     try {
-      // Geçmişi hazırla (system hariç, sadece user/assistant)
-      const history = messages.map((m) => ({ role: m.role, content: m.content }));
-
-      const res = await sendChatbotMessage(
+      // Geçmiş sunucuda tutulur; sadece konuşma id'si gönderilir
+      // Cevap token token geldikçe son mesaj güncellenir
+      let partial = '';
+      const { reply, conversationId: newConversationId } = await streamChatbotMessage(
         user.id,
         selectedField.id,
         text,
-        history
+        conversationId,
+        (token) => {
+          partial += token;
+          setMessages([...newMessages, { role: 'assistant', content: partial }]);
+        }
       );
 
-      setMessages([...newMessages, { role: 'assistant', content: res.data.reply }]);
+      setConversationId(newConversationId);
+      setMessages([...newMessages, { role: 'assistant', content: reply }]);
     } catch (err) {
       console.error('Chatbot hatası:', err);
-      const errorMsg = err.response?.data?.detail || 'Bir hata oluştu, lütfen tekrar deneyin.';
+      const errorMsg = err.message || 'Bir hata oluştu, lütfen tekrar deneyin.';
       setMessages([
         ...newMessages,
         { role: 'assistant', content: `⚠️ ${errorMsg}` },
@@ -101,6 +108,7 @@ const Chatbot = () => {
 
   const handleBack = () => {
     setSelectedField(null);
+    setConversationId(null);
     setMessages([]);
     setInput('');
   };
@@ -1,6 +1,6 @@
 import { useState, useEffect, useMemo } from 'react';
 import { useAuth } from '../context/AuthContext';
-import { getFields, checkAllFields, getCurrentWeather } from '../services/api';
+import { getFields, checkAllFields, getCurrentWeather, subscribeUserStream } from '../services/api';
 import { MOCK_IRRIGATION_PLANS } from './IrrigationPlan';
 import Card from '../components/Card';
 import './Dashboard.css';
@@ -45,6 +45,18 @@ const Dashboard = () => {
         fetchDashboard();
     }, [user.id]);
 
+    // Karar değişiklikleri canlı akıştan gelir (yeniden polling yok)
+    useEffect(() => {
+        return subscribeUserStream(user.id, {
+            karar: (k) => setIrrigationResults(prev => prev && ({
+                ...prev,
+                tarlalar: prev.tarlalar.map(t => t.tarla_id === k.tarla_id
+                    ? { ...t, karar_ozeti: k.durum, pompa: k.pompa, detay: k.detay }
+                    : t),
+            })),
+        });
+    }, [user.id]);
+
     // Sulama kararlarından aktif ve sonraki sulamayı çıkar
     const getIrrigationInfo = () => {
         if (!irrigationResults || !irrigationResults.tarlalar) return { active: null, next: null, urgentFields: [] };
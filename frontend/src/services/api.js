@@ -57,7 +57,48 @@ export const getSensors = (userId) =>
 export const getChatbotFields = (userId) =>
   API.get(`/chatbot/fields/${userId}`);
 
-export const sendChatbotMessage = (userId, fieldId, message, history = []) =>
-  API.post('/chatbot/message', { user_id: userId, field_id: fieldId, message, history });
+// Geçmiş sunucuda tutulur: ilk mesajda conversationId null, sonrakilerde dönen id gönderilir.
+// Cevabı token token alır: onToken(parça) her token'da, Promise { reply, conversationId } ile çözülür.
+// signal (AbortController) ile iptal edilince sunucu da üretimi durdurur.
+export const streamChatbotMessage = async (userId, fieldId, message, conversationId = null, onToken = () => {}, signal) => {
+  const res = await fetch(`${API.defaults.baseURL}/chatbot/message/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ user_id: userId, field_id: fieldId, message, conversation_id: conversationId }),
+    signal,
+  });
+  if (!res.ok) throw new Error((await res.json()).detail || 'Chatbot hatası');
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let reply = '';
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    const events = buffer.split('\n\n');
+    buffer = events.pop();
+    for (const raw of events) {
+      const event = raw.match(/^event: (.*)$/m)?.[1];
+      const data = JSON.parse(raw.match(/^data: (.*)$/m)?.[1] || '{}');
+      if (event === 'token') { reply += data.content; onToken(data.content); }
+      else if (event === 'done') return { reply: data.reply, conversationId: data.conversation_id };
+      else if (event === 'hata') throw new Error(data.detail);
+    }
+  }
+  return { reply, conversationId: Number(res.headers.get('X-Conversation-Id')) || conversationId };
+};
+
+// ========== CANLI AKIŞ (SSE) ==========
+// handlers: { sensor, karar, bildirim, sulama } -> her biri JSON veriyi alır
+// Dönen fonksiyon bağlantıyı kapatır (useEffect cleanup'ında çağırın)
+export const subscribeUserStream = (userId, handlers = {}) => {
+  const source = new EventSource(`${API.defaults.baseURL}/stream/user/${userId}`);
+  Object.entries(handlers).forEach(([eventName, handler]) => {
+    source.addEventListener(eventName, (e) => handler(JSON.parse(e.data)));
+  });
+  return () => source.close();
+};
 
 export default API;
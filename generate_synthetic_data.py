@@ -0,0 +1,493 @@
+"""
+AquaSmart — Yük Testi İçin Sentetik Veri Üretici
+================================================
+seed_db.py'deki 12 senaryoyu (TARLA_SABLONLARI + SCENARIO_CONFIG) N kullanıcı × M tarla ×
+D gün ölçeğine taşır. Senaryo üreticilerinin (generate_kritik_data, generate_ml_guven_data ...)
+dağılımları NumPy ile vektörel olarak yeniden yazılmıştır: tarla başına tek çağrıda tüm
+ölçümler dizi olarak üretilir, satır satır random.uniform döngüsü yoktur. Parametreler
+(aralıklar, son ölçüm, sulama planı) seed_db'deki SENARYO_PARAMETRELERI ve
+SULAMA_PLANLARI tablolarından okunur; iki üretici aynı veriyi paylaşır.
+
+  - Tarla j, j % 12 numaralı şablonun konumunu, bitkisini ve senaryosunu alır
+  - Okuma sıklığı dakika cinsinden serbest (--siklik 15 -> günde 96 ölçüm)
+  - Her tarlanın kendi RNG'si (seed, tarla no) ile türetilir: aynı --seed her zaman aynı
+    veriyi verir; parça boyutu ve çıktı türü sonucu değiştirmez
+  - db: kayıtlar parça parça core INSERT ile tek transaction'da yazılır
+  - csv: tablo başına bir dosya, parça parça eklenir (SQLite dışı hedeflere yüklemek için)
+  - Sulama planı 60 günlük geçmiş için yazılmıştır; senaryoların son günleri sulamasızdır
+    (kritik senaryolarda 10 gün). --gun 15 ve altında bazı tarlalarda hiç sulama kaydı olmaz
+
+Kullanım:
+  python generate_synthetic_data.py --kullanici 1000 --tarla 10 --gun 60 --siklik 15
+  python generate_synthetic_data.py --kullanici 100 --tarla 100 --cikti csv --dizin yuk_verisi
+"""
+
+import argparse
+import datetime
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func
+
+import models
+import seed_db
+from database import SessionLocal, engine, bulk_insert
+from seed_db import (
+    NOW, DAYS, IKLIM_AYLIK, VARSAYILAN_IKLIM, MIKTAR_OLASILIK_ESIGI, SCENARIO_CONFIG, SENARYO_PARAMETRELERI,
+    SULAMA_PLANLARI, TARLA_SABLONLARI,
+)
+from services import irrigation_stats
+
+# ╔══════════════════════════════════════════════════════════════════════╗
+# ║  VEKTÖREL SENARYO ÇEKİRDEKLERİ                                     ║
+# ╚══════════════════════════════════════════════════════════════════════╝
+# Her çekirdek seed_db'deki aynı adlı üreticinin dağılımını, aynı parametrelerle
+# (seed_db.SENARYO_PARAMETRELERI) dizi olarak üretir.
+# p: senaryo parametreleri, gun: ölçümün NOW'dan kaç tam gün önce olduğu, oglen: saat >= 14
+# Dönüş: (nem, yagiyor, yagis_olasiligi, beklenen_yagis)
+
+
+def _miktar(rng, olasilik, p):
+    """olasılık eşiğin üstündeyse miktar_yuksek, değilse miktar_dusuk aralığından yağış miktarı"""
+    n = len(olasilik)
+    return np.where(
+        olasilik > MIKTAR_OLASILIK_ESIGI, rng.uniform(*p["miktar_yuksek"], n), rng.uniform(*p["miktar_dusuk"], n),
+    )
+
+
+def _kritik(rng, p, gun, oglen, son_nem):
+    n = len(gun)
+    e, t = p["eski"], p["trend"]
+    eski = gun > p["trend_gun"]
+    ilerleme = (p["trend_gun"] - gun) / p["trend_gun"]
+    nem = np.where(eski, rng.uniform(*e["nem"], n), t["bas"] - ilerleme * (t["bas"] - son_nem))
+    nem -= oglen * np.where(eski, rng.uniform(*e["oglen"], n), rng.uniform(*t["oglen"], n))
+    yagiyor = eski & (rng.random(n) < e["yagis_orani"])
+    nem += yagiyor * rng.uniform(*e["yagis_artisi"], n) + ~eski * rng.uniform(*t["gurultu"], n)
+    olasilik = np.where(eski, rng.uniform(*e["olasilik"], n), rng.uniform(*t["olasilik"], n))
+    return np.clip(nem, *p["sinir"]), yagiyor, olasilik, _miktar(rng, olasilik, p)
+
+
+def _ml_guvenme(rng, p, gun, oglen, son_nem):
+    n = len(gun)
+    nem = rng.uniform(*p["nem"], n) - oglen * rng.uniform(*p["oglen"], n)
+    olasilik = rng.uniform(*p["olasilik"], n)
+    miktar = rng.uniform(*p["miktar"], n)
+    yagiyor = rng.random(n) < p["yagis_orani"]
+    nem += yagiyor * rng.uniform(*p["yagis_artisi"], n)
+    return np.clip(nem, *p["sinir"]), yagiyor, olasilik, miktar
+
+
+def _ml_guven(rng, p, gun, oglen, son_nem):
+    n = len(gun)
+    var, yok = p["tahminli"], p["tahminsiz"]
+    tahmin_var = rng.random(n) < p["tahmin_orani"]
+    olasilik = np.where(tahmin_var, rng.uniform(*var["olasilik"], n), rng.uniform(*yok["olasilik"], n))
+    miktar = np.where(tahmin_var, rng.uniform(*var["miktar"], n), rng.uniform(*yok["miktar"], n))
+    yagiyor = rng.random(n) < np.where(tahmin_var, var["yagis_orani"], yok["yagis_orani"])
+    nem = (
+        rng.uniform(*p["nem"], n) - oglen * rng.uniform(*p["oglen"], n)
+        + yagiyor * rng.uniform(*p["yagis_artisi"], n)
+    )
+    return np.clip(nem, *p["sinir"]), yagiyor, olasilik, miktar
+
+
+def _ideal(rng, p, gun, oglen, son_nem, min_m, max_m):
+    n = len(gun)
+    orta = (min_m + max_m) / 2
+    yarim_bant = (max_m - min_m) / 2 * p["bant_orani"]
+    nem = orta + rng.uniform(-yarim_bant, yarim_bant, n) - oglen * rng.uniform(*p["oglen"], n)
+    yagiyor = rng.random(n) < p["yagis_orani"]
+    nem += yagiyor * rng.uniform(*p["yagis_artisi"], n)
+    olasilik = rng.uniform(*p["olasilik"], n)
+    sinir = (min_m + p["sinir_payi"], max_m - p["sinir_payi"])
+    return np.clip(nem, *sinir), yagiyor, olasilik, _miktar(rng, olasilik, p)
+
+
+def _dusuk_nem(rng, p, gun, oglen, son_nem):
+    n = len(gun)
+    nem = rng.uniform(*p["nem"], n) - oglen * rng.uniform(*p["oglen"], n)
+    yagiyor = rng.random(n) < p["yagis_orani"]
+    nem += yagiyor * rng.uniform(*p["yagis_artisi"], n)
+    olasilik = rng.uniform(*p["olasilik"], n)
+    return np.clip(nem, *p["sinir"]), yagiyor, olasilik, _miktar(rng, olasilik, p)
+
+
+def _asiri_islak(rng, p, gun, oglen, son_nem, max_m):
+    n = len(gun)
+    e, t = p["eski"], p["trend"]
+    eski = gun > p["trend_gun"]
+    ilerleme = (p["trend_gun"] - gun) / p["trend_gun"]
+    nem = np.where(
+        eski, rng.uniform(*e["nem"], n) - oglen * rng.uniform(*e["oglen"], n), t["bas"] + ilerleme * (son_nem - t["bas"]),
+    )
+    yagiyor = rng.random(n) < np.where(eski, e["yagis_orani"], t["yagis_orani"])
+    nem += yagiyor * np.where(eski, rng.uniform(*e["yagis_artisi"], n), rng.uniform(*t["yagis_artisi"], n))
+    olasilik = np.where(eski, rng.uniform(*e["olasilik"], n), rng.uniform(*t["olasilik"], n))
+    return np.clip(nem, *p["sinir"]), yagiyor, olasilik, _miktar(rng, olasilik, p)
+
+
+def _kritik_savunmaci(rng, p, gun, oglen, son_nem):
+    n = len(gun)
+    e, t = p["eski"], p["trend"]
+    eski = gun > p["trend_gun"]
+    ilerleme = (p["trend_gun"] - gun) / p["trend_gun"]
+    nem = np.where(
+        eski,
+        rng.uniform(*e["nem"], n) - oglen * rng.uniform(*e["oglen"], n),
+        t["bas"] - ilerleme * (t["bas"] - son_nem) + rng.uniform(*t["gurultu"], n),
+    )
+    olasilik = rng.uniform(*p["olasilik"], n)
+    miktar = rng.uniform(*p["miktar"], n)
+    yagiyor = rng.random(n) < p["yagis_orani"]
+    nem += yagiyor * rng.uniform(*p["yagis_artisi"], n)
+    return np.clip(nem, *p["sinir"]), yagiyor, olasilik, miktar
+
+
+def _surpriz_yagmur(rng, p, gun, oglen, son_nem):
+    n = len(gun)
+    nem = rng.uniform(*p["nem"], n) - oglen * rng.uniform(*p["oglen"], n)
+    olasilik = rng.uniform(*p["olasilik"], n)
+    miktar = rng.uniform(*p["miktar"], n)
+    yagiyor = rng.random(n) < p["yagis_orani"]
+    nem += yagiyor * rng.uniform(*p["yagis_artisi"], n)
+    return np.clip(nem, *p["sinir"]), yagiyor, olasilik, miktar
+
+
+def _maliyet(rng, p, gun, oglen, son_nem):
+    n = len(gun)
+    e, y, var, yok = p["eski"], p["yeni"], p["tahminli"], p["tahminsiz"]
+    eski = gun > p["donem_gun"]
+    tahmin_var = rng.random(n) < y["tahmin_orani"]
+    nem = np.where(
+        eski,
+        rng.uniform(*e["nem"], n) - oglen * rng.uniform(*e["oglen"], n),
+        rng.uniform(*y["nem"], n) - oglen * rng.uniform(*y["oglen"], n),
+    )
+    yagiyor = rng.random(n) < np.where(
+        eski, e["yagis_orani"], np.where(tahmin_var, var["yagis_orani"], yok["yagis_orani"]),
+    )
+    olasilik = np.where(
+        eski,
+        rng.uniform(*e["olasilik"], n),
+        np.where(tahmin_var, rng.uniform(*var["olasilik"], n), rng.uniform(*yok["olasilik"], n)),
+    )
+    nem += yagiyor * rng.uniform(*p["yagis_artisi"], n)
+    return np.clip(nem, *p["sinir"]), yagiyor, olasilik, _miktar(rng, olasilik, p)
+
+
+# seed_db üreticisi -> (vektörel çekirdek, SENARYO_PARAMETRELERI anahtarı)
+CEKIRDEKLER = {
+    seed_db.generate_kritik_data: (_kritik, "kritik"),
+    seed_db.generate_ml_guvenme_data: (_ml_guvenme, "ml_guvenme"),
+    seed_db.generate_ml_guven_data: (_ml_guven, "ml_guven"),
+    seed_db.generate_ideal_data: (_ideal, "ideal"),
+    seed_db.generate_dusuk_nem_data: (_dusuk_nem, "dusuk_nem"),
+    seed_db.generate_asiri_islak_data: (_asiri_islak, "asiri_islak"),
+    seed_db.generate_kritik_savunmaci_data: (_kritik_savunmaci, "kritik_savunmaci"),
+    seed_db.generate_surpriz_yagmur_data: (_surpriz_yagmur, "surpriz_yagmur"),
+    seed_db.generate_maliyet_data: (_maliyet, "maliyet"),
+}
+
+# Ay -> bölge ortalama sıcaklığı (indeks 1..12)
+IKLIM_TABLOSU = {
+    bolge: np.array([0.0] + [aylik[m] for m in range(1, 13)])
+    for bolge, aylik in {**IKLIM_AYLIK, None: VARSAYILAN_IKLIM}.items()
+}
+NOW64 = np.datetime64(NOW, "m")
+
+
+# ╔══════════════════════════════════════════════════════════════════════╗
+# ║  TARLA BAŞINA ÜRETİM                                               ║
+# ╚══════════════════════════════════════════════════════════════════════╝
+
+def _sicaklik(rng, bolge, ts, saat):
+    """seed_db.iklim_sicaklik'in vektörel karşılığı: aylık taban + saat dilimine göre sapma"""
+    ay = ts.astype("datetime64[M]").astype(int) % 12 + 1
+    taban = IKLIM_TABLOSU.get(bolge, IKLIM_TABLOSU[None])[ay]
+    kosullar = [saat <= 6, saat <= 10, saat <= 14]
+    alt = np.select(kosullar, [-3, 0, 4], 1)
+    ust = np.select(kosullar, [0, 4, 10], 5)
+    return np.round(taban + rng.uniform(alt, ust) + rng.uniform(-2, 2, len(ts)), 1)
+
+
+def _sulama_olaylari(rng, plan, gun_sayisi):
+    """
+    seed_db.SULAMA_PLANLARI dönemlerinin (gün, saat, süre) dizileri. Plan DAYS günlük
+    geçmiş için yazılmıştır: "gunler" dönemlerinin başlangıcı gun_sayisi'na kaydırılır,
+    bitişi (senaryonun sulamasız son günleri) sabit kalır. Kısa geçmişte (--gun, sulamasız
+    son günlere yakınsa) dönem boş kalabilir; "ornek" günleri geçmiş içinden seçilir.
+    """
+    gunler, saatler, sureler = [], [], []
+    for donem in plan:
+        if "gunler" in donem:
+            bas, bit, adim = donem["gunler"]
+            g = np.arange(bas + gun_sayisi - DAYS, bit, adim)
+        else:
+            bas, bit, adet = donem["ornek"]
+            havuz = np.arange(bas, min(bit, gun_sayisi))
+            g = np.sort(rng.choice(havuz, min(adet, len(havuz)), replace=False))[::-1]
+        gunler.append(g)
+        saatler.append(rng.choice(donem["saatler"], len(g)))
+        sureler.append(np.round(rng.uniform(*donem["sure"], len(g)), 1))
+    return np.concatenate(gunler), np.concatenate(saatler), np.concatenate(sureler)
+
+
+def tarla_verisi(seed, tarla_no, field_id, gun_sayisi, siklik, sablon):
+    """
+    Bir tarlanın sensör + hava tahmini + sulama kolonları (numpy dizileri).
+    RNG (seed, tarla_no) ile türetilir; sonuç parça bölünmesinden bağımsızdır.
+    """
+    rng = np.random.default_rng([seed, tarla_no])
+    sira = tarla_no % len(SCENARIO_CONFIG)
+    _, uretici, kwargs = SCENARIO_CONFIG[sira]
+    cekirdek, anahtar = CEKIRDEKLER[uretici]
+    p = SENARYO_PARAMETRELERI[anahtar]
+    son_dk, son_yagis, son_olasilik, son_miktar = p["son_olcum"]
+    kwargs = dict(kwargs)
+    bolge, son_nem, son_temp = kwargs.pop("bolge"), kwargs.pop("son_nem"), kwargs.pop("son_temp")
+
+    # Zaman ızgarası: son 30 dk deterministik son ölçüme bırakılır, her okumaya 0-15 dk sapma
+    adet = gun_sayisi * 1440 // siklik
+    dk_once = 30 + gun_sayisi * 1440 - np.arange(adet) * siklik
+    dk_once -= rng.integers(0, min(15, siklik - 1) + 1, adet)
+    ts = NOW64 - dk_once.astype("timedelta64[m]")
+    gun = dk_once // 1440
+    saat = ts.astype("datetime64[h]").astype(int) % 24
+
+    nem, yagiyor, olasilik, miktar = cekirdek(rng, p, gun, saat >= 14, son_nem, **kwargs)
+    sicaklik = _sicaklik(rng, bolge, ts, saat)
+
+    son_ts = NOW64 - np.timedelta64(son_dk, "m")
+    sensor = {
+        "field_id": np.full(adet + 1, field_id),
+        "timestamp": np.append(ts, son_ts),
+        "moisture": np.append(np.round(nem, 1), son_nem),
+        "temperature": np.append(sicaklik, son_temp),
+        "is_raining": np.append(yagiyor, son_yagis),
+    }
+    hava = {
+        "field_id": sensor["field_id"],
+        "forecast_date": sensor["timestamp"],
+        "rain_probability": np.append(np.round(olasilik, 1), son_olasilik),
+        "expected_rain_amount": np.append(np.round(miktar, 1), son_miktar),
+    }
+
+    gunler, saatler, sure = _sulama_olaylari(rng, SULAMA_PLANLARI[sira], gun_sayisi)
+    baslangic = (
+        (NOW64.astype("datetime64[D]") - gunler.astype("timedelta64[D]")).astype("datetime64[m]")
+        + (saatler * 60 + rng.integers(0, 21, len(gunler))).astype("timedelta64[m]")
+    )
+    sablon_debi, sablon_fiyat = sablon["pump_flow_rate"], sablon["water_unit_price"]
+    litre = np.round(irrigation_stats.sulama_miktari(sablon_debi, sure), 1)
+    sulama = {
+        "field_id": np.full(len(gunler), field_id),
+        "start_time": baslangic,
+        "duration_minutes": sure,
+        "water_amount_liters": litre,
+        "cost_total": np.round(irrigation_stats.sulama_maliyeti(litre, sablon_fiyat), 2),
+    }
+    return sensor, hava, sulama
+
+
+def _birlestir(parcalar):
+    """Tarla başına kolon sözlüklerini tek kolon sözlüğünde birleştirir"""
+    return {k: np.concatenate([p[k] for p in parcalar]) for k in parcalar[0]}
+
+
+def _satirlar(kolonlar):
+    """Kolon sözlüğü -> bulk_insert'in beklediği dict listesi (numpy -> python tipleri)"""
+    listeler = {
+        k: (v.astype("datetime64[us]") if v.dtype.kind == "M" else v).tolist()
+        for k, v in kolonlar.items()
+    }
+    return [dict(zip(listeler, degerler)) for degerler in zip(*listeler.values())]
+
+
+# ╔══════════════════════════════════════════════════════════════════════╗
+# ║  KULLANICI + TARLA SATIRLARI                                       ║
+# ╚══════════════════════════════════════════════════════════════════════╝
+
+def kullanici_satirlari(etiket, adet, ilk_id):
+    sifre = seed_db.h(f"{etiket}123")
+    return [
+        {"id": ilk_id + i, "email": f"{etiket}-{i + 1:06d}@yuk.test",
+         "hashed_password": sifre, "full_name": f"Yük Kullanıcı {i + 1}"}
+        for i in range(adet)
+    ]
+
+
+def tarla_satirlari(seed, tarla_nolari, ilk_tarla_id, ilk_kullanici_id, tarla_basina, pt_map):
+    """Tarla no -> şablon kopyası; konum her tarlada (seed, no) ile hafifçe kaydırılır"""
+    rows = []
+    for no in tarla_nolari:
+        sablon = TARLA_SABLONLARI[no % len(TARLA_SABLONLARI)]
+        kayma = np.random.default_rng([seed, no, 1]).uniform(-0.05, 0.05, 2)
+        rows.append({
+            **{k: v for k, v in sablon.items() if k not in ("owner", "plant")},
+            "id": ilk_tarla_id + no,
+            "name": f"{sablon['name']} #{no + 1}",
+            "latitude": round(sablon["latitude"] + float(kayma[0]), 4),
+            "longitude": round(sablon["longitude"] + float(kayma[1]), 4),
+            "owner_id": ilk_kullanici_id + no // tarla_basina,
+            "plant_type_id": pt_map.get(sablon["plant"], 1),
+        })
+    return rows
+
+
+def sensor_cihazlari(etiket, tarlalar):
+    rows = []
+    for f in tarlalar:
+        for tip, ad in (("moisture", "Nem"), ("temperature", "Sıcaklık")):
+            rows.append(dict(
+                sensor_code=f"{etiket.upper()}-{f['id']:07d}-{tip[0].upper()}",
+                name=f"{ad} Sensörü — {f['name']}",
+                type=tip, status="active", battery=100,
+                field_id=f["id"], installed_at=NOW - datetime.timedelta(days=90),
+            ))
+    return rows
+
+
+# ╔══════════════════════════════════════════════════════════════════════╗
+# ║  ÇIKTI: DB / CSV                                                    ║
+# ╚══════════════════════════════════════════════════════════════════════╝
+
+class DbYazici:
+    """Parçaları aynı oturumda core INSERT ile yazar; commit en sonda (tek transaction)."""
+
+    def __init__(self, db, parca_satir):
+        self.db = db
+        self.parca_satir = parca_satir
+
+    def yaz(self, model, kolonlar):
+        rows = kolonlar if isinstance(kolonlar, list) else _satirlar(kolonlar)
+        bulk_insert(self.db, model, rows, chunk_size=self.parca_satir)
+        if model is models.IrrigationLog:
+            irrigation_stats.loglari_isle(self.db, rows)
+        return len(rows)
+
+
+class CsvYazici:
+    """Tablo başına <dizin>/<tablo>.csv; ilk parçada başlık yazılır, sonrakiler eklenir."""
+
+    def __init__(self, dizin):
+        self.dizin = dizin
+        self.acilan = set()
+        os.makedirs(dizin, exist_ok=True)
+
+    def yaz(self, model, kolonlar):
+        tablo = model.__tablename__
+        yol = os.path.join(self.dizin, f"{tablo}.csv")
+        df = pd.DataFrame(kolonlar)
+        ilk = tablo not in self.acilan
+        df.to_csv(yol, mode="w" if ilk else "a", header=ilk, index=False)
+        self.acilan.add(tablo)
+        return len(df)
+
+
+# ╔══════════════════════════════════════════════════════════════════════╗
+# ║  ANA AKIŞ                                                           ║
+# ╚══════════════════════════════════════════════════════════════════════╝
+
+def uret(yazici, args, ilk_kullanici_id, ilk_tarla_id, pt_map):
+    """Kullanıcıları, sonra tarlaları --parca'lık gruplar halinde üretip yazar. Toplamları döndürür."""
+    toplam = {"kullanici": 0, "tarla": 0, "sensor": 0, "hava": 0, "sulama": 0}
+    toplam["kullanici"] = yazici.yaz(
+        models.User, kullanici_satirlari(args.etiket, args.kullanici, ilk_kullanici_id),
+    )
+
+    tarla_sayisi = args.kullanici * args.tarla
+    for bas in range(0, tarla_sayisi, args.parca):
+        nolar = range(bas, min(bas + args.parca, tarla_sayisi))
+        tarlalar = tarla_satirlari(args.seed, nolar, ilk_tarla_id, ilk_kullanici_id, args.tarla, pt_map)
+        toplam["tarla"] += yazici.yaz(models.Field, tarlalar)
+        yazici.yaz(models.Sensor, sensor_cihazlari(args.etiket, tarlalar))
+
+        sensor, hava, sulama = zip(*(
+            tarla_verisi(args.seed, no, f["id"], args.gun, args.siklik, TARLA_SABLONLARI[no % len(TARLA_SABLONLARI)])
+            for no, f in zip(nolar, tarlalar)
+        ))
+        toplam["sensor"] += yazici.yaz(models.SensorLog, _birlestir(sensor))
+        toplam["hava"] += yazici.yaz(models.WeatherForecast, _birlestir(hava))
+        toplam["sulama"] += yazici.yaz(models.IrrigationLog, _birlestir(sulama))
+        print(f"  … {nolar.stop}/{tarla_sayisi} tarla", flush=True)
+    return toplam
+
+
+def _db_calistir(args):
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        pt_map = {p.name: p.id for p in db.query(models.PlantType)}
+        if not pt_map:
+            print("❌ Bitki türleri bulunamadı! Önce /plant-types/seed çağırın.")
+            return None
+        if db.query(models.User.id).filter(models.User.email.like(f"{args.etiket}-%@yuk.test")).first():
+            print(f"❌ '{args.etiket}' etiketli veri zaten var. Farklı bir --etiket verin.")
+            return None
+        # Açık id'ler: tarla satırları sahip id'sini üretim sırasında bilir
+        ilk_kullanici_id = (db.query(func.max(models.User.id)).scalar() or 0) + 1
+        ilk_tarla_id = (db.query(func.max(models.Field.id)).scalar() or 0) + 1
+        toplam = uret(DbYazici(db, args.parca_satir), args, ilk_kullanici_id, ilk_tarla_id, pt_map)
+        db.commit()
+        return toplam
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _csv_calistir(args):
+    # Bitki id'leri /plant-types/seed sırasıyla (SEED_PLANTS) eşlenir
+    from routers.plants import SEED_PLANTS
+    pt_map = {p["name"]: i + 1 for i, p in enumerate(SEED_PLANTS)}
+    return uret(CsvYazici(args.dizin), args, 1, 1, pt_map)
+
+
+def argumanlar(argv=None):
+    p = argparse.ArgumentParser(description="AquaSmart yük testi için sentetik veri üretici")
+    p.add_argument("--kullanici", type=int, default=10, help="kullanıcı sayısı (N)")
+    p.add_argument("--tarla", type=int, default=12, help="kullanıcı başına tarla sayısı (M)")
+    p.add_argument(
+        "--gun", type=int, default=60,
+        help="geçmiş gün sayısı (D); 15 ve altında sulamasız son günleri olan senaryolarda sulama kaydı olmaz",
+    )
+    p.add_argument("--siklik", type=int, default=360, help="sensör okuma aralığı, dakika (360 = günde 4)")
+    p.add_argument("--seed", type=int, default=42, help="aynı seed aynı veriyi üretir")
+    p.add_argument("--cikti", choices=["db", "csv"], default="db")
+    p.add_argument("--dizin", default="synthetic_data", help="csv çıktı dizini")
+    p.add_argument("--etiket", default="yuk", help="kullanıcı e-posta / sensör kodu öneki")
+    p.add_argument("--parca", type=int, default=200, help="bir seferde üretilen tarla sayısı")
+    p.add_argument("--parca-satir", type=int, default=seed_db.SEED_CHUNK, help="executemany parça boyutu")
+    args = p.parse_args(argv)
+    if min(args.kullanici, args.tarla, args.gun, args.siklik, args.parca, args.parca_satir) < 1:
+        p.error("sayısal parametreler 1 veya daha büyük olmalı")
+    return args
+
+
+def main(argv=None):
+    args = argumanlar(argv)
+    okuma = args.gun * 1440 // args.siklik + 1
+    print(
+        f"🌱 {args.kullanici} kullanıcı × {args.tarla} tarla × {args.gun} gün "
+        f"({okuma} ölçüm/tarla) → {args.cikti} (seed={args.seed})"
+    )
+    baslangic = time.perf_counter()
+    toplam = _db_calistir(args) if args.cikti == "db" else _csv_calistir(args)
+    if toplam is None:
+        return
+    sure = time.perf_counter() - baslangic
+    if toplam["sulama"] == 0:
+        print(f"⚠️ --gun {args.gun}: geçmiş, senaryoların sulamasız son günlerinden kısa; sulama kaydı üretilmedi")
+    print(
+        f"✅ {toplam['kullanici']} kullanıcı, {toplam['tarla']} tarla, {toplam['sensor']} sensör kaydı, "
+        f"{toplam['hava']} hava tahmini, {toplam['sulama']} sulama kaydı — {sure:.1f} sn "
+        f"({toplam['sensor'] / max(sure, 1e-9):,.0f} ölçüm/sn)"
+    )
+
+
+if __name__ == "__main__":
+    main()
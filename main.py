@@ -6,15 +6,30 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import models
 import logging
+import os
 from database import engine, SessionLocal
 from routers import users, plants, simulation, weather
 from routers import prediction as prediction_router
 from routers import sensors as sensors_router
 from routers import chatbot as chatbot_router
+from routers import irrigation as irrigation_router
+from routers import stream as stream_router
+from routers import notifications as notifications_router
+from services.weather import konum_coz, onbellegi_isit
+from services import (
+    chat_intents, decision_cache, decision_log, event_bus, irrigation_stats, notifications, plant_catalog,
+)
+from services.ttl_cache import tum_onbellek_istatistikleri
+from services.llm_provider import get_llm_provider
 from ml.predictor import predict_rain_from_db, get_all_models_status
 from apscheduler.schedulers.background import BackgroundScheduler
+from datetime import datetime
 
 models.Base.metadata.create_all(bind=engine)
+# create_all var olan tablolara sonradan eklenen indeksleri oluşturmaz (ör. ix_notifications_user_time)
+for tablo in models.Base.metadata.sorted_tables:
+    for indeks in tablo.indexes:
+        indeks.create(bind=engine, checkfirst=True)
 
 # ml_models klasörünü oluştur
 from pathlib import Path
@@ -29,8 +44,8 @@ def hourly_rain_check():
     """Saatte bir tüm tarlalar için hava tahmini doğrulama yapar ve akıllı bildirimler oluşturur."""
     db = SessionLocal()
     try:
-        import datetime
         fields = db.query(models.Field).all()
+        yeni_bildirimler = []
         for field in fields:
             try:
                 result = predict_rain_from_db(db, field.id)
@@ -44,23 +59,18 @@ def hourly_rain_check():
                 if sulama_karari == "GUVENME_SULA":
                     mesaj = f"\u26a0\ufe0f {field.name}: Hava tahmini ya\u011fmur diyor ama ge\u00e7mi\u015f veriye g\u00f6re bu tarlaya gelmeyebilir. Savunmac\u0131 sulama modunda."
                 elif sulama_karari == "GUVEN_BEKLE":
-                    mesaj = f"\ud83c\udf27\ufe0f {field.name}: Ya\u011fmur tahmini g\u00fcvenilir, sulama ertelendi."
+                    mesaj = f"\U0001f327\ufe0f {field.name}: Ya\u011fmur tahmini g\u00fcvenilir, sulama ertelendi."
                 elif sulama_karari == "DIKKAT_SURPRIZ":
-                    mesaj = f"\ud83e\udd14 {field.name}: Beklenmeyen ya\u011fmur olas\u0131l\u0131\u011f\u0131 var, dikkat!"
+                    mesaj = f"\U0001f914 {field.name}: Beklenmeyen ya\u011fmur olas\u0131l\u0131\u011f\u0131 var, dikkat!"
                 
                 if mesaj:
-                    bildirim = models.Notification(
-                        user_id=owner_id,
-                        message=mesaj,
-                        created_at=datetime.datetime.now(),
-                        is_read=False,
-                    )
-                    db.add(bildirim)
+                    yeni_bildirimler.append(notifications.bildirim_ekle(db, owner_id, mesaj))
                 
             except Exception as e:
                 logger.warning(f"Tarla {field.id} tahmin hatas\u0131: {e}")
         
         db.commit()
+        notifications.yayinla(yeni_bildirimler)
         logger.info(f"Saatlik hava tahmini do\u011frulama tamamland\u0131: {len(fields)} tarla")
     except Exception as e:
         logger.error(f"Saatlik kontrol hatas\u0131: {e}")
@@ -68,18 +78,95 @@ def hourly_rain_check():
         db.close()
 
 
+# ============================================================
+# SAAT BAŞI HAVA TAHMİNİ ÖN YÜKLEME
+# ============================================================
+WEATHER_PREFETCH_CONCURRENCY = int(os.getenv("WEATHER_PREFETCH_CONCURRENCY", "4"))
+
+def hourly_weather_prefetch():
+    """Tüm tarla konumlarının saatlik tahminini önceden çekip hava önbelleğini doldurur."""
+    db = SessionLocal()
+    try:
+        konumlar = set()
+        for ilce, lat, lon in db.query(models.Field.ilce, models.Field.latitude, models.Field.longitude).distinct():
+            # Karar motoruyla aynı çözümleme: ilçe öncelikli, yoksa koordinat
+            konum = konum_coz(ilce or "cankaya", lat, lon)
+            if konum:
+                konumlar.add((konum[0], konum[1]))
+    finally:
+        db.close()
+
+    # onbellegi_isit hata fırlatmaz; başarısız istekleri kendisi loglar ve "hatali" olarak sayar
+    sonuc = onbellegi_isit(konumlar, eszamanlilik=WEATHER_PREFETCH_CONCURRENCY)
+    if sonuc["hatali"]:
+        logger.warning(f"Hava tahmini ön yükleme: {sonuc['hatali']}/{sonuc['konum_sayisi']} konum alınamadı {sonuc}")
+    else:
+        logger.info(f"Hava tahmini ön yükleme: {sonuc}")
+    if not sonuc["basarili"]:
+        # Yeni tahmin gelmedi: önbellekteki kararlar hâlâ geçerli, yeniden hesaplanacak bir şey yok
+        return
+    # Yeni tahminler geldi: önbellekteki kararlar yeniden hesaplanmalı
+    decision_cache.tumunu_gecersiz_kil()
+
+    # Canlı akışı dinleyen kullanıcıların kararları yeni tahminle yeniden hesaplanır
+    dinleyenler = list(event_bus.abone_sayisi())
+    if dinleyenler:
+        db = SessionLocal()
+        try:
+            for user_id in dinleyenler:
+                simulation.check_all_fields(user_id, db)
+        except Exception as e:
+            logger.warning(f"Canlı akış karar yenileme hatası: {e}")
+        finally:
+            db.close()
+
+
+# ============================================================
+# KARAR GÜNLÜĞÜ: TOPLU YAZIM + SAKLAMA SÜRESİ
+# ============================================================
+def decision_log_retention():
+    """Saklama süresini aşan karar kayıtlarını siler."""
+    try:
+        silinen = decision_log.eski_kayitlari_sil()
+        logger.info(f"Karar günlüğü temizlendi: {silinen} kayıt silindi")
+    except Exception as e:
+        logger.error(f"Karar günlüğü temizleme hatası: {e}")
+
+
 scheduler = BackgroundScheduler()
 scheduler.add_job(hourly_rain_check, 'interval', hours=1, id='hourly_rain_check')
+# Her saat başı + açılışta bir kez (önbellek soğuk başlamasın)
+scheduler.add_job(hourly_weather_prefetch, 'cron', minute=0, id='hourly_weather_prefetch',
+                  next_run_time=datetime.now())
+scheduler.add_job(decision_log.tamponu_bosalt, 'interval', minutes=1, id='decision_log_flush')
+scheduler.add_job(decision_log_retention, 'cron', hour=3, minute=30, id='decision_log_retention')
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    # Okunmamış bildirim sayaçları gerçek sayıya eşitlenir (sayaç tablosundan önceki bildirimler dahil);
+    # scheduler yeni bildirim yazmaya başlamadan önce
+    db = SessionLocal()
+    try:
+        notifications.sayaclari_yeniden_olustur(db)
+        # Özet tablosundan önceki sulama kayıtları panolarda görünsün: tablo boşsa loglardan kurulur
+        if db.query(models.IrrigationDailyStat.field_id).first() is None \
+                and db.query(models.IrrigationLog.id).first() is not None:
+            satir = irrigation_stats.yeniden_olustur(db)
+            logger.info(f"Sulama günlük özeti loglardan yeniden oluşturuldu: {satir} satır")
+    finally:
+        db.close()
     scheduler.start()
     logger.info("⏰ Saatlik yağmur tahmin scheduler başlatıldı")
+    # Bitki katalogu (statik referans verisi) bellege alınır
+    plant_catalog.yenile()
+    # LLM istemcisi tek sefer kurulur, bağlantı havuzu tüm sohbetlerde paylaşılır
+    get_llm_provider().isit()
     yield
     # Shutdown
     scheduler.shutdown()
+    decision_log.tamponu_bosalt()
     logger.info("⏰ Scheduler durduruldu")
 
 
@@ -100,10 +187,23 @@ app.include_router(weather.router)
 app.include_router(prediction_router.router)
 app.include_router(sensors_router.router)
 app.include_router(chatbot_router.router)
+app.include_router(irrigation_router.router)
+app.include_router(stream_router.router)
+app.include_router(notifications_router.router)
 
 @app.get("/")
 def ana_sayfa():
     return {
         "mesaj": "Akıllı Sulama Sistemi + ML Hava Tahmini Doğrulama Aktif! 🚀🧠",
         "ml_modelleri": get_all_models_status(),
-    }
\ No newline at end of file
+    }
+
+
+@app.get("/metrics")
+def metrics():
+    """Önbellek isabet/ıskalama oranları"""
+    return {
+        "onbellekler": tum_onbellek_istatistikleri(),
+        "canli_akis_baglanti": sum(event_bus.abone_sayisi().values()),
+        "chatbot_hizli_yol": chat_intents.istatistik(),
+    }
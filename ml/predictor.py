@@ -20,6 +20,8 @@ import os
 import json
 import datetime
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Dict, Any, List, Tuple
 
@@ -34,6 +36,7 @@ from sklearn.metrics import accuracy_score, classification_report, f1_score
 
 import models
 from database import SessionLocal
+from services.weather import arsiv_konum_anahtari, konum_coz
 
 logger = logging.getLogger("ml.predictor")
 
@@ -74,6 +77,61 @@ def auto_detect_columns() -> Dict[str, List[str]]:
 # 2. EGITIM VERISI HAZIRLAMA
 # ============================================================
 
+def _arsiv_tahminleri(db: Session, field_id: int) -> List[Dict[str, Any]]:
+    """
+    Tarlanin konumu icin forecast_archive'daki canli tahminleri dondurur.
+    Her hedef saat icin o saatten once cekilmis EN SON tahmin alinir
+    (karar aninda elde olan tahmin budur).
+    """
+    field = db.query(models.Field).filter(models.Field.id == field_id).first()
+    if not field:
+        return []
+    konum = konum_coz(field.ilce or "cankaya", field.latitude, field.longitude)
+    if not konum:
+        return []
+
+    rows = db.query(
+        models.ForecastArchive.issued_at,
+        models.ForecastArchive.target_time,
+        models.ForecastArchive.rain_probability,
+        models.ForecastArchive.expected_rain_amount,
+    ).filter(
+        models.ForecastArchive.location_key == arsiv_konum_anahtari(konum[0], konum[1]),
+        models.ForecastArchive.target_time <= datetime.datetime.now(),
+        models.ForecastArchive.issued_at <= models.ForecastArchive.target_time,
+    ).order_by(models.ForecastArchive.target_time, models.ForecastArchive.issued_at).all()
+
+    son_tahmin = {}
+    for issued_at, target_time, prob, amount in rows:
+        son_tahmin[target_time] = {
+            "fc_timestamp": target_time,
+            "rain_probability": prob,
+            "expected_rain_amount": amount or 0.0,
+        }
+    return [r for r in son_tahmin.values() if r["rain_probability"] is not None]
+
+
+def _tahmin_dataframe(db: Session, field_id: int) -> Optional[pd.DataFrame]:
+    """Seed WeatherForecast kayitlari + canli tahmin arsivi, fc_timestamp'e gore sirali."""
+    forecasts = db.query(models.WeatherForecast).filter(
+        models.WeatherForecast.field_id == field_id
+    ).all()
+    kayitlar = [{
+        "fc_timestamp": fc.forecast_date,
+        "rain_probability": fc.rain_probability,
+        "expected_rain_amount": fc.expected_rain_amount,
+    } for fc in forecasts]
+    kayitlar.extend(_arsiv_tahminleri(db, field_id))
+
+    if not kayitlar:
+        return None
+    return (
+        pd.DataFrame(kayitlar)
+        .drop_duplicates(subset="fc_timestamp", keep="last")
+        .sort_values("fc_timestamp")
+    )
+
+
 def build_training_dataframe(db: Session, field_id: int) -> Tuple[pd.DataFrame, str]:
     """
     Tarlaya ozel egitim verisi olusturur.
@@ -110,18 +168,10 @@ def build_training_dataframe(db: Session, field_id: int) -> Tuple[pd.DataFrame,
     df["month_sin"] = np.sin(2 * np.pi * df["month"] / 12)
     df["month_cos"] = np.cos(2 * np.pi * df["month"] / 12)
 
-    # WeatherForecast ile birlestir
-    forecasts = db.query(models.WeatherForecast).filter(
-        models.WeatherForecast.field_id == field_id
-    ).all()
-
-    if forecasts:
-        fc_df = pd.DataFrame([{
-            "fc_timestamp": fc.forecast_date,
-            "rain_probability": fc.rain_probability,
-            "expected_rain_amount": fc.expected_rain_amount,
-        } for fc in forecasts]).sort_values("fc_timestamp")
+    # WeatherForecast + canli tahmin arsivi ile birlestir
+    fc_df = _tahmin_dataframe(db, field_id)
 
+    if fc_df is not None:
         df = df.sort_values("timestamp")
         df = pd.merge_asof(
             df, fc_df,
@@ -178,20 +228,16 @@ def _hesapla_tahmin_guvenilirligi(db: Session, field_id: int) -> Dict[str, Any]:
         models.SensorLog.field_id == field_id
     ).order_by(models.SensorLog.timestamp).all()
 
-    forecasts = db.query(models.WeatherForecast).filter(
-        models.WeatherForecast.field_id == field_id
-    ).all()
+    fc_df = _tahmin_dataframe(db, field_id)
 
-    if not sensor_logs or not forecasts:
+    if not sensor_logs or fc_df is None:
         return {"genel_isabet": 50.0, "guvenilir_mi": False, "mesaj": "Yetersiz veri"}
 
     sensor_df = pd.DataFrame([{
         "timestamp": s.timestamp, "is_raining": int(s.is_raining),
     } for s in sensor_logs]).sort_values("timestamp")
 
-    fc_df = pd.DataFrame([{
-        "fc_timestamp": f.forecast_date, "rain_probability": f.rain_probability,
-    } for f in forecasts]).sort_values("fc_timestamp")
+    fc_df = fc_df[["fc_timestamp", "rain_probability"]]
 
     merged = pd.merge_asof(
         sensor_df, fc_df,
@@ -305,6 +351,10 @@ def train_model(db: Session, field_id: int) -> Dict[str, Any]:
         "info": info,
     }
 
+    # Yeni model -> bu tarlanin onbellekteki sulama karari gecersiz
+    from services import decision_cache
+    decision_cache.tarla_gecersiz_kil(field_id)
+
     logger.info(f"Model egitildi: field_{field_id} | Acc: {accuracy:.4f} | Guvenilirlik: {tahmin_guvenilirligi}")
     return result
 
@@ -325,6 +375,37 @@ def train_all_models(db: Session) -> List[Dict[str, Any]]:
 # 5. TAHMIN - HAVA TAHMINI DOGRULAMA
 # ============================================================
 
+# Yuklenen modeller bellekte tutulur; dosya degisirse (yeniden egitim) otomatik tazelenir
+_model_onbellegi: Dict[int, Tuple[float, dict]] = {}
+_model_lock = threading.Lock()
+
+
+def _model_yukle(field_id: int) -> dict:
+    model_path = ML_MODELS_DIR / f"field_{field_id}.pkl"
+    if not model_path.exists():
+        raise FileNotFoundError(f"Tarla {field_id} icin model bulunamadi. Once /prediction/train/{field_id} cagirin.")
+
+    mtime = model_path.stat().st_mtime
+    with _model_lock:
+        kayit = _model_onbellegi.get(field_id)
+    if kayit and kayit[0] == mtime:
+        return kayit[1]
+
+    data = joblib.load(model_path)
+    with _model_lock:
+        _model_onbellegi[field_id] = (mtime, data)
+    return data
+
+
+def model_surumu(field_id: int) -> Optional[float]:
+    """Model dosyasinin degistirilme zamani (yoksa None). Karar onbellegi parmak izinde kullanilir."""
+    model_path = ML_MODELS_DIR / f"field_{field_id}.pkl"
+    try:
+        return model_path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+
 def predict_rain(field_id: int, current_data: Dict[str, float]) -> Dict[str, Any]:
     """
     ML modeli ile hava tahmini dogrulama.
@@ -335,11 +416,7 @@ def predict_rain(field_id: int, current_data: Dict[str, float]) -> Dict[str, Any
     Dondurur:
       - sulama_karari: GUVEN_BEKLE / GUVENME_SULA / NORMAL_SULAMA / DIKKAT_SURPRIZ
     """
-    model_path = ML_MODELS_DIR / f"field_{field_id}.pkl"
-    if not model_path.exists():
-        raise FileNotFoundError(f"Tarla {field_id} icin model bulunamadi. Once /prediction/train/{field_id} cagirin.")
-
-    data = joblib.load(model_path)
+    data = _model_yukle(field_id)
     model = data["model"]
     feature_cols = data["feature_cols"]
     trained_at = data["trained_at"]
@@ -425,6 +502,25 @@ def predict_rain(field_id: int, current_data: Dict[str, float]) -> Dict[str, Any
     }
 
 
+def predict_rain_paralel(girdiler: Dict[int, Dict[str, float]], max_workers: int = 4) -> Dict[int, Any]:
+    """
+    Birden fazla tarla icin predict_rain'i sinirli paralellikle calistirir.
+    Her tarlanin kendi modeli oldugundan ozellikler tek matriste birlestirilemez;
+    her cagri tek satirlik tahmindir (modeller _model_yukle onbelleginden gelir).
+    Hata alan tarla icin exception nesnesi doner.
+    """
+    def _tek(field_id):
+        try:
+            return field_id, predict_rain(field_id, girdiler[field_id])
+        except Exception as e:
+            return field_id, e
+
+    if len(girdiler) <= 1 or max_workers <= 1:
+        return dict(_tek(fid) for fid in girdiler)
+    with ThreadPoolExecutor(max_workers=max_workers) as havuz:
+        return dict(havuz.map(_tek, list(girdiler)))
+
+
 def predict_rain_from_db(db: Session, field_id: int) -> Dict[str, Any]:
     """DB'den son verileri cekip tahmin dogrulama yapar."""
     last_sensor = db.query(models.SensorLog).filter(
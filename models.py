@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Float, Boolean, DateTime
+from sqlalchemy import Column, Integer, SmallInteger, String, ForeignKey, Float, Boolean, Date, DateTime, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from database import Base
 import datetime
@@ -120,6 +120,10 @@ class WeatherForecast(Base):
 # 7. BILDIRIMLER
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Gelen kutusu sayfalaması (user_id, created_at, id) sırasıyla okunur
+        Index("ix_notifications_user_time", "user_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -127,4 +131,99 @@ class Notification(Base):
     created_at = Column(DateTime, default=datetime.datetime.now)
     is_read = Column(Boolean, default=False)
 
-    user = relationship("User", back_populates="notifications")
\ No newline at end of file
+    user = relationship("User", back_populates="notifications")
+
+# 8. HAVA TAHMİNİ ARŞİVİ (Open-Meteo'dan çekilen canlı saatlik tahminler)
+class ForecastArchive(Base):
+    __tablename__ = "forecast_archive"
+    __table_args__ = (
+        UniqueConstraint("location_key", "issued_at", "target_time", name="uq_forecast_archive"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    location_key = Column(String, index=True)  # "39.9032,32.8597"
+    issued_at = Column(DateTime)  # Tahminin çekildiği saat (saat başına yuvarlı)
+    target_time = Column(DateTime, index=True)  # Tahminin ait olduğu saat
+    rain_probability = Column(Float)
+    expected_rain_amount = Column(Float)
+    temperature = Column(Float)
+    weather_code = Column(Integer)
+
+
+# 9. SULAMA KARAR GÜNLÜĞÜ (kodlu, kompakt - denetim ve karar kalitesi analizi için)
+class DecisionLog(Base):
+    __tablename__ = "decision_logs"
+    __table_args__ = (
+        Index("ix_decision_logs_field_time", "field_id", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    field_id = Column(Integer, ForeignKey("fields.id"))
+    created_at = Column(DateTime, default=datetime.datetime.now, index=True)
+    kural = Column(SmallInteger)  # decision_engine.KURALLAR indeksi
+    aciliyet = Column(SmallInteger)  # decision_engine.ACILIYET_KODLARI
+    pompa = Column(SmallInteger)  # decision_engine.POMPA_KODLARI
+    ml_karari = Column(SmallInteger)  # decision_engine.ML_KARAR_KODLARI
+    yagis_bayraklari = Column(SmallInteger)  # bit0: 1 saat, bit1: 3 saat, bit2: 6 saat
+    ilk_yagis_saat = Column(SmallInteger, nullable=True)
+    moisture = Column(Float)
+    temperature = Column(Float)
+    sensor_log_id = Column(Integer, nullable=True)
+
+
+# 10. GÜNLÜK SULAMA ÖZETİ (irrigation_logs'tan artımlı tutulan toplamlar - maliyet panoları için)
+class IrrigationDailyStat(Base):
+    __tablename__ = "irrigation_daily_stats"
+    __table_args__ = (
+        UniqueConstraint("field_id", "day", name="uq_irrigation_daily_field_day"),
+        Index("ix_irrigation_daily_user_day", "user_id", "day"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    field_id = Column(Integer, ForeignKey("fields.id"))
+    user_id = Column(Integer, ForeignKey("users.id"))
+    day = Column(Date)
+    water_amount_liters = Column(Float, default=0.0)
+    cost_total = Column(Float, default=0.0)
+    duration_minutes = Column(Float, default=0.0)
+    event_count = Column(Integer, default=0)
+
+
+# 11. OKUNMAMIŞ BİLDİRİM SAYACI (bildirim zili tek satır okur, COUNT yok)
+class NotificationCounter(Base):
+    __tablename__ = "notification_counters"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    unread_count = Column(Integer, default=0)
+
+
+# 12. CHATBOT KONUŞMALARI (geçmiş sunucuda; eski kısım yuvarlanan özette tutulur)
+class Conversation(Base):
+    __tablename__ = "conversations"
+    __table_args__ = (
+        Index("ix_conversations_user_time", "user_id", "updated_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    field_id = Column(Integer, ForeignKey("fields.id"))
+    created_at = Column(DateTime, default=datetime.datetime.now)
+    updated_at = Column(DateTime, default=datetime.datetime.now)
+    message_count = Column(Integer, default=0)
+    summary = Column(String, nullable=True)  # özetlenen kullanıcı soruları (chat_context.konu_ozeti)
+    summarized_count = Column(Integer, default=0)  # özete katlanmış mesaj sayısı
+    summarized_upto_id = Column(Integer, default=0)  # bu id'ye kadarki mesajlar özette
+
+
+# 13. KONUŞMA MESAJLARI (yalnızca ekleme, güncelleme yok)
+class ConversationMessage(Base):
+    __tablename__ = "conversation_messages"
+    __table_args__ = (
+        Index("ix_conversation_messages_conv_id", "conversation_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    conversation_id = Column(Integer, ForeignKey("conversations.id"))
+    role = Column(String)  # "user" / "assistant"
+    content = Column(String)
+    created_at = Column(DateTime, default=datetime.datetime.now)
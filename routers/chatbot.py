@@ -3,19 +3,21 @@ Chatbot / Tarım Danışmanı API
 ===============================
 Groq LLM entegrasyonu ile çiftçiye doğal dilde soru sorma imkânı.
 Mevcut sistem verilerini (sensör, hava durumu, bitki, ML tahmin) context olarak kullanır.
+Konuşmalar sunucuda tutulur (services/conversations.py): istemci conversation_id + yeni mesajı gönderir.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-from typing import List, Optional
-import os
+from typing import List, Optional, Tuple
 import datetime
-import requests
-import json
 
 from database import SessionLocal
 import models
+from services import answer_cache, chat_context, chat_intents, conversations, event_bus, plant_catalog
+from services.llm_provider import LLMProviderError, get_llm_provider
 
 router = APIRouter(prefix="/chatbot", tags=["Chatbot - Tarım Danışmanı"])
 
@@ -38,11 +40,23 @@ class ChatRequest(BaseModel):
     user_id: int
     field_id: int
     message: str
-    history: Optional[List[ChatMessage]] = []
+    conversation_id: Optional[int] = None  # yoksa yeni konuşma açılır
+    history: Optional[List[ChatMessage]] = []  # eski istemciler için: yeni konuşmaya aktarılır
 
 
 class ChatResponse(BaseModel):
     reply: str
+    conversation_id: Optional[int] = None
+
+
+class ConversationMessageOut(BaseModel):
+    id: int
+    role: str
+    content: str
+    created_at: datetime.datetime
+
+    class Config:
+        from_attributes = True
 
 
 class FieldSummary(BaseModel):
@@ -53,236 +67,13 @@ class FieldSummary(BaseModel):
     plant_icon: Optional[str] = None
 
 
-# ─── Yardımcı: Anlık Hava Durumu ───────────────────────────
-def _get_current_weather(ilce: str) -> dict:
-    """Open-Meteo'dan anlık hava durumu çeker."""
-    try:
-        resp = requests.get(
-            f"http://127.0.0.1:8000/weather/current?ilce={ilce}",
-            timeout=5,
-        )
-        if resp.status_code == 200:
-            return resp.json()
-    except Exception:
-        pass
-    return {}
-
-
-def _get_hourly_forecast(ilce: str) -> dict:
-    """Saatlik hava tahmini çeker."""
-    try:
-        resp = requests.get(
-            f"http://127.0.0.1:8000/weather/hourly-forecast?ilce={ilce}&saat=24",
-            timeout=5,
-        )
-        if resp.status_code == 200:
-            return resp.json()
-    except Exception:
-        pass
-    return {}
-
-
-# ─── Yardımcı: ML Tahmin ───────────────────────────────────
-def _get_ml_prediction(field_id: int) -> dict:
-    """ML yağmur tahmin sonucunu çeker."""
-    try:
-        resp = requests.get(
-            f"http://127.0.0.1:8000/prediction/rain/{field_id}",
-            timeout=5,
-        )
-        if resp.status_code == 200:
-            return resp.json()
-    except Exception:
-        pass
-    return {}
-
-
-# ─── Yardımcı: Sulama Kararı ───────────────────────────────
-def _get_irrigation_decision(field_id: int) -> dict:
-    """Akıllı sulama karar sonucunu çeker."""
-    try:
-        resp = requests.get(
-            f"http://127.0.0.1:8000/simulation/check-irrigation/{field_id}",
-            timeout=5,
-        )
-        if resp.status_code == 200:
-            return resp.json()
-    except Exception:
-        pass
-    return {}
-
-
 # ─── Tarla Bağlamı (Context) Oluştur ───────────────────────
-def _build_field_context(db: Session, field_id: int) -> str:
-    """Tarla için tüm mevcut verileri toplayıp metin contexti oluşturur."""
-
-    field = db.query(models.Field).filter(models.Field.id == field_id).first()
-    if not field:
-        return "Tarla bulunamadı."
-
-    parts = []
-
-    # 1. TARLA BİLGİLERİ
-    parts.append("=== TARLA BİLGİLERİ ===")
-    parts.append(f"Tarla Adı: {field.name}")
-    parts.append(f"Konum: {field.location}")
-    parts.append(f"İlçe: {field.ilce}")
-    if field.latitude and field.longitude:
-        parts.append(f"Koordinat: {field.latitude}, {field.longitude}")
-    parts.append(f"Pompa Debi: {field.pump_flow_rate} L/dk")
-    parts.append(f"Su Birim Fiyatı: {field.water_unit_price} TL/L")
-
-    # 2. BİTKİ BİLGİLERİ
-    bitki = field.plant_type
-    if bitki:
-        parts.append("\n=== BİTKİ BİLGİLERİ ===")
-        parts.append(f"Bitki: {bitki.icon} {bitki.name}")
-        parts.append(f"Kategori: {bitki.category}")
-        parts.append(f"Minimum Nem: %{bitki.min_moisture}")
-        parts.append(f"Maksimum Nem: %{bitki.max_moisture}")
-        parts.append(f"Kritik Nem (ACİL): %{bitki.critical_moisture}")
-        parts.append(f"Yağmur için Max Bekleme: {bitki.max_wait_hours} saat")
-        parts.append(f"Su İhtiyacı: {bitki.water_need}")
-        if bitki.water_amount:
-            parts.append(f"Su Miktarı: {bitki.water_amount}")
-        if bitki.soil_type:
-            parts.append(f"Uygun Toprak: {bitki.soil_type}")
-        if bitki.ideal_temp:
-            parts.append(f"İdeal Sıcaklık: {bitki.ideal_temp}")
-        if bitki.planting_time:
-            parts.append(f"Ekim Zamanı: {bitki.planting_time}")
-        if bitki.harvest_time:
-            parts.append(f"Hasat Zamanı: {bitki.harvest_time}")
-        if bitki.tips:
-            try:
-                tips_list = json.loads(bitki.tips)
-                parts.append(f"Uzman Tüyoları: {', '.join(tips_list)}")
-            except Exception:
-                parts.append(f"Uzman Tüyoları: {bitki.tips}")
-
-    # 3. SON SENSÖR VERİLERİ (son 10 kayıt)
-    sensor_logs = (
-        db.query(models.SensorLog)
-        .filter(models.SensorLog.field_id == field_id)
-        .order_by(models.SensorLog.timestamp.desc())
-        .limit(10)
-        .all()
-    )
-    if sensor_logs:
-        parts.append("\n=== SON SENSÖR VERİLERİ (en yeniden eskiye) ===")
-        for log in sensor_logs:
-            ts = log.timestamp.strftime("%d.%m.%Y %H:%M") if log.timestamp else "?"
-            rain_str = "Yağmur VAR" if log.is_raining else "Yağmur YOK"
-            parts.append(
-                f"  {ts} → Nem: %{log.moisture}, Sıcaklık: {log.temperature}°C, {rain_str}"
-            )
-        # En son değerler
-        son = sensor_logs[0]
-        parts.append(f"\n📊 ANLIK: Nem %{son.moisture}, Sıcaklık {son.temperature}°C")
-
-    # 4. SENSÖR CİHAZLARI
-    sensors = db.query(models.Sensor).filter(models.Sensor.field_id == field_id).all()
-    if sensors:
-        parts.append("\n=== SENSÖR CİHAZLARI ===")
-        for s in sensors:
-            parts.append(
-                f"  {s.name} ({s.sensor_code}) - Tip: {s.type}, Durum: {s.status}, Batarya: %{s.battery}"
-            )
-
-    # 5. SULAMA GEÇMİŞİ (son 5 kayıt)
-    irrigation_logs = (
-        db.query(models.IrrigationLog)
-        .filter(models.IrrigationLog.field_id == field_id)
-        .order_by(models.IrrigationLog.start_time.desc())
-        .limit(5)
-        .all()
-    )
-    if irrigation_logs:
-        parts.append("\n=== SON SULAMA GEÇMİŞİ ===")
-        for ilog in irrigation_logs:
-            ts = ilog.start_time.strftime("%d.%m.%Y %H:%M") if ilog.start_time else "?"
-            parts.append(
-                f"  {ts} → Süre: {ilog.duration_minutes} dk, Su: {ilog.water_amount_liters} L, Maliyet: {ilog.cost_total} TL"
-            )
-
-    # 6. HAVA TAHMİNLERİ (DB'deki)
-    forecasts = (
-        db.query(models.WeatherForecast)
-        .filter(models.WeatherForecast.field_id == field_id)
-        .order_by(models.WeatherForecast.forecast_date.asc())
-        .limit(5)
-        .all()
-    )
-    if forecasts:
-        parts.append("\n=== DB HAVA TAHMİNLERİ (5 günlük) ===")
-        for f in forecasts:
-            fd = f.forecast_date.strftime("%d.%m.%Y") if f.forecast_date else "?"
-            parts.append(
-                f"  {fd} → Yağış Olasılığı: %{f.rain_probability}, Beklenen Yağış: {f.expected_rain_amount} mm"
-            )
-
-    # 7. ANLIK HAVA DURUMU (Open-Meteo API)
-    ilce = field.ilce or "cankaya"
-    current_weather = _get_current_weather(ilce)
-    if current_weather and "hata" not in current_weather:
-        parts.append("\n=== ANLIK HAVA DURUMU (Open-Meteo) ===")
-        parts.append(f"Konum: {current_weather.get('konum', ilce)}")
-        parts.append(f"Sıcaklık: {current_weather.get('sicaklik')}°C")
-        parts.append(f"Hissedilen: {current_weather.get('hissedilen')}°C")
-        parts.append(f"Nem: %{current_weather.get('nem')}")
-        parts.append(f"Rüzgar: {current_weather.get('ruzgar_hizi')} km/s {current_weather.get('ruzgar_yonu_text', '')}")
-        parts.append(f"Durum: {current_weather.get('emoji', '')} {current_weather.get('durum', '')}")
-        parts.append(f"Yağış Var mı: {'Evet' if current_weather.get('yagis_var_mi') else 'Hayır'}")
-
-    # 8. SAATLİK TAHMİN (Open-Meteo)
-    hourly = _get_hourly_forecast(ilce)
-    if hourly and "hata" not in hourly:
-        parts.append("\n=== ÖNÜMÜZDEKİ 24 SAAT TAHMİNİ ===")
-        parts.append(f"1 saat içinde yağış: {'Evet' if hourly.get('onumuzdeki_1_saat_yagis') else 'Hayır'}")
-        parts.append(f"3 saat içinde yağış: {'Evet' if hourly.get('onumuzdeki_3_saat_yagis') else 'Hayır'}")
-        parts.append(f"6 saat içinde yağış: {'Evet' if hourly.get('onumuzdeki_6_saat_yagis') else 'Hayır'}")
-        ilk_yagis = hourly.get("ilk_yagis")
-        if ilk_yagis:
-            parts.append(f"İlk Yağış: {ilk_yagis.get('kac_saat_sonra', '?')} saat sonra ({ilk_yagis.get('saat', '')})")
-
-    # 9. ML TAHMİN SONUCU
-    ml_result = _get_ml_prediction(field_id)
-    if ml_result and "hata" not in str(ml_result):
-        parts.append("\n=== ML YAĞMUR TAHMİN DOĞRULAMA ===")
-        parts.append(f"Sulama Kararı: {ml_result.get('sulama_karari', 'Bilinmiyor')}")
-        parts.append(f"Karar Açıklaması: {ml_result.get('karar_aciklama', '')}")
-        parts.append(f"Tahmin: {'Yağmur gelecek' if ml_result.get('tahmin') == 1 else 'Yağmur gelmeyecek'}")
-        parts.append(f"Güven: %{round(ml_result.get('guven', 0) * 100, 1)}")
-
-    # 10. AKILLI SULAMA KARARI
-    irrigation_decision = _get_irrigation_decision(field_id)
-    if irrigation_decision and "hata" not in str(irrigation_decision):
-        parts.append("\n=== AKILLI SULAMA KARAR SİSTEMİ ===")
-        parts.append(f"Durum: {irrigation_decision.get('durum', '')}")
-        parts.append(f"Aksiyon: {irrigation_decision.get('aksiyon', '')}")
-        parts.append(f"Aciliyet: {irrigation_decision.get('aciliyet', '')}")
-        parts.append(f"Detay: {irrigation_decision.get('detay', '')}")
-        parts.append(f"Pompa: {irrigation_decision.get('pompa', '')}")
-
-    # 11. BİLDİRİMLER (owner'ın son 5 bildirimi)
-    if field.owner_id:
-        notifications = (
-            db.query(models.Notification)
-            .filter(models.Notification.user_id == field.owner_id)
-            .order_by(models.Notification.created_at.desc())
-            .limit(5)
-            .all()
-        )
-        if notifications:
-            parts.append("\n=== SON BİLDİRİMLER ===")
-            for n in notifications:
-                ts = n.created_at.strftime("%d.%m.%Y %H:%M") if n.created_at else "?"
-                read_str = "✓ Okundu" if n.is_read else "● Okunmadı"
-                parts.append(f"  [{read_str}] {ts}: {n.message}")
-
-    parts.append(f"\n📅 Şu anki tarih ve saat: {datetime.datetime.now().strftime('%d.%m.%Y %H:%M')}")
-
-    return "\n".join(parts)
+def _build_field_context(field_id: int, ilce: Optional[str] = None) -> str:
+    """
+    Tarla için tüm mevcut verileri toplayıp metin contexti oluşturur.
+    Kaynaklar eşzamanlı toplanır ve kısa süre önbellekte tutulur (services/chat_context.py).
+    """
+    return chat_context.baglam_metni(chat_context.baglam_verisi(field_id, ilce))
 
 
 # ─── SYSTEM PROMPT ──────────────────────────────────────────
@@ -321,8 +112,9 @@ def get_user_fields_for_chat(user_id: int, db: Session = Depends(get_db)):
 
     result = []
     for f in fields:
-        plant_name = f.plant_type.name if f.plant_type else None
-        plant_icon = f.plant_type.icon if f.plant_type else None
+        bitki = plant_catalog.getir(f.plant_type_id)
+        plant_name = bitki.name if bitki else None
+        plant_icon = bitki.icon if bitki else None
         result.append(
             FieldSummary(
                 id=f.id,
@@ -335,18 +127,22 @@ def get_user_fields_for_chat(user_id: int, db: Session = Depends(get_db)):
     return result
 
 
-# ─── Endpoint: Mesaj Gönder ────────────────────────────────
-@router.post("/message", response_model=ChatResponse)
-def send_message(req: ChatRequest, db: Session = Depends(get_db)):
+def _yeni_konusma(db: Session, req: ChatRequest) -> models.Conversation:
+    """Yeni konuşma açar, eski istemcinin gönderdiği geçmişi aktarır (flush edilir, commit edilmez)."""
+    konusma = conversations.konusma_getir(db, req.user_id, req.field_id)
+    if req.history:
+        conversations.mesajlari_ekle(db, konusma, [{"role": m.role, "content": m.content} for m in req.history])
+    return konusma
+
+
+def _mesajlari_hazirla(req: ChatRequest, db: Session) -> Tuple[list, Optional[int], Optional[tuple], Optional[str]]:
     """
-    Chatbot mesaj endpoint'i.
-    Tarla verilerini toplayıp Groq LLM'e context olarak gönderir.
+    Kullanıcı/tarla/konuşma kontrolü + context ile LLM mesaj listesini, konuşma id'sini,
+    cevap önbelleği kapsamını (geçmişi olan turlarda None: önbellek kullanılmaz) ve
+    yapısal sorularda hazır şablon cevabı döndürür (varsa LLM çağrılmaz, mesaj listesi boş).
+    Yeni konuşmada id None döner: konuşma ilk turla birlikte _turu_kaydet içinde açılır,
+    böylece LLM hatasında yetim konuşma kalmaz.
     """
-    # API key kontrolü
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        raise HTTPException(status_code=500, detail="GROQ_API_KEY tanımlı değil!")
-
     # Kullanıcı ve tarla kontrolü
     user = db.query(models.User).filter(models.User.id == req.user_id).first()
     if not user:
@@ -359,8 +155,46 @@ def send_message(req: ChatRequest, db: Session = Depends(get_db)):
     if not field:
         raise HTTPException(status_code=404, detail="Tarla bulunamadı veya bu kullanıcıya ait değil")
 
-    # Tarla context'ini oluştur
-    context = _build_field_context(db, req.field_id)
+    # Konuşmayı bul / yeni aç. Yeni konuşma sadece geçmişi okumak için flush edilir ve geri alınır;
+    # LLM çağrısı boyunca açık yazma işlemi (sqlite kilidi) tutulmaz.
+    if req.conversation_id is None:
+        gecmis, onceki_ozet = conversations.gecmis(db, _yeni_konusma(db, req))
+        db.rollback()
+        konusma_id = None
+    else:
+        try:
+            konusma = conversations.konusma_getir(db, req.user_id, req.field_id, req.conversation_id)
+        except LookupError:
+            raise HTTPException(status_code=404, detail="Konuşma bulunamadı")
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Konuşma bu tarlaya ait değil")
+        gecmis, onceki_ozet = conversations.gecmis(db, konusma)
+        konusma_id = konusma.id
+
+    # Hızlı yol: "nem kaç?", "pompa açık mı?" gibi sorular toplanan veriden şablonla cevaplanır
+    niyet = chat_intents.niyet_bul(req.message)
+    if niyet:
+        hazir = chat_intents.cevapla(niyet, chat_context.baglam_verisi(req.field_id, field.ilce))
+        if hazir is not None:
+            return [], konusma_id, None, hazir
+
+    # Geçmişsiz turda bitki kütüphanesi sorusu ise sadece bitki bilgisi (tarlalar arası paylaşılan önbellek)
+    kapsam = None
+    bitki = None
+    if not gecmis and not onceki_ozet:
+        bitki = answer_cache.bitki_sorusu(
+            answer_cache.normalize(req.message),
+            [chat_context.bitki_sozlugu(b) for b in plant_catalog.tumu()],
+        )
+
+    if bitki:
+        context = "(Genel bitki bilgisi sorusu - tarla verisi gerekmez)\n" + chat_context.bitki_metni(bitki)
+        kapsam = answer_cache.bitki_kapsami(context)
+    else:
+        # Tarla context'ini oluştur
+        context = _build_field_context(req.field_id, field.ilce)
+        if not gecmis and not onceki_ozet:
+            kapsam = answer_cache.tarla_kapsami(req.field_id, context)
 
     # System prompt'u context ile birleştir
     system_message = SYSTEM_PROMPT.replace("{context}", context)
@@ -368,30 +202,128 @@ def send_message(req: ChatRequest, db: Session = Depends(get_db)):
     # Mesaj geçmişini hazırla
     messages = [{"role": "system", "content": system_message}]
 
-    # Önceki konuşma geçmişi (varsa)
-    if req.history:
-        for msg in req.history:
-            messages.append({"role": msg.role, "content": msg.content})
+    # Önceki konuşma geçmişi - özetlenmiş kısım + token bütçesine sığan son turlar
+    if gecmis or onceki_ozet:
+        messages.extend(chat_context.gecmisi_sikistir(gecmis, onceki_ozet=onceki_ozet))
 
     # Yeni mesajı ekle
     messages.append({"role": "user", "content": req.message})
+    return messages, konusma_id, kapsam, None
 
-    # Groq API'ye gönder
-    try:
-        from groq import Groq
-
-        client = Groq(api_key=api_key)
 
-        completion = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=messages,
-            temperature=0.7,
-            max_tokens=1024,
-            top_p=0.9,
-        )
+def _turu_kaydet(db: Session, req: ChatRequest, konusma_id: Optional[int], cevap: str) -> int:
+    """
+    Tamamlanan soru/cevap turunu konuşmaya ekler. konusma_id None ise konuşma (ve aktarılan
+    eski geçmiş) burada açılır ve ilk turla aynı commit'te yazılır. Konuşma id'sini döndürür.
+    """
+    if konusma_id is None:
+        konusma = _yeni_konusma(db, req)
+    else:
+        konusma = db.get(models.Conversation, konusma_id)
+    conversations.mesajlari_ekle(db, konusma, [
+        {"role": "user", "content": req.message},
+        {"role": "assistant", "content": cevap},
+    ])
+    db.commit()
+    return konusma.id
+
+
+def _turu_kaydet_yeni_oturum(req: ChatRequest, konusma_id: Optional[int], cevap: str) -> int:
+    # Akış bittiğinde istek oturumu kapanmış olabilir; kendi oturumunu açar
+    db = SessionLocal()
+    try:
+        return _turu_kaydet(db, req, konusma_id, cevap)
+    finally:
+        db.close()
 
-        reply = completion.choices[0].message.content
-        return ChatResponse(reply=reply)
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"LLM hatası: {str(e)}")
+# ─── Endpoint: Mesaj Gönder ────────────────────────────────
+@router.post("/message", response_model=ChatResponse)
+def send_message(req: ChatRequest, db: Session = Depends(get_db)):
+    """
+    Chatbot mesaj endpoint'i.
+    Tarla verilerini toplayıp LLM'e (varsayılan Groq) context olarak gönderir.
+    """
+    messages, konusma_id, kapsam, reply = _mesajlari_hazirla(req, db)
+
+    # Aynı (veya çok benzer) soru aynı context ile yakın zamanda cevaplandıysa LLM'e gidilmez
+    if reply is None and kapsam:
+        reply = answer_cache.bul(kapsam, req.message)
+    if reply is None:
+        # LLM'e gönder (sağlayıcı: services/llm_provider.py)
+        try:
+            reply = get_llm_provider().complete(messages)
+        except LLMProviderError as e:
+            raise HTTPException(status_code=500, detail=f"LLM hatası: {str(e)}")
+        if kapsam:
+            answer_cache.kaydet(kapsam, req.message, reply)
+
+    konusma_id = _turu_kaydet(db, req, konusma_id, reply)
+    return ChatResponse(reply=reply, conversation_id=konusma_id)
+
+
+# ─── Endpoint: Konuşma Mesajları ───────────────────────────
+@router.get("/conversations/{conversation_id}/messages", response_model=List[ConversationMessageOut])
+def get_conversation_messages(
+    conversation_id: int,
+    user_id: int,
+    limit: int = Query(50, ge=1, le=200),
+    once_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+):
+    """Konuşma mesajları (en yeniden eskiye). Daha eskiler için son gelen id'yi once_id olarak gönderin."""
+    konusma = db.get(models.Conversation, conversation_id)
+    if konusma is None or konusma.user_id != user_id:
+        raise HTTPException(status_code=404, detail="Konuşma bulunamadı")
+    return conversations.mesajlar(db, conversation_id, limit, once_id)
+
+
+# ─── Endpoint: Akışlı Mesaj (SSE) ──────────────────────────
+@router.post("/message/stream")
+async def send_message_stream(req: ChatRequest, request: Request, db: Session = Depends(get_db)):
+    """
+    /message ile aynı girdi; cevap üretildikçe token token text/event-stream olarak gönderilir.
+    Olaylar: token {"content"}, done {"reply", "conversation_id"}, hata {"detail"}.
+    Mevcut konuşmada id X-Conversation-Id başlığında da gelir.
+    İstemci bağlantıyı kapatırsa LLM akışı da kapatılır (kalan token'lar üretilmez, tur kaydedilmez).
+    """
+    messages, konusma_id, kapsam, onbellekten = await run_in_threadpool(_mesajlari_hazirla, req, db)
+    if onbellekten is None and kapsam:
+        onbellekten = answer_cache.bul(kapsam, req.message)
+
+    async def akis():
+        if onbellekten is not None:
+            # Hızlı yol / önbellek isabeti: tek token + done, LLM çağrılmaz
+            kayitli_id = await run_in_threadpool(_turu_kaydet_yeni_oturum, req, konusma_id, onbellekten)
+            yield event_bus.sse_metni("token", {"content": onbellekten})
+            yield event_bus.sse_metni("done", {"reply": onbellekten, "conversation_id": kayitli_id})
+            return
+
+        parcalar = []
+        uretec = get_llm_provider().stream(messages)
+        try:
+            async for icerik in iterate_in_threadpool(uretec):
+                if await request.is_disconnected():
+                    return
+                parcalar.append(icerik)
+                yield event_bus.sse_metni("token", {"content": icerik})
+            reply = "".join(parcalar)
+            if kapsam:
+                answer_cache.kaydet(kapsam, req.message, reply)
+            kayitli_id = await run_in_threadpool(_turu_kaydet_yeni_oturum, req, konusma_id, reply)
+            yield event_bus.sse_metni("done", {"reply": reply, "conversation_id": kayitli_id})
+        except LLMProviderError as e:
+            yield event_bus.sse_metni("hata", {"detail": f"LLM hatası: {str(e)}"})
+        finally:
+            # İstemci koptuğunda (return / iptal) sağlayıcının upstream akışı da kapanır
+            try:
+                uretec.close()
+            except ValueError:
+                # Üreteç o an threadpool'da çalışıyor; kendi adımı bitince kapanır
+                pass
+
+    # Yeni konuşmanın id'si ilk tur kaydedilince belli olur; sadece done olayında gelir
+    basliklar = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    if konusma_id is not None:
+        basliklar["X-Conversation-Id"] = str(konusma_id)
+    return StreamingResponse(akis(), media_type="text/event-stream", headers=basliklar)
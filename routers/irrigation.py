@@ -0,0 +1,129 @@
+"""
+Sulama API
+- Tarla / kullanıcı bazında günlük, haftalık, aylık su ve maliyet özetleri
+- Özetler irrigation_daily_stats tablosundan okunur (ham log sayısından bağımsız)
+- Pompa kontrolcüsünden tekli / toplu sulama olayı girişi
+"""
+
+import datetime
+import os
+from typing import List, Optional, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+import models
+import schemas
+from database import SessionLocal
+from services import chat_context, event_bus, irrigation_stats
+
+router = APIRouter(prefix="/irrigation", tags=["Sulama"])
+
+PERIYOT_DESENI = "^(gunluk|haftalik|aylik)$"
+IRRIGATION_EVENT_MAX_BATCH = int(os.getenv("IRRIGATION_EVENT_MAX_BATCH", "5000"))
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _toplam(donemler: list) -> dict:
+    return {
+        "su_litre": round(sum(d["su_litre"] for d in donemler), 1),
+        "maliyet_tl": round(sum(d["maliyet_tl"] for d in donemler), 2),
+        "calisma_dakika": round(sum(d["calisma_dakika"] for d in donemler), 1),
+        "sulama_sayisi": sum(d["sulama_sayisi"] for d in donemler),
+    }
+
+
+# 1. TARLA ÖZETİ
+@router.get("/summary/field/{field_id}")
+def get_field_summary(
+    field_id: int,
+    periyot: str = Query("gunluk", pattern=PERIYOT_DESENI),
+    baslangic: Optional[datetime.date] = Query(None, description="Bu günden itibaren (YYYY-MM-DD)"),
+    bitis: Optional[datetime.date] = Query(None, description="Bu güne kadar (YYYY-MM-DD)"),
+    db: Session = Depends(get_db),
+):
+    """Tarlanın periyot bazında su kullanımı ve sulama maliyeti"""
+    field = db.query(models.Field).filter(models.Field.id == field_id).first()
+    if not field:
+        raise HTTPException(status_code=404, detail="Tarla bulunamadı!")
+
+    donemler = irrigation_stats.ozet(db, periyot, field_id=field_id, baslangic=baslangic, bitis=bitis)
+    return {
+        "tarla_id": field_id,
+        "tarla_adi": field.name,
+        "periyot": periyot,
+        "toplam": _toplam(donemler),
+        "donemler": donemler,
+    }
+
+
+# 2. KULLANICI ÖZETİ (tüm tarlalar + tarla kırılımı)
+@router.get("/summary/user/{user_id}")
+def get_user_summary(
+    user_id: int,
+    periyot: str = Query("gunluk", pattern=PERIYOT_DESENI),
+    baslangic: Optional[datetime.date] = Query(None, description="Bu günden itibaren (YYYY-MM-DD)"),
+    bitis: Optional[datetime.date] = Query(None, description="Bu güne kadar (YYYY-MM-DD)"),
+    tarla_bazinda: bool = False,
+    db: Session = Depends(get_db),
+):
+    """Kullanıcının tüm tarlaları için periyot bazında su kullanımı ve sulama maliyeti"""
+    user = db.query(models.User).filter(models.User.id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="Kullanıcı bulunamadı")
+
+    donemler = irrigation_stats.ozet(
+        db, periyot, user_id=user_id, baslangic=baslangic, bitis=bitis, tarla_bazinda=tarla_bazinda,
+    )
+    return {
+        "kullanici_id": user_id,
+        "periyot": periyot,
+        "toplam": _toplam(donemler),
+        "donemler": donemler,
+    }
+
+
+# 3. SULAMA OLAYI GİRİŞİ (tekli veya toplu - kontrolcü bir günlük çalışmayı tek istekte yükleyebilir)
+@router.post("/events")
+def create_irrigation_events(
+    olaylar: Union[schemas.IrrigationEventCreate, List[schemas.IrrigationEventCreate]],
+    db: Session = Depends(get_db),
+):
+    """Pompa çalışmalarını kaydeder; litre ve maliyet tarlanın debi/fiyatından hesaplanır"""
+    if not isinstance(olaylar, list):
+        olaylar = [olaylar]
+    if not olaylar:
+        raise HTTPException(status_code=400, detail="En az bir sulama olayı gönderilmeli")
+    if len(olaylar) > IRRIGATION_EVENT_MAX_BATCH:
+        raise HTTPException(status_code=413, detail=f"Tek istekte en fazla {IRRIGATION_EVENT_MAX_BATCH} olay gönderilebilir")
+    if any(o.duration_minutes <= 0 for o in olaylar):
+        raise HTTPException(status_code=400, detail="duration_minutes pozitif olmalı")
+
+    try:
+        kayitlar = irrigation_stats.olaylari_kaydet(db, [o.dict() for o in olaylar])
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Tarla bulunamadı: {e.args[0]}")
+
+    # Canlı akış: her kullanıcıya kendi tarlalarının olayları tek mesajda
+    sahipler = dict(db.query(models.Field.id, models.Field.owner_id)
+                    .filter(models.Field.id.in_({k["field_id"] for k in kayitlar})).all())
+    kullanici_olaylari = {}
+    for k in kayitlar:
+        chat_context.gecersiz_kil(k["field_id"])
+        kullanici_olaylari.setdefault(sahipler.get(k["field_id"]), []).append(k)
+    for user_id, olaylar_ in kullanici_olaylari.items():
+        event_bus.yayinla(user_id, "sulama", olaylar_)
+
+    return {
+        "kayit_sayisi": len(kayitlar),
+        "toplam_su_litre": round(sum(k["water_amount_liters"] for k in kayitlar), 1),
+        "toplam_maliyet_tl": round(sum(k["cost_total"] for k in kayitlar), 2),
+        "olaylar": kayitlar,
+    }
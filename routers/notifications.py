@@ -0,0 +1,71 @@
+"""
+Bildirimler API
+- Kullanıcının gelen kutusu (imleç ile sayfalı, yeniden eskiye)
+- Okunmamış sayısı (sayaç tablosundan tek satır)
+- Toplu / tekli okundu işaretleme
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+import models
+import schemas
+from database import SessionLocal
+from services import event_bus, notifications
+
+router = APIRouter(prefix="/notifications", tags=["Bildirimler"])
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _kullanici_kontrol(db: Session, user_id: int):
+    if db.get(models.User, user_id) is None:
+        raise HTTPException(status_code=404, detail="Kullanıcı bulunamadı")
+
+
+# 1. GELEN KUTUSU
+@router.get("/user/{user_id}", response_model=schemas.NotificationPage)
+def get_notifications(
+    user_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    imlec: Optional[str] = Query(None, description="Önceki sayfanın sonraki_imlec değeri"),
+    okunmamis: bool = Query(False, description="Sadece okunmamışlar"),
+    db: Session = Depends(get_db),
+):
+    """Bildirimleri yeniden eskiye sayfa sayfa döndürür"""
+    _kullanici_kontrol(db, user_id)
+    try:
+        kayitlar, sonraki = notifications.listele(db, user_id, limit, imlec, okunmamis)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "bildirimler": kayitlar,
+        "sonraki_imlec": sonraki,
+        "okunmamis": notifications.okunmamis_sayisi(db, user_id),
+    }
+
+
+# 2. OKUNMAMIŞ SAYISI (bildirim zili)
+@router.get("/user/{user_id}/unread-count")
+def get_unread_count(user_id: int, db: Session = Depends(get_db)):
+    _kullanici_kontrol(db, user_id)
+    return {"kullanici_id": user_id, "okunmamis": notifications.okunmamis_sayisi(db, user_id)}
+
+
+# 3. OKUNDU İŞARETLE (ids boşsa hepsi)
+@router.post("/user/{user_id}/mark-read")
+def mark_notifications_read(user_id: int, istek: schemas.NotificationMarkRead, db: Session = Depends(get_db)):
+    _kullanici_kontrol(db, user_id)
+    adet = notifications.okundu_isaretle(db, user_id, istek.ids)
+    kalan = notifications.okunmamis_sayisi(db, user_id)
+    if adet:
+        event_bus.yayinla(user_id, "bildirim_okundu", {"ids": istek.ids, "okunmamis": kalan})
+    return {"isaretlenen": adet, "okunmamis": kalan}
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from typing import List
 import json
 import models, schemas
-from database import SessionLocal
+from database import SessionLocal, bulk_upsert
+from services import chat_context, decision_cache, plant_catalog
 
 router = APIRouter(prefix="/plant-types", tags=["Plants"])
 
@@ -25,12 +26,19 @@ def create_plant_type(plant: schemas.PlantTypeCreate, db: Session = Depends(get_
     db.add(db_plant)
     db.commit()
     db.refresh(db_plant)
+    plant_catalog.yenile(db)
+    decision_cache.tumunu_gecersiz_kil()
+    chat_context.tumunu_gecersiz_kil()
     return db_plant
 
-# 2. BITKILERI LISTELE
+# 2. BITKILERI LISTELE (bellekteki katalogdan, ETag ile)
 @router.get("/", response_model=List[schemas.PlantType])
-def read_plant_types(db: Session = Depends(get_db)):
-    return db.query(models.PlantType).all()
+def read_plant_types(request: Request):
+    govde, etag = plant_catalog.liste_cevabi()
+    basliklar = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=basliklar)
+    return Response(content=govde, media_type="application/json", headers=basliklar)
 
 # 3. TOHUM VERİLERİ - Araştırılmış gerçek tarımsal bilgilerle bitkileri yükle
 SEED_PLANTS = [
@@ -206,22 +214,20 @@ SEED_PLANTS = [
 
 @router.post("/seed")
 def seed_plant_types(db: Session = Depends(get_db)):
-    """Veritabanına araştırılmış gerçek bitki verilerini yükler."""
-    added = []
-    skipped = []
-    for plant_data in SEED_PLANTS:
-        existing = db.query(models.PlantType).filter(models.PlantType.name == plant_data["name"]).first()
-        if existing:
-            # Güncelle
-            for key, value in plant_data.items():
-                setattr(existing, key, value)
-            db.commit()
-            skipped.append(plant_data["name"])
-        else:
-            db_plant = models.PlantType(**plant_data)
-            db.add(db_plant)
-            db.commit()
-            added.append(plant_data["name"])
+    """Veritabanına araştırılmış gerçek bitki verilerini yükler (isim üzerinden tek transaction'da upsert)."""
+    isimler = [p["name"] for p in SEED_PLANTS]
+    mevcut = {
+        ad for (ad,) in db.query(models.PlantType.name).filter(models.PlantType.name.in_(isimler))
+    }
+    bulk_upsert(db, models.PlantType, SEED_PLANTS, conflict_cols=["name"])
+    db.commit()
+    added = [ad for ad in isimler if ad not in mevcut]
+    skipped = [ad for ad in isimler if ad in mevcut]
+    
+    # Bitki eşikleri değişmiş olabilir
+    plant_catalog.yenile(db)
+    decision_cache.tumunu_gecersiz_kil()
+    chat_context.tumunu_gecersiz_kil()
     
     return {
         "mesaj": f"{len(added)} bitki eklendi, {len(skipped)} bitki güncellendi.",
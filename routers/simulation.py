@@ -1,12 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from typing import Optional
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 import models, schemas
 from database import SessionLocal
 import datetime
-import requests
+import os
+from ml.predictor import predict_rain_paralel
+from services import (
+    chat_context, decision_cache, decision_log, event_bus, moisture_simulator, plant_catalog, pump_scheduler,
+)
+from services.field_inputs import hava_anahtari, son_sensor_loglari
+from services.irrigation_decision import get_hourly_weather, girdi_parmak_izi, hava_ozeti, karar_hesapla, karar_raporu
+from services.weather import konum_coz, saatlik_ham_veri_toplu
 
 router = APIRouter(prefix="/simulation", tags=["Simulation & Sensors"])
 
+# check-all-fields içindeki ML doğrulamanın paralellik sınırı
+SIMULATION_MAX_WORKERS = int(os.getenv("SIMULATION_MAX_WORKERS", "8"))
+
+# Canlı akışa "karar" olayı yalnızca kural değişince gider (tarla_id -> son kural indeksi)
+_son_kurallar = {}
+
 def get_db():
     db = SessionLocal()
     try:
@@ -16,7 +32,7 @@ def get_db():
 
 # 1. SENSÖR VERİSİ GÖNDER (Nemi veritabanına kaydeder)
 @router.post("/sensor-log/", response_model=schemas.SensorLog)
-def create_sensor_log(log: schemas.SensorLogCreate, db: Session = Depends(get_db)):
+def create_sensor_log(log: schemas.SensorLogCreate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     field = db.query(models.Field).filter(models.Field.id == log.field_id).first()
     if not field:
         raise HTTPException(status_code=404, detail="Tarla bulunamadı!")
@@ -25,23 +41,56 @@ def create_sensor_log(log: schemas.SensorLogCreate, db: Session = Depends(get_db
     db.add(db_log)
     db.commit()
     db.refresh(db_log)
+    decision_cache.tarla_gecersiz_kil(log.field_id)
+    chat_context.gecersiz_kil(log.field_id)
+
+    dinleyen = event_bus.yayinla(field.owner_id, "sensor", {
+        "id": db_log.id, "field_id": field.id, "timestamp": db_log.timestamp,
+        "moisture": db_log.moisture, "temperature": db_log.temperature, "is_raining": db_log.is_raining,
+    })
+    if dinleyen:
+        # Dinleyen varsa kararı cevaptan sonra yeniden hesapla; değiştiyse akışa düşer
+        background_tasks.add_task(karari_yenile, field.id)
     return db_log
 
 
-def get_hourly_weather(ilce: str = None, lat: float = None, lon: float = None):
-    """Saatlik hava tahminini çeker"""
+def karari_yenile(field_id: int):
+    """Kararı kendi oturumuyla yeniden hesaplar (arka plan görevleri ve scheduler için)"""
+    db = SessionLocal()
     try:
-        params = []
-        if ilce:
-            params.append(f"ilce={ilce}")
-        elif lat and lon:
-            params.append(f"lat={lat}&lon={lon}")
-        
-        url = f"http://127.0.0.1:8000/weather/hourly-forecast?{'&'.join(params)}&saat=24"
-        response = requests.get(url, timeout=5)
-        return response.json()
-    except:
-        return None
+        check_irrigation_status(field_id, db)
+    except Exception:
+        pass
+    finally:
+        db.close()
+
+
+def _karari_isle(field, last_log, hava: dict, ml_tahmin: dict, sonuc: dict) -> None:
+    """
+    Yeni hesaplanan kararın yan etkileri. Karar başına bir kez, yalnızca endpoint /
+    scheduler akışından çağrılır (chatbot bağlamı services/irrigation_decision.karar_hesapla ile salt okur).
+    """
+    ml_sulama_karari = ml_tahmin.get("sulama_karari", "") if isinstance(ml_tahmin, dict) else ""
+    ilk_yagis = hava["ilk_yagis"]
+    
+    # Karar günlüğü (kodlu, toplu yazılır)
+    decision_log.kaydet(
+        field.id, sonuc["kural_indeksi"], ml_sulama_karari,
+        hava["yagis_1_saat"], hava["yagis_3_saat"], hava["yagis_6_saat"],
+        ilk_yagis["kac_saat_sonra"] if ilk_yagis else None,
+        last_log.moisture, last_log.temperature, sensor_log_id=last_log.id,
+    )
+    
+    # Kural değiştiyse chatbot bağlamı eskidi; canlı akışa bildir
+    if _son_kurallar.get(field.id) != sonuc["kural_indeksi"]:
+        _son_kurallar[field.id] = sonuc["kural_indeksi"]
+        chat_context.gecersiz_kil(field.id)
+        event_bus.yayinla(field.owner_id, "karar", {
+            "tarla_id": field.id,
+            "tarla_adi": field.name,
+            "kural": sonuc["kural"],
+            **sonuc["karar"],
+        })
 
 
 # 2. AKILLI SULAMA KARAR MEKANİZMASI (Saatlik Hava Tahmini + Kritik Sınırlar)
@@ -61,295 +110,87 @@ def check_irrigation_status(field_id: int, db: Session = Depends(get_db)):
     - DÜŞÜK NEM + YAKIN YAĞMUR: Bekle, yağmur sulayacak
     - DÜŞÜK NEM + UZAK/YOK YAĞMUR: Şimdi sula
     """
-    
-    # A. Veritabanından son toprak nemini bul
-    last_log = db.query(models.SensorLog)\
-        .filter(models.SensorLog.field_id == field_id)\
-        .order_by(models.SensorLog.timestamp.desc())\
-        .first()
-
-    if not last_log:
-        return {"mesaj": "Henüz sensör verisi gelmedi, karar verilemiyor."}
-
-    # B. Tarla ve Bitki bilgilerini çek
-    field = db.query(models.Field).filter(models.Field.id == field_id).first()
-    if not field:
-        raise HTTPException(status_code=404, detail="Tarla bulunamadı!")
-    
-    bitki = field.plant_type
-    
-    # Kritik sınırlar (varsayılan değerlerle)
-    kritik_nem = getattr(bitki, 'critical_moisture', 10.0) or 10.0
-    min_nem = bitki.min_moisture
-    max_nem = bitki.max_moisture
-    max_bekleme = getattr(bitki, 'max_wait_hours', 6) or 6
-    
-    # C. SAATLIK HAVA TAHMİNİ ÇEK (İlçe bazlı!)
-    ilce = getattr(field, 'ilce', None) or "cankaya"
-    lat = getattr(field, 'latitude', None)
-    lon = getattr(field, 'longitude', None)
-    
-    weather_data = get_hourly_weather(ilce=ilce, lat=lat, lon=lon)
-    
-    # Hava durumu analizi
-    if weather_data and "hata" not in weather_data:
-        konum = weather_data.get("konum", ilce)
-        yagis_1_saat = weather_data.get("onumuzdeki_1_saat_yagis", False)
-        yagis_3_saat = weather_data.get("onumuzdeki_3_saat_yagis", False)
-        yagis_6_saat = weather_data.get("onumuzdeki_6_saat_yagis", False)
-        ilk_yagis = weather_data.get("ilk_yagis")
-        saatlik = weather_data.get("saatlik_tahmin", [])[:12]  # İlk 12 saat
-    else:
-        konum = ilce
-        yagis_1_saat = False
-        yagis_3_saat = False
-        yagis_6_saat = False
-        ilk_yagis = None
-        saatlik = []
-    
-    mevcut_nem = last_log.moisture
-    
-    # D. 🧠 ML HAVA TAHMİNİ DOĞRULAMA
-    ml_tahmin = None
-    ml_override = False
-    ml_strateji = None
     try:
-        from ml.predictor import predict_rain
-        ml_result = predict_rain(field_id, {
-            "moisture": last_log.moisture,
-            "temperature": last_log.temperature,
-        })
-        ml_tahmin = ml_result
-    except Exception:
-        ml_tahmin = {"mesaj": "ML modeli henüz eğitilmedi. POST /prediction/train-all çağırın."}
-    
-    # E. 🧠 AKILLI KARAR MANTIĞI (ML destekli savunmacı sulama)
-    karar = {
-        "durum": "IDEAL",
-        "aksiyon": "Sulama gerekmiyor",
-        "aciliyet": "YOK",
-        "detay": "",
-        "pompa": "KAPALI"
-    }
-    
-    # ML'den gelen sulama kararı
-    ml_sulama_karari = ml_tahmin.get("sulama_karari", "") if isinstance(ml_tahmin, dict) else ""
-    
-    # SENARYO 1: KRİTİK NEM
-    if mevcut_nem < kritik_nem:
-        # Yağmur tahmini var ve ML güvenmiyorsa → sadece minimum'a sula (savunmacı)
-        if (yagis_1_saat or yagis_3_saat or yagis_6_saat) and ml_sulama_karari == "GUVENME_SULA":
-            karar = {
-                "durum": "KRİTİK_SAVUNMACI",
-                "aksiyon": "Minimum seviyeye sulama yapılıyor",
-                "aciliyet": "YÜKSEK",
-                "detay": f"Toprak nemi %{mevcut_nem} kritik! Hava tahmini yağmur diyor ama "
-                         f"ML modeline göre bu tarlaya geçmişte yağmur gelmemiş. "
-                         f"Bitki korunması için sadece minimum seviyeye (%{min_nem}) sulanıyor. "
-                         f"Yağmur gelirse fazla su harcanmamış olur.",
-                "pompa": "MİNİMUM_DOZ",
-                "sulama_hedef_nem": min_nem
-            }
-            ml_override = True
-            ml_strateji = "SAVUNMACI"
-        else:
-            # ML güveniyorsa ya da yağmur yoksa → normal acil sulama
-            karar = {
-                "durum": "KRİTİK",
-                "aksiyon": "ACİL SULAMA BAŞLATILDI",
-                "aciliyet": "ÇOK YÜKSEK",
-                "detay": f"Toprak nemi %{mevcut_nem} ile kritik sınırın (%{kritik_nem}) altında! "
-                         f"Yağmur beklense bile bitki zarar görebilir, acil sulama yapılıyor.",
-                "pompa": "AÇIK"
-            }
-    
-    # SENARYO 2: DÜŞÜK NEM (min_moisture altında)
-    elif mevcut_nem < min_nem:
-        yagmur_bekleniyor = yagis_1_saat or yagis_3_saat or yagis_6_saat
-        
-        # ML güvenmiyorsa → savunmacı mod: kritik'e düşene kadar bekle, düşünce minimum'a sula
-        if yagmur_bekleniyor and ml_sulama_karari == "GUVENME_SULA":
-            ml_override = True
-            ml_strateji = "SAVUNMACI"
-            ml_aciklama = ml_tahmin.get("karar_aciklama", "") if isinstance(ml_tahmin, dict) else ""
-            
-            if mevcut_nem <= kritik_nem + 3:  # Kritik sınıra çok yakın
-                karar = {
-                    "durum": "SAVUNMACI_SULAMA",
-                    "aksiyon": "Minimum seviyeye sulama yapılıyor",
-                    "aciliyet": "YÜKSEK",
-                    "detay": f"Toprak nemi %{mevcut_nem} kritik sınıra (%{kritik_nem}) çok yakın! "
-                             f"Hava tahmini yağmur diyor ama ML bu tarlaya güvenmiyor. "
-                             f"Bitki korunması için minimum seviyeye (%{min_nem}) sulanıyor, sonra durulacak. "
-                             f"Yağmur gelirse kurtuluruz, gelmezse tekrar sulanır.",
-                    "pompa": "MİNİMUM_DOZ",
-                    "sulama_hedef_nem": min_nem
-                }
-            else:
-                karar = {
-                    "durum": "SAVUNMACI_BEKLEME",
-                    "aksiyon": "Bekleniyor - kritik düşerse minimum sulanacak",
-                    "aciliyet": "ORTA",
-                    "detay": f"Toprak kuru (%{mevcut_nem}) ve yağmur tahmini var ama ML güvenmiyor. "
-                             f"Nem henüz kritik seviyeye (%{kritik_nem}) düşmedi. Bekleniyor. "
-                             f"Kritik sınıra düşerse sadece minimum seviyeye (%{min_nem}) sulanacak.",
-                    "pompa": "KAPALI"
-                }
-        
-        # ML güveniyorsa (GUVEN_BEKLE) → mevcut erteleme mantığı aynen
-        elif yagmur_bekleniyor and ml_sulama_karari == "GUVEN_BEKLE":
-            if yagis_1_saat:
-                karar = {
-                    "durum": "SULAMA ERTELENDİ",
-                    "aksiyon": "1 saat bekle, yağmur geliyor (ML onaylı)",
-                    "aciliyet": "DÜŞÜK",
-                    "detay": f"Toprak kuru (%{mevcut_nem}) ama 1 saat içinde yağış bekleniyor. "
-                             f"ML modeli de bu tarlada yağmurun gerçekleşeceğini doğruluyor. "
-                             f"Doğal sulama için bekleniyor.",
-                    "pompa": "KAPALI"
-                }
-            elif yagis_3_saat and mevcut_nem > kritik_nem + 5:
-                ilk_yagis_saat = ilk_yagis["kac_saat_sonra"] if ilk_yagis else "?"
-                karar = {
-                    "durum": "SULAMA ERTELENDİ",
-                    "aksiyon": f"{ilk_yagis_saat} saat sonra yağmur (ML onaylı)",
-                    "aciliyet": "ORTA",
-                    "detay": f"Toprak kuru (%{mevcut_nem}) ama {ilk_yagis_saat} saat içinde yağış var. "
-                             f"ML modeli bu tarlada yağmurun güvenilir olduğunu doğruluyor.",
-                    "pompa": "KAPALI"
-                }
-            elif yagis_6_saat and mevcut_nem > kritik_nem + 10:
-                ilk_yagis_saat = ilk_yagis["kac_saat_sonra"] if ilk_yagis else "?"
-                karar = {
-                    "durum": "KISMI SULAMA ÖNERİLİR",
-                    "aksiyon": f"Hafif sulama, {ilk_yagis_saat} saat sonra yağmur (ML onaylı)",
-                    "aciliyet": "ORTA",
-                    "detay": f"Toprak kuru (%{mevcut_nem}), yağmur {ilk_yagis_saat} saat sonra. "
-                             f"ML tahmine güveniyor, yarım doz sulama ile yağmura bırakılabilir.",
-                    "pompa": "YARIM_DOZ"
-                }
-            else:
-                karar = {
-                    "durum": "SULAMA GEREKLİ",
-                    "aksiyon": "Tam sulama başlatılıyor",
-                    "aciliyet": "YÜKSEK",
-                    "detay": f"Toprak kuru (%{mevcut_nem}) ve yağmur beklenmiyor. "
-                             f"Sulama pompası çalıştırılıyor.",
-                    "pompa": "AÇIK"
-                }
-        
-        # ML modeli yoksa veya yağmur yoksa → eski mantık
-        else:
-            if yagis_1_saat:
-                karar = {
-                    "durum": "SULAMA ERTELENDİ",
-                    "aksiyon": "1 saat bekle, yağmur geliyor",
-                    "aciliyet": "DÜŞÜK",
-                    "detay": f"Toprak kuru (%{mevcut_nem}) ama 1 saat içinde yağış bekleniyor. "
-                             f"Doğal sulama için bekleniyor, su tasarrufu sağlanıyor.",
-                    "pompa": "KAPALI"
-                }
-            elif yagis_3_saat and mevcut_nem > kritik_nem + 5:
-                ilk_yagis_saat = ilk_yagis["kac_saat_sonra"] if ilk_yagis else "?"
-                karar = {
-                    "durum": "SULAMA ERTELENDİ",
-                    "aksiyon": f"{ilk_yagis_saat} saat sonra yağmur bekleniyor",
-                    "aciliyet": "ORTA",
-                    "detay": f"Toprak kuru (%{mevcut_nem}) ama {ilk_yagis_saat} saat içinde yağış var. "
-                             f"Bitki bu süre dayanabilir, yağmur beklenecek.",
-                    "pompa": "KAPALI"
-                }
-            elif yagis_6_saat and mevcut_nem > kritik_nem + 10:
-                ilk_yagis_saat = ilk_yagis["kac_saat_sonra"] if ilk_yagis else "?"
-                karar = {
-                    "durum": "KISMI SULAMA ÖNERİLİR",
-                    "aksiyon": f"Hafif sulama yap, {ilk_yagis_saat} saat sonra yağmur var",
-                    "aciliyet": "ORTA",
-                    "detay": f"Toprak kuru (%{mevcut_nem}), yağmur {ilk_yagis_saat} saat sonra. "
-                             f"Yarım doz sulama yapılıp yağmura bırakılabilir.",
-                    "pompa": "YARIM_DOZ"
-                }
-            else:
-                karar = {
-                    "durum": "SULAMA GEREKLİ",
-                    "aksiyon": "Tam sulama başlatılıyor",
-                    "aciliyet": "YÜKSEK",
-                    "detay": f"Toprak kuru (%{mevcut_nem}) ve önümüzdeki {max_bekleme} saat yağış beklenmiyor. "
-                             f"Sulama pompası çalıştırılıyor.",
-                    "pompa": "AÇIK"
-                }
-    
-    # SENARYO 3: AŞIRI NEM
-    elif mevcut_nem > max_nem:
-        karar = {
-            "durum": "AŞIRI ISLAK",
-            "aksiyon": "Sulama durduruldu",
-            "aciliyet": "YOK",
-            "detay": f"Toprak nemi %{mevcut_nem} ile üst sınırın (%{max_nem}) üzerinde. "
-                     f"Aşırı sulama kök çürümesine neden olabilir!",
-            "pompa": "KAPALI"
-        }
-    
-    # SENARYO 4: İDEAL NEM
-    else:
-        karar = {
-            "durum": "İDEAL",
-            "aksiyon": "Sulama gerekmiyor",
-            "aciliyet": "YOK",
-            "detay": f"Toprak nemi %{mevcut_nem} ideal aralıkta (%{min_nem}-%{max_nem}).",
-            "pompa": "KAPALI"
-        }
-    
-    # F. SONUÇ RAPORU
-    return {
-        "tarla": {
-            "id": field.id,
-            "ad": field.name,
-            "ilce": ilce,
-            "konum_detay": konum
-        },
-        "bitki": {
-            "ad": bitki.name,
-            "kritik_nem": kritik_nem,
-            "min_nem": min_nem,
-            "max_nem": max_nem,
-            "max_yagmur_bekleme_saat": max_bekleme
-        },
-        "sensor": {
-            "anlik_nem": mevcut_nem,
-            "olcum_zamani": last_log.timestamp.strftime("%d/%m/%Y %H:%M"),
-            "sicaklik": last_log.temperature
-        },
-        "hava_durumu": {
-            "konum": konum,
-            "1_saat_icinde_yagis": yagis_1_saat,
-            "3_saat_icinde_yagis": yagis_3_saat,
-            "6_saat_icinde_yagis": yagis_6_saat,
-            "ilk_yagis": ilk_yagis,
-            "onumuzdeki_12_saat": saatlik
-        },
-        "karar": karar,
-        "ml_tahmin": ml_tahmin,
-        "ml_override": ml_override,
-        "ml_strateji": ml_strateji,
-        "zaman_damgasi": datetime.datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-    }
+        rapor, yeni = karar_hesapla(field_id, db)
+    except LookupError:
+        raise HTTPException(status_code=404, detail="Tarla bulunamadı!")
+    if yeni is not None:
+        _karari_isle(*yeni)
+    return rapor
 
 
 # 3. TÜM TARLALAR İÇİN TOPLU KARAR
 @router.get("/check-all-fields/{user_id}")
 def check_all_fields(user_id: int, db: Session = Depends(get_db)):
-    """Kullanıcının tüm tarlaları için sulama kararı verir"""
+    """
+    Kullanıcının tüm tarlaları için sulama kararı verir.
+    Hava tahmini her farklı konum için bir kez (toplu istekle) çekilir,
+    ML doğrulama tüm tarlalar için paralel çalışır.
+    """
     
     fields = db.query(models.Field).filter(models.Field.owner_id == user_id).all()
     
     if not fields:
         return {"mesaj": "Bu kullanıcıya ait tarla bulunamadı."}
     
+    son_loglar = son_sensor_loglari(db, [f.id for f in fields])
+    hava_anahtarlari = {f.id: hava_anahtari(f) for f in fields}
+    
+    # Önbellekte güncel kararı olan tarlalar yeniden hesaplanmaz
+    hazir_kararlar = {}
+    for field in fields:
+        last_log = son_loglar.get(field.id)
+        bitki = plant_catalog.getir(field.plant_type_id)
+        if last_log and bitki:
+            parmak_izi = girdi_parmak_izi(field, bitki, last_log, hava_anahtarlari[field.id])
+            onbellekte = decision_cache.onbellekten_al(field.id, parmak_izi)
+            if onbellekte is not None:
+                hazir_kararlar[field.id] = onbellekte
+    hesaplanacak = [f for f in fields if f.id not in hazir_kararlar]
+    
+    gereken_konumlar = {hava_anahtarlari[f.id] for f in hesaplanacak}
+    
+    def _hava_topla():
+        # Önbellekte olmayan konumlar tek upstream isteğinde çekilir
+        koordinatlar = [konum_coz(*k) for k in gereken_konumlar]
+        try:
+            saatlik_ham_veri_toplu([(k[0], k[1]) for k in koordinatlar if k])
+        except Exception:
+            pass
+        return {k: get_hourly_weather(*k) for k in gereken_konumlar}
+    
+    ml_girdileri = {
+        f.id: {"moisture": son_loglar[f.id].moisture, "temperature": son_loglar[f.id].temperature}
+        for f in hesaplanacak if f.id in son_loglar
+    }
+    
+    # Hava ve ML paralel: toplam süre en yavaş bağımlılığa yaklaşır
+    with ThreadPoolExecutor(max_workers=2) as havuz:
+        hava_isi = havuz.submit(_hava_topla)
+        ml_isi = havuz.submit(predict_rain_paralel, ml_girdileri, SIMULATION_MAX_WORKERS)
+        hava_verileri = hava_isi.result()
+        ml_sonuclari = ml_isi.result()
+    
     sonuclar = []
     for field in fields:
         try:
-            karar = check_irrigation_status(field.id, db)
+            last_log = son_loglar.get(field.id)
+            if field.id in hazir_kararlar:
+                karar = hazir_kararlar[field.id]
+            elif not last_log:
+                karar = {}
+            else:
+                ilce = hava_anahtarlari[field.id][0]
+                ml_tahmin = ml_sonuclari.get(field.id)
+                if not isinstance(ml_tahmin, dict):
+                    ml_tahmin = {"mesaj": "ML modeli henüz eğitilmedi. POST /prediction/train-all çağırın."}
+                hava = hava_ozeti(hava_verileri.get(hava_anahtarlari[field.id]), ilce)
+                bitki = plant_catalog.getir(field.plant_type_id)
+                sonuc, karar = karar_raporu(field, bitki, last_log, ilce, hava, ml_tahmin)
+                decision_cache.onbellege_yaz(
+                    field.id, girdi_parmak_izi(field, bitki, last_log, hava_anahtarlari[field.id]), karar
+                )
+                _karari_isle(field, last_log, hava, ml_tahmin, sonuc)
             sonuclar.append({
                 "tarla_id": field.id,
                 "tarla_adi": field.name,
@@ -371,4 +212,163 @@ def check_all_fields(user_id: int, db: Session = Depends(get_db)):
         "toplam_tarla": len(fields),
         "analiz_zamani": datetime.datetime.now().strftime("%d/%m/%Y %H:%M"),
         "tarlalar": sonuclar
-    }
\ No newline at end of file
+    }
+
+
+# 4. KARAR GÜNLÜĞÜ
+@router.get("/decision-log/{field_id}")
+def get_decision_log(
+    field_id: int,
+    baslangic: Optional[datetime.datetime] = Query(None, description="Bu zamandan itibaren (ISO)"),
+    bitis: Optional[datetime.datetime] = Query(None, description="Bu zamana kadar (ISO)"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    """Tarlanın geçmiş sulama kararlarını yeniden eskiye döner"""
+    field = db.query(models.Field).filter(models.Field.id == field_id).first()
+    if not field:
+        raise HTTPException(status_code=404, detail="Tarla bulunamadı!")
+    
+    # Tampondaki son kararlar da görünsün
+    decision_log.tamponu_bosalt()
+    kayitlar = decision_log.sorgula(db, field_id, baslangic, bitis, limit)
+    return {
+        "tarla_id": field_id,
+        "tarla_adi": field.name,
+        "kayit_sayisi": len(kayitlar),
+        "kararlar": [decision_log.kayit_coz(k) for k in kayitlar],
+    }
+
+
+
+# 5. NEM PROJEKSİYONU (What-If)
+def _nem_projeksiyonu(db: Session, user_id: int, istek: schemas.NemProjeksiyonIstegi) -> dict:
+    if not 1 <= istek.saat <= 72:
+        raise HTTPException(status_code=400, detail="saat 1-72 arasında olmalı")
+
+    fields = db.query(models.Field).filter(models.Field.owner_id == user_id).all()
+    if not fields:
+        raise HTTPException(status_code=404, detail="Bu kullanıcıya ait tarla bulunamadı!")
+
+    girdi = moisture_simulator.projeksiyon_girdileri(db, fields, istek.saat)
+    veri_var = ~np.isnan(girdi["baslangic_nem"])
+
+    plan = None
+    if istek.pompa_plani:
+        plan = np.zeros_like(girdi["yagis_mm"])
+        satir = {fid: i for i, fid in enumerate(girdi["field_ids"].tolist())}
+        for fid, saatler in istek.pompa_plani.items():
+            if fid in satir:
+                gecerli = [s for s in saatler if 0 <= s < istek.saat]
+                plan[satir[fid], gecerli] = 1.0
+
+    sonuc = moisture_simulator.nem_projeksiyonu(
+        np.where(veri_var, girdi["baslangic_nem"], 0.0), girdi["kuruma_hizi"], girdi["yagis_mm"],
+        girdi["sicaklik"], girdi["pompa_debisi"], girdi["kritik"], plan,
+    )
+    nem = np.round(sonuc["nem"], 1)
+
+    tarlalar = []
+    for i, field in enumerate(fields):
+        if not veri_var[i]:
+            tarlalar.append({"tarla_id": field.id, "tarla_adi": field.name, "mesaj": "Sensör verisi yok"})
+            continue
+        kritik_saat = int(sonuc["kritik_saat"][i])
+        kayit = {
+            "tarla_id": field.id,
+            "tarla_adi": field.name,
+            "mevcut_nem": float(nem[i, 0]),
+            "kuruma_hizi": round(float(girdi["kuruma_hizi"][i]), 3),
+            "kritik_nem": float(girdi["kritik"][i]),
+            "kritik_saat": kritik_saat if kritik_saat >= 0 else None,
+            "min_nem": float(nem[i].min()),
+            "son_nem": float(nem[i, -1]),
+            "toplam_yagis_mm": round(float(girdi["yagis_mm"][i].sum()), 1),
+        }
+        if istek.seri:
+            kayit["nem_serisi"] = nem[i].tolist()
+        tarlalar.append(kayit)
+
+    return {
+        "kullanici_id": user_id,
+        "ufuk_saat": istek.saat,
+        "analiz_zamani": datetime.datetime.now().strftime("%d/%m/%Y %H:%M"),
+        "tarlalar": tarlalar,
+    }
+
+
+@router.get("/projection/{user_id}")
+def get_moisture_projection(
+    user_id: int,
+    saat: int = Query(48, ge=1, le=72),
+    seri: bool = False,
+    db: Session = Depends(get_db),
+):
+    """Pompa çalışmazsa tarlaların nem seyri ve kritik sınıra ineceği saat"""
+    return _nem_projeksiyonu(db, user_id, schemas.NemProjeksiyonIstegi(saat=saat, seri=seri))
+
+
+@router.post("/projection/{user_id}")
+def simulate_moisture_projection(user_id: int, istek: schemas.NemProjeksiyonIstegi, db: Session = Depends(get_db)):
+    """Verilen pompa planıyla (what-if) nem seyri"""
+    return _nem_projeksiyonu(db, user_id, istek)
+
+
+# 6. ORTAK KAYNAK POMPA PLANI
+@router.post("/pump-schedule/{user_id}")
+def create_pump_schedule(user_id: int, istek: schemas.PompaPlaniIstegi, db: Session = Depends(get_db)):
+    """Kullanıcının tüm tarlaları için kapasite kısıtlı, en düşük maliyetli pompa planı"""
+    if not 1 <= istek.saat <= 72:
+        raise HTTPException(status_code=400, detail="saat 1-72 arasında olmalı")
+    if istek.tarife is not None and len(istek.tarife) != 24:
+        raise HTTPException(status_code=400, detail="tarife 24 saatlik olmalı")
+
+    fields = db.query(models.Field).filter(models.Field.owner_id == user_id).all()
+    if not fields:
+        raise HTTPException(status_code=404, detail="Bu kullanıcıya ait tarla bulunamadı!")
+
+    girdi = moisture_simulator.projeksiyon_girdileri(db, fields, istek.saat)
+    veri_var = ~np.isnan(girdi["baslangic_nem"])
+    girdi = {ad: dizi[veri_var] for ad, dizi in girdi.items()}
+    tarlalar = [f for f, var in zip(fields, veri_var) if var]
+
+    baslangic = datetime.datetime.now().replace(minute=0, second=0, microsecond=0)
+    tarife = None
+    if istek.tarife is not None:
+        tarife = np.array([istek.tarife[(baslangic.hour + t) % 24] for t in range(istek.saat)])
+
+    sonuc = pump_scheduler.pompa_plani_olustur(
+        girdi, kapasite=istek.toplam_kapasite, tarife=tarife, guvenlik_payi=istek.guvenlik_payi,
+    )
+
+    def _saat(t):
+        return (baslangic + datetime.timedelta(hours=t)).strftime("%d/%m %H:00")
+
+    plan = []
+    for i, field in enumerate(tarlalar):
+        saatler = pump_scheduler.saat_listesi(sonuc["plan"][i])
+        plan.append({
+            "tarla_id": field.id,
+            "tarla_adi": field.name,
+            "mevcut_nem": round(float(girdi["baslangic_nem"][i]), 1),
+            "pompa_saatleri": [_saat(t) for t in saatler],
+            "toplam_dakika": len(saatler) * 60,
+            "su_litre": round(float(sonuc["litre"][i]), 1),
+            "maliyet_tl": round(float(sonuc["maliyet"][i]), 2),
+            "min_nem": round(float(sonuc["nem"][i].min()), 1),
+            "kritik_nem": float(girdi["kritik"][i]),
+            "cozulemedi": bool(sonuc["cozulemeyen"][i]),
+        })
+
+    kapasite = istek.toplam_kapasite or pump_scheduler.PUMP_SHARED_CAPACITY
+    return {
+        "kullanici_id": user_id,
+        "baslangic": _saat(0),
+        "ufuk_saat": istek.saat,
+        "toplam_kapasite": kapasite,
+        "toplam_maliyet_tl": round(float(sonuc["maliyet"].sum()), 2),
+        "toplam_su_litre": round(float(sonuc["litre"].sum()), 1),
+        "saatlik_kullanim": {_saat(t): float(k) for t, k in enumerate(sonuc["kullanim"]) if k > 0},
+        "veri_olmayan_tarlalar": [f.id for f, var in zip(fields, veri_var) if not var],
+        "tarlalar": plan,
+    }
@@ -0,0 +1,45 @@
+"""
+Canlı Akış API (Server-Sent Events)
+- Kullanıcının tarlalarındaki yeni sensör ölçümleri, karar değişiklikleri,
+  bildirimler ve sulama olayları oluştukları anda gönderilir
+- İstemci polling yerine tek bir EventSource bağlantısı açar
+"""
+
+import asyncio
+import os
+
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+
+from services import event_bus
+
+router = APIRouter(prefix="/stream", tags=["Canlı Akış"])
+
+# Proxy'lerin boşta bağlantıyı kesmemesi için yorum satırı gönderme aralığı
+STREAM_KEEPALIVE_SECONDS = float(os.getenv("STREAM_KEEPALIVE_SECONDS", "15"))
+
+
+@router.get("/user/{user_id}")
+async def stream_user_events(user_id: int, request: Request):
+    """Kullanıcıya ait canlı olay akışı (text/event-stream)"""
+
+    async def olay_akisi():
+        kuyruk = event_bus.abone_ol(user_id)
+        try:
+            # İstemci 3 sn sonra yeniden bağlansın
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    olay = await asyncio.wait_for(kuyruk.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield event_bus.sse_metni(olay["tur"], olay["veri"], olay["id"])
+        finally:
+            event_bus.abonelikten_cik(user_id, kuyruk)
+
+    return StreamingResponse(
+        olay_akisi(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -4,6 +4,7 @@ import hashlib
 from typing import List
 import models, schemas
 from database import SessionLocal
+from services import chat_context, decision_cache, plant_catalog
 
 # Router tanımlıyoruz (app yerine router kullanacağız)
 router = APIRouter(prefix="/users", tags=["Users & Fields"])
@@ -86,13 +87,12 @@ def update_field_plant_type(
     if not field:
         raise HTTPException(status_code=404, detail="Tarla bulunamadı")
     
-    plant_type = db.query(models.PlantType).filter(
-        models.PlantType.id == update_data.plant_type_id
-    ).first()
-    if not plant_type:
+    if plant_catalog.getir(update_data.plant_type_id) is None:
         raise HTTPException(status_code=404, detail="Geçersiz bitki türü")
     
     field.plant_type_id = update_data.plant_type_id
     db.commit()
     db.refresh(field)
+    decision_cache.tarla_gecersiz_kil(field_id)
+    chat_context.gecersiz_kil(field_id)
     return field
\ No newline at end of file
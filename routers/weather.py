@@ -1,97 +1,9 @@
 from fastapi import APIRouter, Query
-import requests
-from datetime import datetime, timedelta
 from typing import Optional
 
-router = APIRouter(prefix="/weather", tags=["Weather Integration"])
-
-# Türkiye'deki popüler ilçelerin koordinatları
-ILCE_KOORDINATLARI = {
-    # Ankara İlçeleri
-    "cankaya": {"lat": 39.9032, "lon": 32.8597, "il": "Ankara"},
-    "kecioren": {"lat": 39.9875, "lon": 32.8697, "il": "Ankara"},
-    "mamak": {"lat": 39.9311, "lon": 32.9136, "il": "Ankara"},
-    "etimesgut": {"lat": 39.9456, "lon": 32.6786, "il": "Ankara"},
-    "sincan": {"lat": 39.9697, "lon": 32.5833, "il": "Ankara"},
-    "yenimahalle": {"lat": 39.9667, "lon": 32.8167, "il": "Ankara"},
-    "polatli": {"lat": 39.5844, "lon": 32.1472, "il": "Ankara"},
-    "haymana": {"lat": 39.4319, "lon": 32.4967, "il": "Ankara"},
-    "beypazari": {"lat": 40.1678, "lon": 31.9214, "il": "Ankara"},
-    "cubuk": {"lat": 40.2358, "lon": 33.0286, "il": "Ankara"},
-    
-    # İstanbul İlçeleri
-    "kadikoy": {"lat": 40.9811, "lon": 29.0636, "il": "İstanbul"},
-    "besiktas": {"lat": 41.0422, "lon": 29.0056, "il": "İstanbul"},
-    "uskudar": {"lat": 41.0236, "lon": 29.0153, "il": "İstanbul"},
-    "silivri": {"lat": 41.0733, "lon": 28.2478, "il": "İstanbul"},
-    
-    # İzmir İlçeleri
-    "bornova": {"lat": 38.4700, "lon": 27.2200, "il": "İzmir"},
-    "karsiyaka": {"lat": 38.4561, "lon": 27.1119, "il": "İzmir"},
-    "odemis": {"lat": 38.2242, "lon": 27.9714, "il": "İzmir"},
-    
-    # Konya İlçeleri
-    "selcuklu": {"lat": 37.9400, "lon": 32.4700, "il": "Konya"},
-    "meram": {"lat": 37.8333, "lon": 32.4333, "il": "Konya"},
-    "eregli": {"lat": 37.5167, "lon": 34.0500, "il": "Konya"},
-    "cumra": {"lat": 37.5722, "lon": 32.7744, "il": "Konya"},
-    "karapinar": {"lat": 37.7167, "lon": 33.5500, "il": "Konya"},
-    "cihanbeyli": {"lat": 38.6558, "lon": 32.9278, "il": "Konya"},
-    "aksehir": {"lat": 38.3575, "lon": 31.4158, "il": "Konya"},
-    "beysehir": {"lat": 37.6786, "lon": 31.7250, "il": "Konya"},
-    
-    # Antalya İlçeleri
-    "serik": {"lat": 36.9200, "lon": 31.1000, "il": "Antalya"},
-    "kumluca": {"lat": 36.3667, "lon": 30.2833, "il": "Antalya"},
-    
-    # Ağrı İlçeleri
-    "patnos": {"lat": 39.2333, "lon": 43.6833, "il": "Ağrı"},
-    "dogubayazit": {"lat": 39.7217, "lon": 44.0867, "il": "Ağrı"},
-    
-    # Diğer önemli tarım ilçeleri
-    "tarsus": {"lat": 36.9167, "lon": 34.8833, "il": "Mersin"},
-    "ceyhan": {"lat": 37.0292, "lon": 35.8125, "il": "Adana"},
-    "akhisar": {"lat": 38.9167, "lon": 27.8333, "il": "Manisa"},
-    "alasehir": {"lat": 38.3500, "lon": 28.5167, "il": "Manisa"},
-}
-
-def ruzgar_yonu_text(derece: float) -> str:
-    """Rüzgar yönü derecesini Türkçe metne çevirir"""
-    if derece is None:
-        return ""
-    yonler = ["Kuzey", "Kuzeydoğu", "Doğu", "Güneydoğu", "Güney", "Güneybatı", "Batı", "Kuzeybatı"]
-    idx = round(derece / 45) % 8
-    return yonler[idx]
+from services.weather import ILCE_KOORDINATLARI, anlik_hava, saatlik_tahmin_olustur
 
-
-def hava_kodu_aciklama(code: int) -> dict:
-    """WMO hava durumu kodunu Türkçe açıklamaya çevirir"""
-    kodlar = {
-        0: {"durum": "Açık", "yagis": False, "emoji": "☀️"},
-        1: {"durum": "Az Bulutlu", "yagis": False, "emoji": "🌤️"},
-        2: {"durum": "Parçalı Bulutlu", "yagis": False, "emoji": "⛅"},
-        3: {"durum": "Kapalı", "yagis": False, "emoji": "☁️"},
-        45: {"durum": "Sisli", "yagis": False, "emoji": "🌫️"},
-        48: {"durum": "Kırağılı Sis", "yagis": False, "emoji": "🌫️"},
-        51: {"durum": "Hafif Çisenti", "yagis": True, "emoji": "🌦️"},
-        53: {"durum": "Orta Çisenti", "yagis": True, "emoji": "🌦️"},
-        55: {"durum": "Yoğun Çisenti", "yagis": True, "emoji": "🌧️"},
-        61: {"durum": "Hafif Yağmur", "yagis": True, "emoji": "🌧️"},
-        63: {"durum": "Orta Yağmur", "yagis": True, "emoji": "🌧️"},
-        65: {"durum": "Şiddetli Yağmur", "yagis": True, "emoji": "🌧️"},
-        66: {"durum": "Hafif Dondurucu Yağmur", "yagis": True, "emoji": "🌨️"},
-        67: {"durum": "Şiddetli Dondurucu Yağmur", "yagis": True, "emoji": "🌨️"},
-        71: {"durum": "Hafif Kar", "yagis": True, "emoji": "❄️"},
-        73: {"durum": "Orta Kar", "yagis": True, "emoji": "❄️"},
-        75: {"durum": "Şiddetli Kar", "yagis": True, "emoji": "❄️"},
-        80: {"durum": "Hafif Sağanak", "yagis": True, "emoji": "🌧️"},
-        81: {"durum": "Orta Sağanak", "yagis": True, "emoji": "🌧️"},
-        82: {"durum": "Şiddetli Sağanak", "yagis": True, "emoji": "⛈️"},
-        95: {"durum": "Gök Gürültülü Fırtına", "yagis": True, "emoji": "⛈️"},
-        96: {"durum": "Dolu ile Fırtına", "yagis": True, "emoji": "⛈️"},
-        99: {"durum": "Şiddetli Dolu Fırtınası", "yagis": True, "emoji": "⛈️"},
-    }
-    return kodlar.get(code, {"durum": "Bilinmiyor", "yagis": False, "emoji": "❓"})
+router = APIRouter(prefix="/weather", tags=["Weather Integration"])
 
 
 @router.get("/current")
@@ -101,62 +13,7 @@ def get_real_weather(
     lon: Optional[float] = Query(None, description="Boylam (opsiyonel, ilçe verilmezse)")
 ):
     """Anlık hava durumunu getirir. İlçe adı veya koordinat verilebilir."""
-    
-    # Koordinatları belirle
-    if ilce:
-        ilce_lower = ilce.lower().replace("ı", "i").replace("ş", "s").replace("ç", "c").replace("ğ","g").replace("ü","u").replace("ö","o")
-        koord = ILCE_KOORDINATLARI.get(ilce_lower)
-        if not koord:
-            return {"hata": f"'{ilce}' ilçesi bulunamadı. Mevcut ilçeler: {list(ILCE_KOORDINATLARI.keys())}"}
-        latitude, longitude = koord["lat"], koord["lon"]
-        lokasyon = f"{ilce.title()}, {koord['il']}"
-    elif lat and lon:
-        latitude, longitude = lat, lon
-        lokasyon = f"Koordinat ({lat}, {lon})"
-    else:
-        # Varsayılan: Ankara merkez
-        latitude, longitude = 39.93, 32.85
-        lokasyon = "Ankara (Varsayılan)"
-    
-    url = (
-        f"https://api.open-meteo.com/v1/forecast?"
-        f"latitude={latitude}&longitude={longitude}"
-        f"&current=temperature_2m,relative_humidity_2m,apparent_temperature,wind_speed_10m,wind_direction_10m,weather_code"
-        f"&timezone=Europe/Istanbul"
-    )
-    
-    response = requests.get(url)
-    data = response.json()
-    
-    current = data.get("current", {})
-    temp = current.get("temperature_2m")
-    windspeed = current.get("wind_speed_10m")
-    winddirection = current.get("wind_direction_10m")
-    weather_code = current.get("weather_code", 0)
-    humidity = current.get("relative_humidity_2m")
-    feels_like = current.get("apparent_temperature")
-    
-    hava_bilgi = hava_kodu_aciklama(weather_code)
-    
-    return {
-        "konum": lokasyon,
-        "koordinat": {"lat": latitude, "lon": longitude},
-        "sicaklik": temp,
-        "hissedilen": feels_like,
-        "nem": humidity,
-        "ruzgar_hizi": windspeed,
-        "ruzgar_yonu": winddirection,
-        "ruzgar_yonu_text": ruzgar_yonu_text(winddirection),
-        "durum": hava_bilgi["durum"],
-        "emoji": hava_bilgi["emoji"],
-        "yagis_var_mi": hava_bilgi["yagis"],
-        "ham_kod": weather_code,
-        # Eski API uyumluluğu için
-        "location": lokasyon,
-        "current_temp": temp,
-        "is_it_raining": hava_bilgi["yagis"],
-        "condition_code": weather_code
-    }
+    return anlik_hava(ilce, lat, lon)
 
 
 @router.get("/hourly-forecast")
@@ -167,113 +24,7 @@ def get_hourly_forecast(
     saat: int = Query(24, description="Kaç saatlik tahmin? (max 48)")
 ):
     """Saatlik hava tahmini getirir - SULAMA KARARI İÇİN KRİTİK!"""
-    
-    # Koordinatları belirle
-    if ilce:
-        ilce_lower = ilce.lower().replace("ı", "i").replace("ş", "s").replace("ç", "c").replace("ğ","g").replace("ü","u").replace("ö","o")
-        koord = ILCE_KOORDINATLARI.get(ilce_lower)
-        if not koord:
-            return {"hata": f"'{ilce}' ilçesi bulunamadı."}
-        latitude, longitude = koord["lat"], koord["lon"]
-        lokasyon = f"{ilce.title()}, {koord['il']}"
-    elif lat and lon:
-        latitude, longitude = lat, lon
-        lokasyon = f"Koordinat ({lat}, {lon})"
-    else:
-        latitude, longitude = 39.93, 32.85
-        lokasyon = "Ankara (Varsayılan)"
-    
-    # Open-Meteo'dan saatlik veri çek (6 gün = 5 günlük tahmin için yeterli)
-    url = (
-        f"https://api.open-meteo.com/v1/forecast?"
-        f"latitude={latitude}&longitude={longitude}"
-        f"&hourly=temperature_2m,relative_humidity_2m,precipitation_probability,precipitation,weathercode,wind_speed_10m,wind_direction_10m"
-        f"&forecast_days=6&timezone=Europe/Istanbul"
-    )
-    
-    response = requests.get(url)
-    data = response.json()
-    
-    hourly = data.get("hourly", {})
-    times = hourly.get("time", [])
-    temps = hourly.get("temperature_2m", [])
-    humidities = hourly.get("relative_humidity_2m", [])
-    rain_probs = hourly.get("precipitation_probability", [])
-    rain_amounts = hourly.get("precipitation", [])
-    codes = hourly.get("weathercode", [])
-    wind_speeds = hourly.get("wind_speed_10m", [])
-    wind_dirs = hourly.get("wind_direction_10m", [])
-    
-    # Şu anki saatten itibaren al
-    now = datetime.now()
-    
-    saatlik_tahmin = []
-    yagis_saatleri = []  # Yağış beklenen saatler
-    sayac = 0
-    
-    for i in range(len(times)):
-        if sayac >= saat:
-            break
-            
-        try:
-            # Open-Meteo "2026-02-05T00:00" formatında veriyor
-            forecast_time = datetime.strptime(times[i], "%Y-%m-%dT%H:%M")
-        except:
-            continue
-        
-        # Sadece gelecekteki saatleri al
-        if forecast_time < now - timedelta(hours=1):
-            continue
-        
-        sayac += 1
-            
-        hava_bilgi = hava_kodu_aciklama(codes[i] if i < len(codes) else 0)
-        
-        saat_verisi = {
-            "saat": forecast_time.strftime("%H:00"),
-            "tarih": forecast_time.strftime("%d/%m"),
-            "tam_zaman": forecast_time.isoformat(),
-            "sicaklik": temps[i] if i < len(temps) else None,
-            "nem": humidities[i] if i < len(humidities) else None,
-            "ruzgar_hizi": wind_speeds[i] if i < len(wind_speeds) else None,
-            "ruzgar_yonu": wind_dirs[i] if i < len(wind_dirs) else None,
-            "yagis_olasiligi": rain_probs[i] if i < len(rain_probs) else 0,
-            "beklenen_yagis_mm": rain_amounts[i] if i < len(rain_amounts) else 0,
-            "durum": hava_bilgi["durum"],
-            "emoji": hava_bilgi["emoji"],
-            "yagis_var_mi": hava_bilgi["yagis"]
-        }
-        saatlik_tahmin.append(saat_verisi)
-        
-        # Yağış varsa kaydet
-        if hava_bilgi["yagis"] or (rain_probs[i] if i < len(rain_probs) else 0) > 50:
-            yagis_saatleri.append({
-                "saat": forecast_time.strftime("%H:00"),
-                "kac_saat_sonra": int((forecast_time - now).total_seconds() / 3600),
-                "olasilik": rain_probs[i] if i < len(rain_probs) else 0
-            })
-    
-    # İlk yağış ne zaman?
-    ilk_yagis = yagis_saatleri[0] if yagis_saatleri else None
-    
-    return {
-        "konum": lokasyon,
-        "koordinat": {"lat": latitude, "lon": longitude},
-        "tahmin_saati": now.strftime("%H:%M"),
-        "toplam_saat": len(saatlik_tahmin),
-        "saatlik_tahmin": saatlik_tahmin,
-        "yagis_beklenen_saatler": yagis_saatleri,
-        "ilk_yagis": ilk_yagis,
-        "onumuzdeki_6_saat_yagis": any(
-            s["kac_saat_sonra"] <= 6 for s in yagis_saatleri
-        ),
-        "onumuzdeki_3_saat_yagis": any(
-            s["kac_saat_sonra"] <= 3 for s in yagis_saatleri
-        ),
-        "onumuzdeki_1_saat_yagis": any(
-            s["kac_saat_sonra"] <= 1 for s in yagis_saatleri
-        )
-    }
+    return saatlik_tahmin_olustur(ilce=ilce, lat=lat, lon=lon, saat=saat)
 
 
 @router.get("/ilceler")
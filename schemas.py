@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 # --- ORTAK TABAN MODELLER ---
@@ -118,9 +118,44 @@ class IrrigationLogBase(BaseModel):
 class IrrigationLogCreate(IrrigationLogBase):
     field_id: int
 
+class IrrigationEventCreate(BaseModel):
+    field_id: int
+    duration_minutes: float  # Pompanın çalıştığı süre
+    start_time: Optional[datetime] = None  # Boşsa kayıt zamanı
+
 class IrrigationLog(IrrigationLogBase):
     id: int
     start_time: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# --- BİLDİRİM ŞEMALARI ---
+class Notification(BaseModel):
+    id: int
+    message: str
+    created_at: datetime
+    is_read: bool
+
+    class Config:
+        from_attributes = True
+
+class NotificationPage(BaseModel):
+    bildirimler: List[Notification]
+    sonraki_imlec: Optional[str] = None  # Son sayfada None
+    okunmamis: int
+
+class NotificationMarkRead(BaseModel):
+    ids: Optional[List[int]] = None  # Boşsa tüm okunmamışlar
+
+# 6. SİMÜLASYON ŞEMALARI
+class NemProjeksiyonIstegi(BaseModel):
+    saat: int = 48  # Projeksiyon ufku (24-72 saat)
+    pompa_plani: Dict[int, List[int]] = {}  # tarla_id -> pompanın çalışacağı saat ofsetleri (0 = bu saat)
+    seri: bool = False  # Saatlik nem serisini de döndür
+
+class PompaPlaniIstegi(BaseModel):
+    saat: int = 24  # Planlama ufku
+    toplam_kapasite: Optional[float] = None  # Ortak kaynağın debisi (pump_flow_rate birimiyle), boşsa PUMP_SHARED_CAPACITY
+    tarife: Optional[List[float]] = None  # Günün 24 saati için fiyat çarpanı (0 = gece yarısı)
+    guvenlik_payi: float = 2.0  # Kritik nemin üstünde tutulacak pay (%)
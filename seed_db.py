@@ -17,23 +17,24 @@ Senaryolar:
   10 Cihanbeyli Buğday  — SÜRPRİZ YAĞMUR              (microklima)
   11 Doğubayazıt Buğday — KRİTİK NEM                  (Ağrı sert kış)
   12 Beyşehir Çilek     — İDEAL                        (göl kenarı)
+
+Kullanım: python seed_db.py
+Üreticiler dict döndürür; kayıtlar core INSERT (executemany, parça parça) ile
+tek transaction'da yazılır. Tekrar çalıştırmak var olan kayıtları çoğaltmaz.
 """
 
 import hashlib
 import random
 import datetime
-from database import SessionLocal, engine
+from sqlalchemy import func
+from database import SessionLocal, engine, bulk_insert, bulk_upsert
 import models
-
-# ── Deterministik seed ─────────────────────────────────────────────────
-random.seed(42)
-
-models.Base.metadata.create_all(bind=engine)
-db = SessionLocal()
+from services import irrigation_stats, notifications
 
 NOW = datetime.datetime(2026, 2, 6, 14, 0, 0)
 DAYS = 60
 HOURS_PER_DAY = [6, 10, 14, 18]
+SEED_CHUNK = 5000  # core executemany parça boyutu
 
 # ╔══════════════════════════════════════════════════════════════════════╗
 # ║  YARDIMCI FONKSİYONLAR                                            ║
@@ -43,17 +44,19 @@ def h(pw):
     return hashlib.sha256(pw.encode()).hexdigest()
 
 
+# Bölge -> ay -> ortalama sıcaklık (°C)
+IKLIM_AYLIK = {
+    "konya": {1: -2, 2: 0, 3: 5, 4: 11, 5: 16, 6: 21, 7: 25, 8: 25, 9: 19, 10: 13, 11: 6, 12: 1},
+    "antalya": {1: 10, 2: 11, 3: 13, 4: 17, 5: 21, 6: 26, 7: 29, 8: 29, 9: 26, 10: 21, 11: 15, 12: 11},
+    "agri": {1: -12, 2: -10, 3: -3, 4: 5, 5: 11, 6: 16, 7: 20, 8: 20, 9: 14, 10: 7, 11: 0, 12: -8},
+}
+VARSAYILAN_IKLIM = {m: 15 for m in range(1, 13)}
+
+
 def iklim_sicaklik(bolge, ts):
     ay = ts.month
     saat = ts.hour
-    if bolge == "konya":
-        aylik = {1: -2, 2: 0, 3: 5, 4: 11, 5: 16, 6: 21, 7: 25, 8: 25, 9: 19, 10: 13, 11: 6, 12: 1}
-    elif bolge == "antalya":
-        aylik = {1: 10, 2: 11, 3: 13, 4: 17, 5: 21, 6: 26, 7: 29, 8: 29, 9: 26, 10: 21, 11: 15, 12: 11}
-    elif bolge == "agri":
-        aylik = {1: -12, 2: -10, 3: -3, 4: 5, 5: 11, 6: 16, 7: 20, 8: 20, 9: 14, 10: 7, 11: 0, 12: -8}
-    else:
-        aylik = {m: 15 for m in range(1, 13)}
+    aylik = IKLIM_AYLIK.get(bolge, VARSAYILAN_IKLIM)
 
     taban = aylik[ay]
     if saat <= 6:
@@ -72,6 +75,12 @@ def clamp(val, lo, hi):
     return max(lo, min(hi, val))
 
 
+def kayit_sayilari(db, model, *kosullar):
+    """field_id -> kayıt sayısı (tarla başına COUNT yerine tek GROUP BY)"""
+    sorgu = db.query(model.field_id, func.count(model.id)).filter(*kosullar).group_by(model.field_id)
+    return dict(sorgu.all())
+
+
 def ts_range(days, hours=None):
     if hours is None:
         hours = HOURS_PER_DAY
@@ -84,518 +93,391 @@ def ts_range(days, hours=None):
     return timestamps
 
 
+# ╔══════════════════════════════════════════════════════════════════════╗
+# ║  SENARYO PARAMETRELERİ (generate_synthetic_data.py de kullanır)    ║
+# ╚══════════════════════════════════════════════════════════════════════╝
+# Aralıklar random.uniform / rng.uniform sınırlarıdır; *_orani olasılıktır.
+#   nem: ham nem aralığı, oglen: saat >= 14 ölçümlerde düşüş, sinir: clamp
+#   yagis_orani / yagis_artisi: ölçüm anında yağma olasılığı ve nem artışı
+#   olasilik / miktar: hava tahmini; miktar_yuksek / miktar_dusuk olasılık
+#   MIKTAR_OLASILIK_ESIGI üstünde / altında kullanılan yağış miktarı aralığı
+#   trend_gun: son kaç gün trend (eski / trend dönemleri ayrı parametrelenir)
+#   son_olcum: deterministik son ölçüm (kaç dk önce, yağıyor mu, olasılık, miktar)
+
+MIKTAR_OLASILIK_ESIGI = 40
+
+SENARYO_PARAMETRELERI = {
+    "kritik": {
+        "trend_gun": 10,
+        "eski": {"nem": (30, 55), "oglen": (3, 10), "yagis_orani": 0.15, "yagis_artisi": (10, 20),
+                 "olasilik": (10, 70)},
+        "trend": {"bas": 45, "oglen": (1, 4), "gurultu": (-2, 2), "olasilik": (0, 12)},
+        "sinir": (5, 80), "miktar_yuksek": (0, 10), "miktar_dusuk": (0, 1.5),
+        "son_olcum": (10, False, 5.0, 0.0),
+    },
+    "ml_guvenme": {
+        "nem": (20, 50), "oglen": (5, 12), "olasilik": (50, 85), "miktar": (5, 18),
+        "yagis_orani": 0.05, "yagis_artisi": (8, 15), "sinir": (8, 75),
+        "son_olcum": (8, False, 72.0, 12.0),
+    },
+    "ml_guven": {
+        "tahmin_orani": 0.45,
+        "tahminli": {"olasilik": (50, 85), "miktar": (5, 20), "yagis_orani": 0.85},
+        "tahminsiz": {"olasilik": (5, 30), "miktar": (0, 2), "yagis_orani": 0.10},
+        "nem": (22, 55), "oglen": (3, 10), "yagis_artisi": (10, 25), "sinir": (10, 80),
+        "son_olcum": (5, False, 68.0, 10.0),
+    },
+    "ideal": {
+        # nem: min-max ortası ± yarım bandın bant_orani kadarı; sinir: min+pay .. max-pay
+        "bant_orani": 0.6, "oglen": (2, 5), "yagis_orani": 0.20, "yagis_artisi": (3, 8), "sinir_payi": 2,
+        "olasilik": (5, 55), "miktar_yuksek": (0, 8), "miktar_dusuk": (0, 2),
+        "son_olcum": (3, False, 25.0, 1.0),
+    },
+    "dusuk_nem": {
+        "nem": (25, 55), "oglen": (5, 12), "yagis_orani": 0.18, "yagis_artisi": (8, 18), "sinir": (10, 75),
+        "olasilik": (5, 65), "miktar_yuksek": (0, 12), "miktar_dusuk": (0, 2),
+        "son_olcum": (7, False, 35.0, 3.0),
+    },
+    "asiri_islak": {
+        "trend_gun": 7,
+        "eski": {"nem": (35, 60), "oglen": (2, 6), "yagis_orani": 0.25, "yagis_artisi": (5, 12),
+                 "olasilik": (15, 65)},
+        "trend": {"bas": 50, "yagis_orani": 0.75, "yagis_artisi": (3, 8), "olasilik": (65, 95)},
+        "sinir": (15, 90), "miktar_yuksek": (5, 25), "miktar_dusuk": (0, 3),
+        "son_olcum": (12, True, 88.0, 20.0),
+    },
+    "kritik_savunmaci": {
+        "trend_gun": 10,
+        "eski": {"nem": (22, 50), "oglen": (4, 10)},
+        "trend": {"bas": 40, "gurultu": (-3, 3)},
+        "olasilik": (50, 85), "miktar": (5, 15), "yagis_orani": 0.06, "yagis_artisi": (8, 15),
+        "sinir": (5, 70),
+        "son_olcum": (6, False, 75.0, 10.0),
+    },
+    "surpriz_yagmur": {
+        "nem": (22, 52), "oglen": (3, 8), "olasilik": (5, 28), "miktar": (0, 2.5),
+        "yagis_orani": 0.38, "yagis_artisi": (8, 20), "sinir": (10, 80),
+        "son_olcum": (15, False, 18.0, 1.0),
+    },
+    "maliyet": {
+        # eski: ilk dönem düzensiz, yeni (son donem_gun gün): ML ile stabil
+        "donem_gun": 30,
+        "eski": {"nem": (18, 55), "oglen": (5, 15), "yagis_orani": 0.20, "olasilik": (10, 70)},
+        "yeni": {"nem": (28, 55), "oglen": (3, 8), "tahmin_orani": 0.40},
+        "tahminli": {"olasilik": (50, 80), "yagis_orani": 0.80},
+        "tahminsiz": {"olasilik": (5, 25), "yagis_orani": 0.08},
+        "yagis_artisi": (8, 18), "sinir": (8, 82), "miktar_yuksek": (3, 15), "miktar_dusuk": (0, 2),
+        "son_olcum": (4, False, 55.0, 8.0),
+    },
+}
+
+
 # ╔══════════════════════════════════════════════════════════════════════╗
 # ║  SENARYO VERİ ÜRETİCİLERİ                                         ║
 # ╚══════════════════════════════════════════════════════════════════════╝
 
+def _yagis_miktari(rain_prob, p):
+    aralik = p["miktar_yuksek"] if rain_prob > MIKTAR_OLASILIK_ESIGI else p["miktar_dusuk"]
+    return round(random.uniform(*aralik), 1)
+
+
+def _olcum_ekle(sensor_logs, weather_logs, field_id, ts, moisture, temp, is_rain, rain_prob, rain_amount):
+    sensor_logs.append(dict(
+        field_id=field_id, timestamp=ts,
+        moisture=moisture, temperature=temp, is_raining=is_rain,
+    ))
+    weather_logs.append(dict(
+        field_id=field_id, forecast_date=ts,
+        rain_probability=rain_prob, expected_rain_amount=rain_amount,
+    ))
+
+
+def _son_olcum_ekle(sensor_logs, weather_logs, field_id, son_nem, son_temp, p):
+    """Deterministik son ölçüm (senaryonun son_olcum parametresi)"""
+    dk, is_rain, rain_prob, rain_amount = p["son_olcum"]
+    ts = NOW - datetime.timedelta(minutes=dk)
+    _olcum_ekle(sensor_logs, weather_logs, field_id, ts, son_nem, son_temp, is_rain, rain_prob, rain_amount)
+    return sensor_logs, weather_logs
+
+
 def generate_kritik_data(field_id, bolge, son_nem, son_temp, days=DAYS):
     """KRİTİK NEM — kuraklık trendi. Son 10 gün linear düşüş."""
-    timestamps = ts_range(days)
+    p = SENARYO_PARAMETRELERI["kritik"]
+    eski, trend = p["eski"], p["trend"]
     sensor_logs = []
     weather_logs = []
-    for ts in timestamps:
+    for ts in ts_range(days):
         day_offset = (NOW - ts).days
-        if day_offset > 10:
-            base_m = random.uniform(30, 55)
+        if day_offset > p["trend_gun"]:
+            base_m = random.uniform(*eski["nem"])
             if ts.hour >= 14:
-                base_m -= random.uniform(3, 10)
-            is_rain = random.random() < 0.15
+                base_m -= random.uniform(*eski["oglen"])
+            is_rain = random.random() < eski["yagis_orani"]
             if is_rain:
-                base_m += random.uniform(10, 20)
-            rain_prob = round(random.uniform(10, 70), 1)
+                base_m += random.uniform(*eski["yagis_artisi"])
+            rain_prob = round(random.uniform(*eski["olasilik"]), 1)
         else:
-            progress = (10 - day_offset) / 10.0
-            base_m = 45 - progress * (45 - son_nem)
+            progress = (p["trend_gun"] - day_offset) / p["trend_gun"]
+            base_m = trend["bas"] - progress * (trend["bas"] - son_nem)
             if ts.hour >= 14:
-                base_m -= random.uniform(1, 4)
-            base_m += random.uniform(-2, 2)
+                base_m -= random.uniform(*trend["oglen"])
+            base_m += random.uniform(*trend["gurultu"])
             is_rain = False
-            rain_prob = round(random.uniform(0, 12), 1)
-        moisture = round(clamp(base_m, 5, 80), 1)
+            rain_prob = round(random.uniform(*trend["olasilik"]), 1)
+        moisture = round(clamp(base_m, *p["sinir"]), 1)
         temp = iklim_sicaklik(bolge, ts) if day_offset > 0 else son_temp
-        rain_amount = round(random.uniform(0, 10), 1) if rain_prob > 40 else round(random.uniform(0, 1.5), 1)
-        sensor_logs.append(models.SensorLog(
-            field_id=field_id, timestamp=ts,
-            moisture=moisture, temperature=temp, is_raining=is_rain,
-        ))
-        weather_logs.append(models.WeatherForecast(
-            field_id=field_id, forecast_date=ts,
-            rain_probability=rain_prob, expected_rain_amount=rain_amount,
-        ))
-    # Deterministik son ölçüm
-    sensor_logs.append(models.SensorLog(
-        field_id=field_id, timestamp=NOW - datetime.timedelta(minutes=10),
-        moisture=son_nem, temperature=son_temp, is_raining=False,
-    ))
-    weather_logs.append(models.WeatherForecast(
-        field_id=field_id, forecast_date=NOW - datetime.timedelta(minutes=10),
-        rain_probability=5.0, expected_rain_amount=0.0,
-    ))
-    return sensor_logs, weather_logs
+        rain_amount = _yagis_miktari(rain_prob, p)
+        _olcum_ekle(sensor_logs, weather_logs, field_id, ts, moisture, temp, is_rain, rain_prob, rain_amount)
+    return _son_olcum_ekle(sensor_logs, weather_logs, field_id, son_nem, son_temp, p)
 
 
 def generate_ml_guvenme_data(field_id, bolge, son_nem, son_temp, days=DAYS):
     """ML GÜVENME — tahmin hep yağmur diyor ama hiç yağmıyor."""
-    timestamps = ts_range(days)
+    p = SENARYO_PARAMETRELERI["ml_guvenme"]
     sensor_logs = []
     weather_logs = []
-    for ts in timestamps:
-        base_m = random.uniform(20, 50)
+    for ts in ts_range(days):
+        base_m = random.uniform(*p["nem"])
         if ts.hour >= 14:
-            base_m -= random.uniform(5, 12)
-        rain_prob = round(random.uniform(50, 85), 1)
-        rain_amount = round(random.uniform(5, 18), 1)
-        is_rain = random.random() < 0.05
+            base_m -= random.uniform(*p["oglen"])
+        rain_prob = round(random.uniform(*p["olasilik"]), 1)
+        rain_amount = round(random.uniform(*p["miktar"]), 1)
+        is_rain = random.random() < p["yagis_orani"]
         if is_rain:
-            base_m += random.uniform(8, 15)
-        moisture = round(clamp(base_m, 8, 75), 1)
+            base_m += random.uniform(*p["yagis_artisi"])
+        moisture = round(clamp(base_m, *p["sinir"]), 1)
         temp = iklim_sicaklik(bolge, ts)
-        sensor_logs.append(models.SensorLog(
-            field_id=field_id, timestamp=ts,
-            moisture=moisture, temperature=temp, is_raining=is_rain,
-        ))
-        weather_logs.append(models.WeatherForecast(
-            field_id=field_id, forecast_date=ts,
-            rain_probability=rain_prob, expected_rain_amount=rain_amount,
-        ))
-    sensor_logs.append(models.SensorLog(
-        field_id=field_id, timestamp=NOW - datetime.timedelta(minutes=8),
-        moisture=son_nem, temperature=son_temp, is_raining=False,
-    ))
-    weather_logs.append(models.WeatherForecast(
-        field_id=field_id, forecast_date=NOW - datetime.timedelta(minutes=8),
-        rain_probability=72.0, expected_rain_amount=12.0,
-    ))
-    return sensor_logs, weather_logs
+        _olcum_ekle(sensor_logs, weather_logs, field_id, ts, moisture, temp, is_rain, rain_prob, rain_amount)
+    return _son_olcum_ekle(sensor_logs, weather_logs, field_id, son_nem, son_temp, p)
 
 
 def generate_ml_guven_data(field_id, bolge, son_nem, son_temp, days=DAYS):
     """ML GÜVEN — tahmin isabetli (%85)."""
-    timestamps = ts_range(days)
+    p = SENARYO_PARAMETRELERI["ml_guven"]
     sensor_logs = []
     weather_logs = []
-    for ts in timestamps:
-        tahmin_var = random.random() < 0.45
-        if tahmin_var:
-            rain_prob = round(random.uniform(50, 85), 1)
-            rain_amount = round(random.uniform(5, 20), 1)
-            is_rain = random.random() < 0.85
-        else:
-            rain_prob = round(random.uniform(5, 30), 1)
-            rain_amount = round(random.uniform(0, 2), 1)
-            is_rain = random.random() < 0.10
-        base_m = random.uniform(22, 55)
+    for ts in ts_range(days):
+        tahmin = p["tahminli"] if random.random() < p["tahmin_orani"] else p["tahminsiz"]
+        rain_prob = round(random.uniform(*tahmin["olasilik"]), 1)
+        rain_amount = round(random.uniform(*tahmin["miktar"]), 1)
+        is_rain = random.random() < tahmin["yagis_orani"]
+        base_m = random.uniform(*p["nem"])
         if ts.hour >= 14:
-            base_m -= random.uniform(3, 10)
+            base_m -= random.uniform(*p["oglen"])
         if is_rain:
-            base_m += random.uniform(10, 25)
-        moisture = round(clamp(base_m, 10, 80), 1)
+            base_m += random.uniform(*p["yagis_artisi"])
+        moisture = round(clamp(base_m, *p["sinir"]), 1)
         temp = iklim_sicaklik(bolge, ts)
-        sensor_logs.append(models.SensorLog(
-            field_id=field_id, timestamp=ts,
-            moisture=moisture, temperature=temp, is_raining=is_rain,
-        ))
-        weather_logs.append(models.WeatherForecast(
-            field_id=field_id, forecast_date=ts,
-            rain_probability=rain_prob, expected_rain_amount=rain_amount,
-        ))
-    sensor_logs.append(models.SensorLog(
-        field_id=field_id, timestamp=NOW - datetime.timedelta(minutes=5),
-        moisture=son_nem, temperature=son_temp, is_raining=False,
-    ))
-    weather_logs.append(models.WeatherForecast(
-        field_id=field_id, forecast_date=NOW - datetime.timedelta(minutes=5),
-        rain_probability=68.0, expected_rain_amount=10.0,
-    ))
-    return sensor_logs, weather_logs
+        _olcum_ekle(sensor_logs, weather_logs, field_id, ts, moisture, temp, is_rain, rain_prob, rain_amount)
+    return _son_olcum_ekle(sensor_logs, weather_logs, field_id, son_nem, son_temp, p)
 
 
 def generate_ideal_data(field_id, bolge, son_nem, son_temp, min_m, max_m, days=DAYS):
     """İDEAL — nem her zaman min-max aralığında."""
-    timestamps = ts_range(days)
+    p = SENARYO_PARAMETRELERI["ideal"]
     sensor_logs = []
     weather_logs = []
     orta = (min_m + max_m) / 2
-    yarim_bant = (max_m - min_m) / 2 * 0.6
-    for ts in timestamps:
+    yarim_bant = (max_m - min_m) / 2 * p["bant_orani"]
+    for ts in ts_range(days):
         base_m = orta + random.uniform(-yarim_bant, yarim_bant)
         if ts.hour >= 14:
-            base_m -= random.uniform(2, 5)
-        is_rain = random.random() < 0.20
+            base_m -= random.uniform(*p["oglen"])
+        is_rain = random.random() < p["yagis_orani"]
         if is_rain:
-            base_m += random.uniform(3, 8)
-        moisture = round(clamp(base_m, min_m + 2, max_m - 2), 1)
+            base_m += random.uniform(*p["yagis_artisi"])
+        moisture = round(clamp(base_m, min_m + p["sinir_payi"], max_m - p["sinir_payi"]), 1)
         temp = iklim_sicaklik(bolge, ts)
-        rain_prob = round(random.uniform(5, 55), 1)
-        rain_amount = round(random.uniform(0, 8), 1) if rain_prob > 40 else round(random.uniform(0, 2), 1)
-        sensor_logs.append(models.SensorLog(
-            field_id=field_id, timestamp=ts,
-            moisture=moisture, temperature=temp, is_raining=is_rain,
-        ))
-        weather_logs.append(models.WeatherForecast(
-            field_id=field_id, forecast_date=ts,
-            rain_probability=rain_prob, expected_rain_amount=rain_amount,
-        ))
-    sensor_logs.append(models.SensorLog(
-        field_id=field_id, timestamp=NOW - datetime.timedelta(minutes=3),
-        moisture=son_nem, temperature=son_temp, is_raining=False,
-    ))
-    weather_logs.append(models.WeatherForecast(
-        field_id=field_id, forecast_date=NOW - datetime.timedelta(minutes=3),
-        rain_probability=25.0, expected_rain_amount=1.0,
-    ))
-    return sensor_logs, weather_logs
+        rain_prob = round(random.uniform(*p["olasilik"]), 1)
+        rain_amount = _yagis_miktari(rain_prob, p)
+        _olcum_ekle(sensor_logs, weather_logs, field_id, ts, moisture, temp, is_rain, rain_prob, rain_amount)
+    return _son_olcum_ekle(sensor_logs, weather_logs, field_id, son_nem, son_temp, p)
 
 
 def generate_dusuk_nem_data(field_id, bolge, son_nem, son_temp, days=DAYS):
     """DÜŞÜK NEM — son ölçüm min altında, kritik üstünde. Adaptif."""
-    timestamps = ts_range(days)
+    p = SENARYO_PARAMETRELERI["dusuk_nem"]
     sensor_logs = []
     weather_logs = []
-    for ts in timestamps:
-        base_m = random.uniform(25, 55)
+    for ts in ts_range(days):
+        base_m = random.uniform(*p["nem"])
         if ts.hour >= 14:
-            base_m -= random.uniform(5, 12)
-        is_rain = random.random() < 0.18
+            base_m -= random.uniform(*p["oglen"])
+        is_rain = random.random() < p["yagis_orani"]
         if is_rain:
-            base_m += random.uniform(8, 18)
-        moisture = round(clamp(base_m, 10, 75), 1)
+            base_m += random.uniform(*p["yagis_artisi"])
+        moisture = round(clamp(base_m, *p["sinir"]), 1)
         temp = iklim_sicaklik(bolge, ts)
-        rain_prob = round(random.uniform(5, 65), 1)
-        rain_amount = round(random.uniform(0, 12), 1) if rain_prob > 40 else round(random.uniform(0, 2), 1)
-        sensor_logs.append(models.SensorLog(
-            field_id=field_id, timestamp=ts,
-            moisture=moisture, temperature=temp, is_raining=is_rain,
-        ))
-        weather_logs.append(models.WeatherForecast(
-            field_id=field_id, forecast_date=ts,
-            rain_probability=rain_prob, expected_rain_amount=rain_amount,
-        ))
-    sensor_logs.append(models.SensorLog(
-        field_id=field_id, timestamp=NOW - datetime.timedelta(minutes=7),
-        moisture=son_nem, temperature=son_temp, is_raining=False,
-    ))
-    weather_logs.append(models.WeatherForecast(
-        field_id=field_id, forecast_date=NOW - datetime.timedelta(minutes=7),
-        rain_probability=35.0, expected_rain_amount=3.0,
-    ))
-    return sensor_logs, weather_logs
+        rain_prob = round(random.uniform(*p["olasilik"]), 1)
+        rain_amount = _yagis_miktari(rain_prob, p)
+        _olcum_ekle(sensor_logs, weather_logs, field_id, ts, moisture, temp, is_rain, rain_prob, rain_amount)
+    return _son_olcum_ekle(sensor_logs, weather_logs, field_id, son_nem, son_temp, p)
 
 
 def generate_asiri_islak_data(field_id, bolge, son_nem, son_temp, max_m, days=DAYS):
     """AŞIRI ISLAK — Antalya kış yağışları. Son 7 gün yoğun yağış."""
-    timestamps = ts_range(days)
+    p = SENARYO_PARAMETRELERI["asiri_islak"]
+    eski, trend = p["eski"], p["trend"]
     sensor_logs = []
     weather_logs = []
-    for ts in timestamps:
+    for ts in ts_range(days):
         day_offset = (NOW - ts).days
-        if day_offset > 7:
-            base_m = random.uniform(35, 60)
+        if day_offset > p["trend_gun"]:
+            base_m = random.uniform(*eski["nem"])
             if ts.hour >= 14:
-                base_m -= random.uniform(2, 6)
-            is_rain = random.random() < 0.25
+                base_m -= random.uniform(*eski["oglen"])
+            is_rain = random.random() < eski["yagis_orani"]
             if is_rain:
-                base_m += random.uniform(5, 12)
-            rain_prob = round(random.uniform(15, 65), 1)
+                base_m += random.uniform(*eski["yagis_artisi"])
+            rain_prob = round(random.uniform(*eski["olasilik"]), 1)
         else:
-            progress = (7 - day_offset) / 7.0
-            base_m = 50 + progress * (son_nem - 50)
-            is_rain = random.random() < 0.75
+            progress = (p["trend_gun"] - day_offset) / p["trend_gun"]
+            base_m = trend["bas"] + progress * (son_nem - trend["bas"])
+            is_rain = random.random() < trend["yagis_orani"]
             if is_rain:
-                base_m += random.uniform(3, 8)
-            rain_prob = round(random.uniform(65, 95), 1)
-        moisture = round(clamp(base_m, 15, 90), 1)
+                base_m += random.uniform(*trend["yagis_artisi"])
+            rain_prob = round(random.uniform(*trend["olasilik"]), 1)
+        moisture = round(clamp(base_m, *p["sinir"]), 1)
         temp = iklim_sicaklik(bolge, ts)
-        rain_amount = round(random.uniform(5, 25), 1) if rain_prob > 40 else round(random.uniform(0, 3), 1)
-        sensor_logs.append(models.SensorLog(
-            field_id=field_id, timestamp=ts,
-            moisture=moisture, temperature=temp, is_raining=is_rain,
-        ))
-        weather_logs.append(models.WeatherForecast(
-            field_id=field_id, forecast_date=ts,
-            rain_probability=rain_prob, expected_rain_amount=rain_amount,
-        ))
-    sensor_logs.append(models.SensorLog(
-        field_id=field_id, timestamp=NOW - datetime.timedelta(minutes=12),
-        moisture=son_nem, temperature=son_temp, is_raining=True,
-    ))
-    weather_logs.append(models.WeatherForecast(
-        field_id=field_id, forecast_date=NOW - datetime.timedelta(minutes=12),
-        rain_probability=88.0, expected_rain_amount=20.0,
-    ))
-    return sensor_logs, weather_logs
+        rain_amount = _yagis_miktari(rain_prob, p)
+        _olcum_ekle(sensor_logs, weather_logs, field_id, ts, moisture, temp, is_rain, rain_prob, rain_amount)
+    return _son_olcum_ekle(sensor_logs, weather_logs, field_id, son_nem, son_temp, p)
 
 
 def generate_kritik_savunmaci_data(field_id, bolge, son_nem, son_temp, days=DAYS):
     """KRİTİK_SAVUNMACI — kritik altı + ML tahmine güvenmiyor."""
-    timestamps = ts_range(days)
+    p = SENARYO_PARAMETRELERI["kritik_savunmaci"]
+    eski, trend = p["eski"], p["trend"]
     sensor_logs = []
     weather_logs = []
-    for ts in timestamps:
+    for ts in ts_range(days):
         day_offset = (NOW - ts).days
-        if day_offset > 10:
-            base_m = random.uniform(22, 50)
+        if day_offset > p["trend_gun"]:
+            base_m = random.uniform(*eski["nem"])
             if ts.hour >= 14:
-                base_m -= random.uniform(4, 10)
+                base_m -= random.uniform(*eski["oglen"])
         else:
-            progress = (10 - day_offset) / 10.0
-            base_m = 40 - progress * (40 - son_nem)
-            base_m += random.uniform(-3, 3)
-        rain_prob = round(random.uniform(50, 85), 1)
-        rain_amount = round(random.uniform(5, 15), 1)
-        is_rain = random.random() < 0.06
+            progress = (p["trend_gun"] - day_offset) / p["trend_gun"]
+            base_m = trend["bas"] - progress * (trend["bas"] - son_nem)
+            base_m += random.uniform(*trend["gurultu"])
+        rain_prob = round(random.uniform(*p["olasilik"]), 1)
+        rain_amount = round(random.uniform(*p["miktar"]), 1)
+        is_rain = random.random() < p["yagis_orani"]
         if is_rain:
-            base_m += random.uniform(8, 15)
-        moisture = round(clamp(base_m, 5, 70), 1)
+            base_m += random.uniform(*p["yagis_artisi"])
+        moisture = round(clamp(base_m, *p["sinir"]), 1)
         temp = iklim_sicaklik(bolge, ts)
-        sensor_logs.append(models.SensorLog(
-            field_id=field_id, timestamp=ts,
-            moisture=moisture, temperature=temp, is_raining=is_rain,
-        ))
-        weather_logs.append(models.WeatherForecast(
-            field_id=field_id, forecast_date=ts,
-            rain_probability=rain_prob, expected_rain_amount=rain_amount,
-        ))
-    sensor_logs.append(models.SensorLog(
-        field_id=field_id, timestamp=NOW - datetime.timedelta(minutes=6),
-        moisture=son_nem, temperature=son_temp, is_raining=False,
-    ))
-    weather_logs.append(models.WeatherForecast(
-        field_id=field_id, forecast_date=NOW - datetime.timedelta(minutes=6),
-        rain_probability=75.0, expected_rain_amount=10.0,
-    ))
-    return sensor_logs, weather_logs
+        _olcum_ekle(sensor_logs, weather_logs, field_id, ts, moisture, temp, is_rain, rain_prob, rain_amount)
+    return _son_olcum_ekle(sensor_logs, weather_logs, field_id, son_nem, son_temp, p)
 
 
 def generate_surpriz_yagmur_data(field_id, bolge, son_nem, son_temp, days=DAYS):
     """SÜRPRİZ YAĞMUR — tahmin düşük ama %38 sürpriz yağmur."""
-    timestamps = ts_range(days)
+    p = SENARYO_PARAMETRELERI["surpriz_yagmur"]
     sensor_logs = []
     weather_logs = []
-    for ts in timestamps:
-        base_m = random.uniform(22, 52)
+    for ts in ts_range(days):
+        base_m = random.uniform(*p["nem"])
         if ts.hour >= 14:
-            base_m -= random.uniform(3, 8)
-        rain_prob = round(random.uniform(5, 28), 1)
-        rain_amount = round(random.uniform(0, 2.5), 1)
-        is_rain = random.random() < 0.38
+            base_m -= random.uniform(*p["oglen"])
+        rain_prob = round(random.uniform(*p["olasilik"]), 1)
+        rain_amount = round(random.uniform(*p["miktar"]), 1)
+        is_rain = random.random() < p["yagis_orani"]
         if is_rain:
-            base_m += random.uniform(8, 20)
-        moisture = round(clamp(base_m, 10, 80), 1)
+            base_m += random.uniform(*p["yagis_artisi"])
+        moisture = round(clamp(base_m, *p["sinir"]), 1)
         temp = iklim_sicaklik(bolge, ts)
-        sensor_logs.append(models.SensorLog(
-            field_id=field_id, timestamp=ts,
-            moisture=moisture, temperature=temp, is_raining=is_rain,
-        ))
-        weather_logs.append(models.WeatherForecast(
-            field_id=field_id, forecast_date=ts,
-            rain_probability=rain_prob, expected_rain_amount=rain_amount,
-        ))
-    sensor_logs.append(models.SensorLog(
-        field_id=field_id, timestamp=NOW - datetime.timedelta(minutes=15),
-        moisture=son_nem, temperature=son_temp, is_raining=False,
-    ))
-    weather_logs.append(models.WeatherForecast(
-        field_id=field_id, forecast_date=NOW - datetime.timedelta(minutes=15),
-        rain_probability=18.0, expected_rain_amount=1.0,
-    ))
-    return sensor_logs, weather_logs
+        _olcum_ekle(sensor_logs, weather_logs, field_id, ts, moisture, temp, is_rain, rain_prob, rain_amount)
+    return _son_olcum_ekle(sensor_logs, weather_logs, field_id, son_nem, son_temp, p)
 
 
 def generate_maliyet_data(field_id, bolge, son_nem, son_temp, days=DAYS):
     """MALİYET TASARRUFU — ilk 30 gün düzensiz, son 30 gün ML stabil."""
-    timestamps = ts_range(days)
+    p = SENARYO_PARAMETRELERI["maliyet"]
+    eski, yeni = p["eski"], p["yeni"]
     sensor_logs = []
     weather_logs = []
-    for ts in timestamps:
+    for ts in ts_range(days):
         day_offset = (NOW - ts).days
-        if day_offset > 30:
-            base_m = random.uniform(18, 55)
+        if day_offset > p["donem_gun"]:
+            base_m = random.uniform(*eski["nem"])
             if ts.hour >= 14:
-                base_m -= random.uniform(5, 15)
-            is_rain = random.random() < 0.20
-            rain_prob = round(random.uniform(10, 70), 1)
+                base_m -= random.uniform(*eski["oglen"])
+            is_rain = random.random() < eski["yagis_orani"]
+            rain_prob = round(random.uniform(*eski["olasilik"]), 1)
         else:
-            base_m = random.uniform(28, 55)
+            base_m = random.uniform(*yeni["nem"])
             if ts.hour >= 14:
-                base_m -= random.uniform(3, 8)
-            tahmin_var = random.random() < 0.40
-            if tahmin_var:
-                rain_prob = round(random.uniform(50, 80), 1)
-                is_rain = random.random() < 0.80
-            else:
-                rain_prob = round(random.uniform(5, 25), 1)
-                is_rain = random.random() < 0.08
+                base_m -= random.uniform(*yeni["oglen"])
+            tahmin = p["tahminli"] if random.random() < yeni["tahmin_orani"] else p["tahminsiz"]
+            rain_prob = round(random.uniform(*tahmin["olasilik"]), 1)
+            is_rain = random.random() < tahmin["yagis_orani"]
         if is_rain:
-            base_m += random.uniform(8, 18)
-        moisture = round(clamp(base_m, 8, 82), 1)
+            base_m += random.uniform(*p["yagis_artisi"])
+        moisture = round(clamp(base_m, *p["sinir"]), 1)
         temp = iklim_sicaklik(bolge, ts)
-        rain_amount = round(random.uniform(3, 15), 1) if rain_prob > 40 else round(random.uniform(0, 2), 1)
-        sensor_logs.append(models.SensorLog(
-            field_id=field_id, timestamp=ts,
-            moisture=moisture, temperature=temp, is_raining=is_rain,
-        ))
-        weather_logs.append(models.WeatherForecast(
-            field_id=field_id, forecast_date=ts,
-            rain_probability=rain_prob, expected_rain_amount=rain_amount,
-        ))
-    sensor_logs.append(models.SensorLog(
-        field_id=field_id, timestamp=NOW - datetime.timedelta(minutes=4),
-        moisture=son_nem, temperature=son_temp, is_raining=False,
-    ))
-    weather_logs.append(models.WeatherForecast(
-        field_id=field_id, forecast_date=NOW - datetime.timedelta(minutes=4),
-        rain_probability=55.0, expected_rain_amount=8.0,
-    ))
-    return sensor_logs, weather_logs
-
-
-# ╔══════════════════════════════════════════════════════════════════════╗
-# ║  1. KULLANICILAR                                                    ║
-# ╚══════════════════════════════════════════════════════════════════════╝
-
-users_data = [
-    {"email": "ahmet@ciftci.com", "hashed_password": h("ahmet123"), "full_name": "Ahmet Yılmaz"},
-    {"email": "fatma@ciftci.com", "hashed_password": h("fatma123"), "full_name": "Fatma Demir"},
-    {"email": "mehmet@ciftci.com", "hashed_password": h("mehmet123"), "full_name": "Mehmet Kaya"},
-]
-
-created_users = []
-for u in users_data:
-    existing = db.query(models.User).filter(models.User.email == u["email"]).first()
-    if existing:
-        created_users.append(existing)
-    else:
-        user = models.User(**u)
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-        created_users.append(user)
+        rain_amount = _yagis_miktari(rain_prob, p)
+        _olcum_ekle(sensor_logs, weather_logs, field_id, ts, moisture, temp, is_rain, rain_prob, rain_amount)
+    return _son_olcum_ekle(sensor_logs, weather_logs, field_id, son_nem, son_temp, p)
 
-print(f"✅ {len(created_users)} kullanıcı hazır")
 
 # ╔══════════════════════════════════════════════════════════════════════╗
-# ║  2. TARLALAR (12 tarla — Konya / Antalya / Ağrı)                  ║
+# ║  TARLA ŞABLONLARI + SENARYO EŞLEMESİ (generate_synthetic_data.py de kullanır) ║
 # ╚══════════════════════════════════════════════════════════════════════╝
 
-plant_types = db.query(models.PlantType).all()
-if not plant_types:
-    print("❌ Bitki türleri bulunamadı! Önce /plant-types/seed çağırın.")
-    exit()
-
-pt_map = {p.name: p.id for p in plant_types}
-
-fields_data = [
+TARLA_SABLONLARI = [
     # ── Ahmet'in tarlaları (7 tarla: Konya + Antalya + Ağrı) ──
     {"name": "Çumra Buğday Tarlası", "location": "Çumra, Konya", "ilce": "cumra",
      "latitude": 37.5722, "longitude": 32.7744, "pump_flow_rate": 120.0, "water_unit_price": 1.2,
-     "owner_id": created_users[0].id, "plant_type_id": pt_map.get("Buğday", 1)},
+     "owner": 0, "plant": "Buğday"},
 
     {"name": "Karapınar Ayçiçeği Tarlası", "location": "Karapınar, Konya", "ilce": "karapinar",
      "latitude": 37.7167, "longitude": 33.5500, "pump_flow_rate": 150.0, "water_unit_price": 1.0,
-     "owner_id": created_users[0].id, "plant_type_id": pt_map.get("Ayçiçeği", 1)},
+     "owner": 0, "plant": "Ayçiçeği"},
 
     {"name": "Selçuklu Domates Serası", "location": "Selçuklu, Konya", "ilce": "selcuklu",
      "latitude": 37.9400, "longitude": 32.4700, "pump_flow_rate": 80.0, "water_unit_price": 1.8,
-     "owner_id": created_users[0].id, "plant_type_id": pt_map.get("Domates", 1)},
+     "owner": 0, "plant": "Domates"},
 
     {"name": "Ereğli Mısır Tarlası", "location": "Ereğli, Konya", "ilce": "eregli",
      "latitude": 37.5167, "longitude": 34.0500, "pump_flow_rate": 130.0, "water_unit_price": 1.4,
-     "owner_id": created_users[0].id, "plant_type_id": pt_map.get("Mısır", 1)},
+     "owner": 0, "plant": "Mısır"},
 
     {"name": "Meram Kapya Biber Bahçesi", "location": "Meram, Konya", "ilce": "meram",
      "latitude": 37.8333, "longitude": 32.4333, "pump_flow_rate": 90.0, "water_unit_price": 1.6,
-     "owner_id": created_users[0].id, "plant_type_id": pt_map.get("Kapya Biber", 1)},
+     "owner": 0, "plant": "Kapya Biber"},
 
     {"name": "Serik Çilek Serası", "location": "Serik, Antalya", "ilce": "serik",
      "latitude": 36.9200, "longitude": 31.1000, "pump_flow_rate": 70.0, "water_unit_price": 2.2,
-     "owner_id": created_users[0].id, "plant_type_id": pt_map.get("Çilek", 1)},
+     "owner": 0, "plant": "Çilek"},
 
     {"name": "Patnos Patates Tarlası", "location": "Patnos, Ağrı", "ilce": "patnos",
      "latitude": 39.2333, "longitude": 43.6833, "pump_flow_rate": 95.0, "water_unit_price": 1.5,
-     "owner_id": created_users[0].id, "plant_type_id": pt_map.get("Patates", 1)},
+     "owner": 0, "plant": "Patates"},
 
     # ── Fatma'nın tarlaları (3 tarla) ──
     {"name": "Akşehir Soğan Tarlası", "location": "Akşehir, Konya", "ilce": "aksehir",
      "latitude": 38.3575, "longitude": 31.4158, "pump_flow_rate": 110.0, "water_unit_price": 1.3,
-     "owner_id": created_users[1].id, "plant_type_id": pt_map.get("Soğan", 1)},
+     "owner": 1, "plant": "Soğan"},
 
     {"name": "Kumluca Domates Serası", "location": "Kumluca, Antalya", "ilce": "kumluca",
      "latitude": 36.3667, "longitude": 30.2833, "pump_flow_rate": 85.0, "water_unit_price": 1.7,
-     "owner_id": created_users[1].id, "plant_type_id": pt_map.get("Domates", 1)},
+     "owner": 1, "plant": "Domates"},
 
     {"name": "Cihanbeyli Buğday Tarlası", "location": "Cihanbeyli, Konya", "ilce": "cihanbeyli",
      "latitude": 38.6558, "longitude": 32.9278, "pump_flow_rate": 125.0, "water_unit_price": 1.1,
-     "owner_id": created_users[1].id, "plant_type_id": pt_map.get("Buğday", 1)},
+     "owner": 1, "plant": "Buğday"},
 
     # ── Mehmet'in tarlaları (2 tarla) ──
     {"name": "Doğubayazıt Buğday Tarlası", "location": "Doğubayazıt, Ağrı", "ilce": "dogubayazit",
      "latitude": 39.7217, "longitude": 44.0867, "pump_flow_rate": 115.0, "water_unit_price": 1.3,
-     "owner_id": created_users[2].id, "plant_type_id": pt_map.get("Buğday", 1)},
+     "owner": 2, "plant": "Buğday"},
 
     {"name": "Beyşehir Çilek Bahçesi", "location": "Beyşehir, Konya", "ilce": "beysehir",
      "latitude": 37.6786, "longitude": 31.7250, "pump_flow_rate": 75.0, "water_unit_price": 1.9,
-     "owner_id": created_users[2].id, "plant_type_id": pt_map.get("Çilek", 1)},
+     "owner": 2, "plant": "Çilek"},
 ]
 
-created_fields = []
-for f in fields_data:
-    existing = db.query(models.Field).filter(models.Field.name == f["name"]).first()
-    if existing:
-        created_fields.append(existing)
-    else:
-        field = models.Field(**f)
-        db.add(field)
-        db.commit()
-        db.refresh(field)
-        created_fields.append(field)
-
-print(f"✅ {len(created_fields)} tarla hazır")
-
-# ╔══════════════════════════════════════════════════════════════════════╗
-# ║  3. SENSÖR CİHAZLARI (tarla başı 2: nem + sıcaklık)              ║
-# ╚══════════════════════════════════════════════════════════════════════╝
-
-ilce_labels = [
-    "Çumra", "Karapınar", "Selçuklu", "Ereğli", "Meram", "Serik",
-    "Patnos", "Akşehir", "Kumluca", "Cihanbeyli", "Doğubayazıt", "Beyşehir",
-]
-
-sensor_device_count = 0
-for idx, field in enumerate(created_fields):
-    existing = db.query(models.Sensor).filter(models.Sensor.field_id == field.id).count()
-    if existing > 0:
-        sensor_device_count += existing
-        continue
-    label = ilce_labels[idx] if idx < len(ilce_labels) else f"#{idx+1}"
-    base_num = idx * 2 + 1
-    db.add(models.Sensor(
-        sensor_code=f"SNS-{base_num:03d}",
-        name=f"Nem Sensörü — {label}",
-        type="moisture",
-        status=random.choice(["active"] * 4 + ["warning"]),
-        battery=random.randint(40, 100),
-        field_id=field.id,
-        installed_at=NOW - datetime.timedelta(days=random.randint(60, 365)),
-    ))
-    db.add(models.Sensor(
-        sensor_code=f"SNS-{base_num + 1:03d}",
-        name=f"Sıcaklık Sensörü — {label}",
-        type="temperature",
-        status=random.choice(["active"] * 3 + ["maintenance"]),
-        battery=random.randint(25, 100),
-        field_id=field.id,
-        installed_at=NOW - datetime.timedelta(days=random.randint(60, 365)),
-    ))
-    sensor_device_count += 2
-
-db.commit()
-print(f"✅ {sensor_device_count} sensör cihazı hazır")
-
-# ╔══════════════════════════════════════════════════════════════════════╗
-# ║  4. SENARYO BAZLI SENSÖR + HAVA TAHMİN VERİLERİ (60 gün)         ║
-# ╚══════════════════════════════════════════════════════════════════════╝
-
 SCENARIO_CONFIG = [
     # idx  generator                     kwargs
     (0,  generate_kritik_data,           {"bolge": "konya",   "son_nem": 8.0,  "son_temp": 2.0}),
@@ -612,232 +494,349 @@ SCENARIO_CONFIG = [
     (11, generate_ideal_data,            {"bolge": "konya",   "son_nem": 55.0, "son_temp": 2.0, "min_m": 40, "max_m": 70}),
 ]
 
-total_sensor = 0
-total_weather = 0
-
-for field_idx, gen_func, kwargs in SCENARIO_CONFIG:
-    field = created_fields[field_idx]
-    existing_sensor = db.query(models.SensorLog).filter(models.SensorLog.field_id == field.id).count()
-    if existing_sensor > 0:
-        total_sensor += existing_sensor
-        total_weather += db.query(models.WeatherForecast).filter(models.WeatherForecast.field_id == field.id).count()
-        continue
-    sensor_logs, weather_logs = gen_func(field_id=field.id, **kwargs)
-    for sl in sensor_logs:
-        db.add(sl)
-    for wl in weather_logs:
-        db.add(wl)
-    total_sensor += len(sensor_logs)
-    total_weather += len(weather_logs)
-
-db.commit()
-print(f"✅ {total_sensor} sensör kaydı hazır")
-print(f"✅ {total_weather} hava tahmini hazır")
-
-# ╔══════════════════════════════════════════════════════════════════════╗
-# ║  5. GELECEK HAVA TAHMİNLERİ (5 gün ileri)                         ║
-# ╚══════════════════════════════════════════════════════════════════════╝
-
-future_count = 0
-for field in created_fields:
-    future_exists = db.query(models.WeatherForecast).filter(
-        models.WeatherForecast.field_id == field.id,
-        models.WeatherForecast.forecast_date > NOW,
-    ).count()
-    if future_exists > 0:
-        future_count += future_exists
-        continue
-    for day_offset in range(1, 6):
-        forecast_date = (NOW + datetime.timedelta(days=day_offset)).replace(hour=12, minute=0, second=0)
-        rain_prob = round(random.uniform(5, 75), 1)
-        rain_amount = round(random.uniform(2, 18), 1) if rain_prob > 40 else round(random.uniform(0, 2), 1)
-        db.add(models.WeatherForecast(
-            field_id=field.id, forecast_date=forecast_date,
-            rain_probability=rain_prob, expected_rain_amount=rain_amount,
-        ))
-        future_count += 1
-
-db.commit()
-print(f"✅ {future_count} gelecek hava tahmini hazır")
-
-# ╔══════════════════════════════════════════════════════════════════════╗
-# ║  6. SULAMA LOGLARI (senaryo bazlı)                                 ║
-# ╚══════════════════════════════════════════════════════════════════════╝
-
-irrigation_count = 0
-
-def add_irrigation(fld, day_off, hour, dur_min):
-    start = (NOW - datetime.timedelta(days=day_off)).replace(hour=hour, minute=random.randint(0, 20))
-    water = round(fld.pump_flow_rate * (dur_min / 60), 1)
-    cost = round(water * fld.water_unit_price / 1000, 2)
-    db.add(models.IrrigationLog(
-        field_id=fld.id, start_time=start,
-        duration_minutes=round(dur_min, 1), water_amount_liters=water, cost_total=cost,
-    ))
-    return 1
-
-for idx, field in enumerate(created_fields):
-    existing = db.query(models.IrrigationLog).filter(models.IrrigationLog.field_id == field.id).count()
-    if existing > 0:
-        irrigation_count += existing
-        continue
-
-    if idx == 0:
-        # Çumra Buğday — KRİTİK: son 10 gün sulama yok, öncesi düzenli
-        for d in range(55, 10, -3):
-            irrigation_count += add_irrigation(field, d, random.choice([6, 7]), random.uniform(25, 50))
-
-    elif idx == 1:
-        # Karapınar Ayçiçeği — ML GÜVENME: düzenli sulama
-        for d in range(58, 1, -3):
-            irrigation_count += add_irrigation(field, d, random.choice([6, 17]), random.uniform(30, 55))
-
-    elif idx == 2:
-        # Selçuklu Domates — ML GÜVEN: yağmurlu günlerde atlanmış
-        for d in range(56, 1, -4):
-            irrigation_count += add_irrigation(field, d, 7, random.uniform(20, 45))
-
-    elif idx == 3:
-        # Ereğli Mısır — İDEAL: düzenli
-        for d in range(58, 1, -3):
-            irrigation_count += add_irrigation(field, d, random.choice([6, 7, 17]), random.uniform(25, 40))
-
-    elif idx == 4:
-        # Meram Biber — DÜŞÜK NEM: yetersiz
-        for d in range(55, 1, -5):
-            irrigation_count += add_irrigation(field, d, random.choice([6, 17]), random.uniform(15, 35))
-
-    elif idx == 5:
-        # Serik Çilek — AŞIRI ISLAK: son 7 gün yok
-        for d in range(55, 8, -3):
-            irrigation_count += add_irrigation(field, d, random.choice([6, 7]), random.uniform(15, 30))
-
-    elif idx == 6:
-        # Patnos Patates — KRİTİK_SAVUNMACI: don yüzünden tutarsız
-        for d in range(55, 2, -4):
-            irrigation_count += add_irrigation(field, d, random.choice([7, 17]), random.uniform(20, 45))
-
-    elif idx == 7:
-        # Akşehir Soğan — İDEAL: düzenli
-        for d in range(56, 1, -4):
-            irrigation_count += add_irrigation(field, d, random.choice([6, 17]), random.uniform(20, 35))
-
-    elif idx == 8:
-        # Kumluca Domates — MALİYET: ilk 30 gün her gün, son 30 gün haftada 3-4
-        for d in range(58, 28, -1):
-            irrigation_count += add_irrigation(field, d, 7, random.uniform(40, 60))
-        smart_days = sorted(random.sample(range(1, 28), 15), reverse=True)
-        for d in smart_days:
-            irrigation_count += add_irrigation(field, d, 7, random.uniform(20, 40))
-
-    elif idx == 9:
-        # Cihanbeyli Buğday — SÜRPRİZ YAĞMUR: düzenli
-        for d in range(55, 1, -4):
-            irrigation_count += add_irrigation(field, d, random.choice([6, 7]), random.uniform(25, 45))
-
-    elif idx == 10:
-        # Doğubayazıt Buğday — KRİTİK: son 10 gün yok
-        for d in range(55, 10, -4):
-            irrigation_count += add_irrigation(field, d, 7, random.uniform(25, 50))
-
-    elif idx == 11:
-        # Beyşehir Çilek — İDEAL: düzenli
-        for d in range(55, 1, -3):
-            irrigation_count += add_irrigation(field, d, random.choice([6, 7]), random.uniform(15, 30))
-
-db.commit()
-print(f"✅ {irrigation_count} sulama kaydı hazır")
-
-# ╔══════════════════════════════════════════════════════════════════════╗
-# ║  7. BİLDİRİMLER (senaryo-spesifik)                                ║
-# ╚══════════════════════════════════════════════════════════════════════╝
-
-notif_count = 0
 
-def add_notif(uid, msg, days_ago, hours_ago=0, is_read=False):
-    db.add(models.Notification(
-        user_id=uid, message=msg,
-        created_at=NOW - datetime.timedelta(days=days_ago, hours=hours_ago),
-        is_read=is_read,
-    ))
-    return 1
-
-for user in created_users:
-    existing = db.query(models.Notification).filter(models.Notification.user_id == user.id).count()
-    if existing > 0:
-        notif_count += existing
-        continue
-
-    if user.email == "ahmet@ciftci.com":
-        notif_count += add_notif(user.id,
-            "⚠️ Çumra Buğday tarlasında nem %8'e düştü! Konya'da kuraklık devam ediyor. Acil sulama başlatılıyor.", 0, 2)
-        notif_count += add_notif(user.id,
-            "🤖 Karapınar Ayçiçeği: ML modeli hava tahminlerine güvenmiyor (son 60 günde %5 isabet). Savunmacı sulama uygulanıyor.", 0, 5)
-        notif_count += add_notif(user.id,
-            "✅ Selçuklu Domates: Yağmur tahmini ML tarafından doğrulandı (%85 isabet). Sulama 3 saat erteleniyor — su tasarrufu!", 1, 3, True)
-        notif_count += add_notif(user.id,
-            "📊 Ereğli Mısır: Haftalık rapor — nem ideal aralıkta (%52), son 7 günde 2 sulama yapıldı.", 1, 8, True)
-        notif_count += add_notif(user.id,
-            "💧 Meram Biber: Nem %28'e düştü. Konya sıcakları etkili. Sulama başlatılıyor.", 0, 6)
-        notif_count += add_notif(user.id,
-            "🚫 Serik Çilek: Antalya'da yoğun yağış sonrası nem %75. Sulama durduruldu — kök çürümesi riski!", 0, 1)
-        notif_count += add_notif(user.id,
-            "🌡️ Patnos Patates: Ağrı'da -5°C! Don riski mevcut. Kritik nem seviyesi (%12). Minimum doz sulama.", 0, 3)
-        notif_count += add_notif(user.id,
-            "✅ Selçuklu Domates: Sulama 45 dk sürdü. 60L su kullanıldı. Maliyet: 0.11₺", 2, 10, True)
-        notif_count += add_notif(user.id,
-            "📊 Haftalık özet: 7 tarlanızdan 3'ü ideal, 2'si kritik, 1'i aşırı ıslak. Toplam su: 2450L", 3, 0, True)
-        notif_count += add_notif(user.id,
-            "🌧️ Karapınar bölgesinde yarın yağmur bekleniyor ama ML güvenmiyor. Sulama programı korunuyor.", 1, 14)
-        notif_count += add_notif(user.id,
-            "⏰ Çumra Buğday tarlası 48 saattir sulanmadı! Nem tehlikeli seviyeye yaklaşıyor.", 1, 0)
-        notif_count += add_notif(user.id,
-            "💰 Bu hafta ML sayesinde Selçuklu serasında %32 su tasarrufu sağlandı. Aylık tasarruf: ~85₺", 2, 6, True)
-
-    elif user.email == "fatma@ciftci.com":
-        notif_count += add_notif(user.id,
-            "✅ Akşehir Soğan: Nem ideal aralıkta (%40). Sulama programı düzenli devam ediyor.", 0, 4, True)
-        notif_count += add_notif(user.id,
-            "💰 Kumluca Domates: ML ile son 30 günde %48 su tasarrufu! Günlük maliyet 5.4₺ → 2.7₺", 0, 8)
-        notif_count += add_notif(user.id,
-            "🌧️ Cihanbeyli Buğday: ML sürpriz yağmur tespit etti! Tahmin vermese de beklenmedik yağışlar olabiliyor.", 0, 12)
-        notif_count += add_notif(user.id,
-            "📊 Kumluca Domates: Haftalık rapor — ML öncesi 5.1₺/gün → ML sonrası 2.6₺/gün.", 2, 5, True)
-        notif_count += add_notif(user.id,
-            "✅ Akşehir Soğan: Sulama tamamlandı. Süre: 28 dk, Su: 51.3L, Maliyet: 0.07₺", 1, 7, True)
-        notif_count += add_notif(user.id,
-            "🔔 Cihanbeyli Buğday: Yeni sensör verisi — Nem: %20, Sıcaklık: 0.5°C. Sulama gerekebilir.", 0, 2)
-        notif_count += add_notif(user.id,
-            "⚠️ Cihanbeyli bölgesinde sıcaklık düşüyor. Don riski olabilir!", 1, 18)
-        notif_count += add_notif(user.id,
-            "📊 Haftalık özet: 3 tarla — 1 ideal, 1 maliyet tasarrufu, 1 sürpriz yağmur deseni.", 3, 0, True)
-
-    elif user.email == "mehmet@ciftci.com":
-        notif_count += add_notif(user.id,
-            "⚠️ Doğubayazıt Buğday: Nem %9! Ağrı'da sert kış toprak nemini kritik seviyeye çekti.", 0, 1)
-        notif_count += add_notif(user.id,
-            "✅ Beyşehir Çilek: Nem ideal (%55). Göl kenarı mikrokliması bitkiye iyi geliyor.", 0, 5, True)
-        notif_count += add_notif(user.id,
-            "🌡️ Doğubayazıt'ta -8°C! Ağır don koşulları. Toprak nemi eriyen karla dengelenemiyor.", 0, 10)
-        notif_count += add_notif(user.id,
-            "📊 Beyşehir Çilek: Haftalık rapor — nem stabil, son 7 günde 2 sulama yapıldı.", 2, 4, True)
-        notif_count += add_notif(user.id,
-            "⏰ Doğubayazıt Buğday 36 saattir sulanmadı. Kuraklık riski artıyor!", 1, 6)
-        notif_count += add_notif(user.id,
-            "💧 Beyşehir Çilek: Sulama tamamlandı. Su tasarrufu: %18. Göl etkisi faydalı.", 1, 12, True)
-
-db.commit()
-print(f"✅ {notif_count} bildirim hazır")
+# Şablon sırası -> sulama dönemleri (gün: NOW'dan kaç gün önce, DAYS günlük geçmiş için)
+#   "gunler": range(bas, bit, adim) günleri, "ornek": range(bas, bit) içinden rastgele 'adet' gün
+#   "saatler": başlangıç saati (tekse sabit, değilse rastgele), "sure": dakika aralığı
+SULAMA_PLANLARI = [
+    # Çumra Buğday — KRİTİK: son 10 gün sulama yok, öncesi düzenli
+    [{"gunler": (55, 10, -3), "saatler": (6, 7), "sure": (25, 50)}],
+    # Karapınar Ayçiçeği — ML GÜVENME: düzenli sulama
+    [{"gunler": (58, 1, -3), "saatler": (6, 17), "sure": (30, 55)}],
+    # Selçuklu Domates — ML GÜVEN: yağmurlu günlerde atlanmış
+    [{"gunler": (56, 1, -4), "saatler": (7,), "sure": (20, 45)}],
+    # Ereğli Mısır — İDEAL: düzenli
+    [{"gunler": (58, 1, -3), "saatler": (6, 7, 17), "sure": (25, 40)}],
+    # Meram Biber — DÜŞÜK NEM: yetersiz
+    [{"gunler": (55, 1, -5), "saatler": (6, 17), "sure": (15, 35)}],
+    # Serik Çilek — AŞIRI ISLAK: son 7 gün yok
+    [{"gunler": (55, 8, -3), "saatler": (6, 7), "sure": (15, 30)}],
+    # Patnos Patates — KRİTİK_SAVUNMACI: don yüzünden tutarsız
+    [{"gunler": (55, 2, -4), "saatler": (7, 17), "sure": (20, 45)}],
+    # Akşehir Soğan — İDEAL: düzenli
+    [{"gunler": (56, 1, -4), "saatler": (6, 17), "sure": (20, 35)}],
+    # Kumluca Domates — MALİYET: ilk 30 gün her gün, son 30 gün haftada 3-4
+    [{"gunler": (58, 28, -1), "saatler": (7,), "sure": (40, 60)},
+     {"ornek": (1, 28, 15), "saatler": (7,), "sure": (20, 40)}],
+    # Cihanbeyli Buğday — SÜRPRİZ YAĞMUR: düzenli
+    [{"gunler": (55, 1, -4), "saatler": (6, 7), "sure": (25, 45)}],
+    # Doğubayazıt Buğday — KRİTİK: son 10 gün yok
+    [{"gunler": (55, 10, -4), "saatler": (7,), "sure": (25, 50)}],
+    # Beyşehir Çilek — İDEAL: düzenli
+    [{"gunler": (55, 1, -3), "saatler": (6, 7), "sure": (15, 30)}],
+]
 
-# ╔══════════════════════════════════════════════════════════════════════╗
-# ║  ÖZET                                                               ║
-# ╚══════════════════════════════════════════════════════════════════════╝
 
-db.close()
-print("\n" + "=" * 60)
-print("🎉 Veritabanı başarıyla dolduruldu!")
-print("=" * 60)
-print(f"""
+def sulama_gunleri(donem):
+    """Dönemin sulama günleri, eskiden yeniye (kaç gün önce, azalan)"""
+    if "gunler" in donem:
+        return range(*donem["gunler"])
+    bas, bit, adet = donem["ornek"]
+    return sorted(random.sample(range(bas, bit), adet), reverse=True)
+
+
+def main():
+    # ── Deterministik seed ─────────────────────────────────────────────────
+    random.seed(42)
+
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        _doldur(db)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _doldur(db):
+    # ╔══════════════════════════════════════════════════════════════════════╗
+    # ║  1. KULLANICILAR                                                    ║
+    # ╚══════════════════════════════════════════════════════════════════════╝
+
+    users_data = [
+        {"email": "ahmet@ciftci.com", "hashed_password": h("ahmet123"), "full_name": "Ahmet Yılmaz"},
+        {"email": "fatma@ciftci.com", "hashed_password": h("fatma123"), "full_name": "Fatma Demir"},
+        {"email": "mehmet@ciftci.com", "hashed_password": h("mehmet123"), "full_name": "Mehmet Kaya"},
+    ]
+
+    # Var olan e-postalar atlanır (ON CONFLICT DO NOTHING), sonra tek sorguda geri okunur
+    bulk_upsert(db, models.User, users_data, conflict_cols=["email"], update_cols=[])
+    emails = [u["email"] for u in users_data]
+    user_map = {u.email: u for u in db.query(models.User).filter(models.User.email.in_(emails))}
+    created_users = [user_map[e] for e in emails]
+
+    print(f"✅ {len(created_users)} kullanıcı hazır")
+
+    # ╔══════════════════════════════════════════════════════════════════════╗
+    # ║  2. TARLALAR (12 tarla — Konya / Antalya / Ağrı)                  ║
+    # ╚══════════════════════════════════════════════════════════════════════╝
+
+    plant_types = db.query(models.PlantType).all()
+    if not plant_types:
+        print("❌ Bitki türleri bulunamadı! Önce /plant-types/seed çağırın.")
+        return
+
+    pt_map = {p.name: p.id for p in plant_types}
+
+    # Şablondaki owner (kullanıcı sırası) ve plant (bitki adı) gerçek id'lere çevrilir
+    fields_data = [
+        {
+            **{k: v for k, v in t.items() if k not in ("owner", "plant")},
+            "owner_id": created_users[t["owner"]].id,
+            "plant_type_id": pt_map.get(t["plant"], 1),
+        }
+        for t in TARLA_SABLONLARI
+    ]
+
+    field_map = {
+        f.name: f for f in db.query(models.Field).filter(models.Field.name.in_([f["name"] for f in fields_data]))
+    }
+    created_fields = []
+    for f in fields_data:
+        field = field_map.get(f["name"])
+        if field is None:
+            field = models.Field(**f)
+            db.add(field)
+        created_fields.append(field)
+    db.flush()  # yeni tarlaların id'leri (commit en sonda, tek transaction)
+
+    print(f"✅ {len(created_fields)} tarla hazır")
+
+    # ╔══════════════════════════════════════════════════════════════════════╗
+    # ║  3. SENSÖR CİHAZLARI (tarla başı 2: nem + sıcaklık)              ║
+    # ╚══════════════════════════════════════════════════════════════════════╝
+
+    ilce_labels = [
+        "Çumra", "Karapınar", "Selçuklu", "Ereğli", "Meram", "Serik",
+        "Patnos", "Akşehir", "Kumluca", "Cihanbeyli", "Doğubayazıt", "Beyşehir",
+    ]
+
+    sensor_device_count = 0
+    sensor_rows = []
+    mevcut_sensorler = kayit_sayilari(db, models.Sensor)
+    for idx, field in enumerate(created_fields):
+        existing = mevcut_sensorler.get(field.id, 0)
+        if existing > 0:
+            sensor_device_count += existing
+            continue
+        label = ilce_labels[idx] if idx < len(ilce_labels) else f"#{idx+1}"
+        base_num = idx * 2 + 1
+        sensor_rows.append(dict(
+            sensor_code=f"SNS-{base_num:03d}",
+            name=f"Nem Sensörü — {label}",
+            type="moisture",
+            status=random.choice(["active"] * 4 + ["warning"]),
+            battery=random.randint(40, 100),
+            field_id=field.id,
+            installed_at=NOW - datetime.timedelta(days=random.randint(60, 365)),
+        ))
+        sensor_rows.append(dict(
+            sensor_code=f"SNS-{base_num + 1:03d}",
+            name=f"Sıcaklık Sensörü — {label}",
+            type="temperature",
+            status=random.choice(["active"] * 3 + ["maintenance"]),
+            battery=random.randint(25, 100),
+            field_id=field.id,
+            installed_at=NOW - datetime.timedelta(days=random.randint(60, 365)),
+        ))
+        sensor_device_count += 2
+
+    bulk_insert(db, models.Sensor, sensor_rows, chunk_size=SEED_CHUNK)
+    print(f"✅ {sensor_device_count} sensör cihazı hazır")
+
+    # ╔══════════════════════════════════════════════════════════════════════╗
+    # ║  4. SENARYO BAZLI SENSÖR + HAVA TAHMİN VERİLERİ (60 gün)         ║
+    # ╚══════════════════════════════════════════════════════════════════════╝
+
+
+    total_sensor = 0
+    total_weather = 0
+    sensor_log_rows = []
+    weather_rows = []
+    mevcut_loglar = kayit_sayilari(db, models.SensorLog)
+    mevcut_tahminler = kayit_sayilari(db, models.WeatherForecast)
+
+    for field_idx, gen_func, kwargs in SCENARIO_CONFIG:
+        field = created_fields[field_idx]
+        existing_sensor = mevcut_loglar.get(field.id, 0)
+        if existing_sensor > 0:
+            total_sensor += existing_sensor
+            total_weather += mevcut_tahminler.get(field.id, 0)
+            continue
+        sensor_logs, weather_logs = gen_func(field_id=field.id, **kwargs)
+        sensor_log_rows.extend(sensor_logs)
+        weather_rows.extend(weather_logs)
+        total_sensor += len(sensor_logs)
+        total_weather += len(weather_logs)
+
+    bulk_insert(db, models.SensorLog, sensor_log_rows, chunk_size=SEED_CHUNK)
+    bulk_insert(db, models.WeatherForecast, weather_rows, chunk_size=SEED_CHUNK)
+    print(f"✅ {total_sensor} sensör kaydı hazır")
+    print(f"✅ {total_weather} hava tahmini hazır")
+
+    # ╔══════════════════════════════════════════════════════════════════════╗
+    # ║  5. GELECEK HAVA TAHMİNLERİ (5 gün ileri)                         ║
+    # ╚══════════════════════════════════════════════════════════════════════╝
+
+    future_count = 0
+    future_rows = []
+    mevcut_gelecek = kayit_sayilari(db, models.WeatherForecast, models.WeatherForecast.forecast_date > NOW)
+    for field in created_fields:
+        future_exists = mevcut_gelecek.get(field.id, 0)
+        if future_exists > 0:
+            future_count += future_exists
+            continue
+        for day_offset in range(1, 6):
+            forecast_date = (NOW + datetime.timedelta(days=day_offset)).replace(hour=12, minute=0, second=0)
+            rain_prob = round(random.uniform(5, 75), 1)
+            rain_amount = round(random.uniform(2, 18), 1) if rain_prob > 40 else round(random.uniform(0, 2), 1)
+            future_rows.append(dict(
+                field_id=field.id, forecast_date=forecast_date,
+                rain_probability=rain_prob, expected_rain_amount=rain_amount,
+            ))
+            future_count += 1
+
+    bulk_insert(db, models.WeatherForecast, future_rows, chunk_size=SEED_CHUNK)
+    print(f"✅ {future_count} gelecek hava tahmini hazır")
+
+    # ╔══════════════════════════════════════════════════════════════════════╗
+    # ║  6. SULAMA LOGLARI (senaryo bazlı)                                 ║
+    # ╚══════════════════════════════════════════════════════════════════════╝
+
+    irrigation_count = 0
+    irrigation_rows = []
+
+    def add_irrigation(fld, day_off, hour, dur_min):
+        start = (NOW - datetime.timedelta(days=day_off)).replace(hour=hour, minute=random.randint(0, 20))
+        water = round(fld.pump_flow_rate * (dur_min / 60), 1)
+        cost = round(water * fld.water_unit_price / 1000, 2)
+        irrigation_rows.append(dict(
+            field_id=fld.id, start_time=start,
+            duration_minutes=round(dur_min, 1), water_amount_liters=water, cost_total=cost,
+        ))
+        return 1
+
+    mevcut_sulamalar = kayit_sayilari(db, models.IrrigationLog)
+    for idx, field in enumerate(created_fields):
+        existing = mevcut_sulamalar.get(field.id, 0)
+        if existing > 0:
+            irrigation_count += existing
+            continue
+
+        for donem in SULAMA_PLANLARI[idx]:
+            for d in sulama_gunleri(donem):
+                saat = donem["saatler"][0] if len(donem["saatler"]) == 1 else random.choice(donem["saatler"])
+                irrigation_count += add_irrigation(field, d, saat, random.uniform(*donem["sure"]))
+
+    bulk_insert(db, models.IrrigationLog, irrigation_rows, chunk_size=SEED_CHUNK)
+    print(f"✅ {irrigation_count} sulama kaydı hazır")
+
+    # Maliyet panolarının okuduğu günlük özetler ham loglardan yeniden hesaplanır
+    stat_count = irrigation_stats.yeniden_olustur(db, commit=False)
+    print(f"✅ {stat_count} günlük sulama özeti hazır")
+
+    # ╔══════════════════════════════════════════════════════════════════════╗
+    # ║  7. BİLDİRİMLER (senaryo-spesifik)                                ║
+    # ╚══════════════════════════════════════════════════════════════════════╝
+
+    notif_count = 0
+    notif_rows = []
+
+    def add_notif(uid, msg, days_ago, hours_ago=0, is_read=False):
+        notif_rows.append(dict(
+            user_id=uid, message=msg,
+            created_at=NOW - datetime.timedelta(days=days_ago, hours=hours_ago),
+            is_read=is_read,
+        ))
+        return 1
+
+    mevcut_bildirimler = dict(
+        db.query(models.Notification.user_id, func.count(models.Notification.id))
+        .group_by(models.Notification.user_id).all()
+    )
+    for user in created_users:
+        existing = mevcut_bildirimler.get(user.id, 0)
+        if existing > 0:
+            notif_count += existing
+            continue
+
+        if user.email == "ahmet@ciftci.com":
+            notif_count += add_notif(user.id,
+                "⚠️ Çumra Buğday tarlasında nem %8'e düştü! Konya'da kuraklık devam ediyor. Acil sulama başlatılıyor.", 0, 2)
+            notif_count += add_notif(user.id,
+                "🤖 Karapınar Ayçiçeği: ML modeli hava tahminlerine güvenmiyor (son 60 günde %5 isabet). Savunmacı sulama uygulanıyor.", 0, 5)
+            notif_count += add_notif(user.id,
+                "✅ Selçuklu Domates: Yağmur tahmini ML tarafından doğrulandı (%85 isabet). Sulama 3 saat erteleniyor — su tasarrufu!", 1, 3, True)
+            notif_count += add_notif(user.id,
+                "📊 Ereğli Mısır: Haftalık rapor — nem ideal aralıkta (%52), son 7 günde 2 sulama yapıldı.", 1, 8, True)
+            notif_count += add_notif(user.id,
+                "💧 Meram Biber: Nem %28'e düştü. Konya sıcakları etkili. Sulama başlatılıyor.", 0, 6)
+            notif_count += add_notif(user.id,
+                "🚫 Serik Çilek: Antalya'da yoğun yağış sonrası nem %75. Sulama durduruldu — kök çürümesi riski!", 0, 1)
+            notif_count += add_notif(user.id,
+                "🌡️ Patnos Patates: Ağrı'da -5°C! Don riski mevcut. Kritik nem seviyesi (%12). Minimum doz sulama.", 0, 3)
+            notif_count += add_notif(user.id,
+                "✅ Selçuklu Domates: Sulama 45 dk sürdü. 60L su kullanıldı. Maliyet: 0.11₺", 2, 10, True)
+            notif_count += add_notif(user.id,
+                "📊 Haftalık özet: 7 tarlanızdan 3'ü ideal, 2'si kritik, 1'i aşırı ıslak. Toplam su: 2450L", 3, 0, True)
+            notif_count += add_notif(user.id,
+                "🌧️ Karapınar bölgesinde yarın yağmur bekleniyor ama ML güvenmiyor. Sulama programı korunuyor.", 1, 14)
+            notif_count += add_notif(user.id,
+                "⏰ Çumra Buğday tarlası 48 saattir sulanmadı! Nem tehlikeli seviyeye yaklaşıyor.", 1, 0)
+            notif_count += add_notif(user.id,
+                "💰 Bu hafta ML sayesinde Selçuklu serasında %32 su tasarrufu sağlandı. Aylık tasarruf: ~85₺", 2, 6, True)
+
+        elif user.email == "fatma@ciftci.com":
+            notif_count += add_notif(user.id,
+                "✅ Akşehir Soğan: Nem ideal aralıkta (%40). Sulama programı düzenli devam ediyor.", 0, 4, True)
+            notif_count += add_notif(user.id,
+                "💰 Kumluca Domates: ML ile son 30 günde %48 su tasarrufu! Günlük maliyet 5.4₺ → 2.7₺", 0, 8)
+            notif_count += add_notif(user.id,
+                "🌧️ Cihanbeyli Buğday: ML sürpriz yağmur tespit etti! Tahmin vermese de beklenmedik yağışlar olabiliyor.", 0, 12)
+            notif_count += add_notif(user.id,
+                "📊 Kumluca Domates: Haftalık rapor — ML öncesi 5.1₺/gün → ML sonrası 2.6₺/gün.", 2, 5, True)
+            notif_count += add_notif(user.id,
+                "✅ Akşehir Soğan: Sulama tamamlandı. Süre: 28 dk, Su: 51.3L, Maliyet: 0.07₺", 1, 7, True)
+            notif_count += add_notif(user.id,
+                "🔔 Cihanbeyli Buğday: Yeni sensör verisi — Nem: %20, Sıcaklık: 0.5°C. Sulama gerekebilir.", 0, 2)
+            notif_count += add_notif(user.id,
+                "⚠️ Cihanbeyli bölgesinde sıcaklık düşüyor. Don riski olabilir!", 1, 18)
+            notif_count += add_notif(user.id,
+                "📊 Haftalık özet: 3 tarla — 1 ideal, 1 maliyet tasarrufu, 1 sürpriz yağmur deseni.", 3, 0, True)
+
+        elif user.email == "mehmet@ciftci.com":
+            notif_count += add_notif(user.id,
+                "⚠️ Doğubayazıt Buğday: Nem %9! Ağrı'da sert kış toprak nemini kritik seviyeye çekti.", 0, 1)
+            notif_count += add_notif(user.id,
+                "✅ Beyşehir Çilek: Nem ideal (%55). Göl kenarı mikrokliması bitkiye iyi geliyor.", 0, 5, True)
+            notif_count += add_notif(user.id,
+                "🌡️ Doğubayazıt'ta -8°C! Ağır don koşulları. Toprak nemi eriyen karla dengelenemiyor.", 0, 10)
+            notif_count += add_notif(user.id,
+                "📊 Beyşehir Çilek: Haftalık rapor — nem stabil, son 7 günde 2 sulama yapıldı.", 2, 4, True)
+            notif_count += add_notif(user.id,
+                "⏰ Doğubayazıt Buğday 36 saattir sulanmadı. Kuraklık riski artıyor!", 1, 6)
+            notif_count += add_notif(user.id,
+                "💧 Beyşehir Çilek: Sulama tamamlandı. Su tasarrufu: %18. Göl etkisi faydalı.", 1, 12, True)
+
+    bulk_insert(db, models.Notification, notif_rows, chunk_size=SEED_CHUNK)
+    print(f"✅ {notif_count} bildirim hazır")
+
+    # Bildirim zilinin okuduğu okunmamış sayaçları
+    notifications.sayaclari_yeniden_olustur(db, commit=False)
+
+    # Tüm adımlar tek transaction: hata olursa hiçbiri yazılmaz
+    db.commit()
+
+    # ╔══════════════════════════════════════════════════════════════════════╗
+    # ║  ÖZET                                                               ║
+    # ╚══════════════════════════════════════════════════════════════════════╝
+
+    print("\n" + "=" * 60)
+    print("🎉 Veritabanı başarıyla dolduruldu!")
+    print("=" * 60)
+    print(f"""
 📊 Veri Özeti:
   • 3 kullanıcı
   • 12 tarla (Konya:7 | Antalya:2 | Ağrı:2 | Konya-Beyşehir:1)
@@ -876,5 +875,9 @@ print(f"""
   1. POST /plant-types/seed         → Bitki türlerini yükle
   2. POST /prediction/train-all     → ML modellerini eğit
   3. GET  /simulation/check-all-fields/1 → Ahmet kontrol
-""")
-print("=" * 60)
+    """)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
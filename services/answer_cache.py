@@ -0,0 +1,161 @@
+"""
+Chatbot Cevap Onbellegi
+=======================
+Tekrarlanan ciftci sorulari ("Bugun sulamali miyim?", "Domates ne kadar su ister?")
+LLM'e gitmeden onbellekten cevaplanir.
+
+Anahtar = (kapsam, normalize soru):
+  - Bitki kutuphanesi sorusu (tek bitki adi gecer, tarla durumu sorulmaz):
+    kapsam = bitki bilgisinin parmak izi -> tarla/kullanici fark etmeksizin paylasilir,
+    bitki kaydi degisirse parmak izi de degisir (ANSWER_CACHE_STATIC_TTL)
+  - Diger sorular: kapsam = (tarla, LLM'e giden context metninin parmak izi) ->
+    yeni sensor olcumu / karar / hava degisince anahtar kendiliginden degisir (ANSWER_CACHE_TTL)
+
+Varsayilan: yalnizca normalize soru birebir eslesir. ANSWER_CACHE_SEMANTIC=1 ile ayni
+kapsamdaki sorular arasinda karakter 3-gram hash vektorleriyle kosinus benzerligi de
+aranir; esik ustundeki aday ancak kelime kumesi (DOLGU_KELIMELERI haric) ayniysa kabul
+edilir. 3-gram benzerligi olumsuzlugu ayirt edemez ("sulamali" / "sulamamali" 0.96),
+kelime kumesi sarti olumsuzluk ekli ve zit anlamli kelimeleri iskalatir.
+Yalnizca gecmissiz (konusmanin ilk) turlarda kullanilir.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import zlib
+from typing import Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from services.ttl_cache import TTLCache
+
+ANSWER_CACHE_TTL = int(os.getenv("ANSWER_CACHE_TTL", "600"))
+ANSWER_CACHE_STATIC_TTL = int(os.getenv("ANSWER_CACHE_STATIC_TTL", "86400"))
+ANSWER_CACHE_MAX = int(os.getenv("ANSWER_CACHE_MAX", "5000"))
+ANSWER_CACHE_SEMANTIC = os.getenv("ANSWER_CACHE_SEMANTIC", "0") == "1"
+ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.9"))
+VEKTOR_BOYUTU = 1024
+
+_cevaplar = TTLCache("chatbot_cevap", ttl_seconds=ANSWER_CACHE_TTL, max_entries=ANSWER_CACHE_MAX)
+# kapsam -> (sorular, L2-normalize vektor matrisi)
+_indeks = TTLCache("chatbot_cevap_indeks", ttl_seconds=ANSWER_CACHE_TTL, max_entries=ANSWER_CACHE_MAX)
+_indeks_lock = threading.Lock()
+
+# Bu koklerle baslayan kelime gecen soru tarlanin anlik durumuna baglidir
+# (bitki kutuphanesi sorusu sayilmaz)
+DINAMIK_KOKLER = (
+    "bugun", "simdi", "yarin", "tarla", "nem", "yagmur", "yagis",
+    "hava", "pompa", "sensor", "sula",
+)
+
+# Benzer soru eslesmesinde yok sayilan kelimeler (normalize edilmis)
+DOLGU_KELIMELERI = frozenset((
+    "acaba", "bir", "da", "de", "ki", "lutfen", "peki", "ve", "ya",
+    "mi", "mu", "midir", "mudur", "miyim", "muyum", "misin", "musun", "miyiz", "muyuz",
+))
+
+_TR_KUCUK = str.maketrans({"I": "ı", "İ": "i"})
+_TR_ASCII = str.maketrans("çğıöşü", "cgiosu")
+
+
+# ============================================================
+# 1. NORMALIZASYON + PARMAK IZI
+# ============================================================
+
+def normalize(metin: str) -> str:
+    """Turkce kucuk harf, ASCII, noktalama yok, tek bosluk."""
+    metin = metin.translate(_TR_KUCUK).lower().translate(_TR_ASCII)
+    return " ".join(re.sub(r"[^a-z0-9 ]+", " ", metin).split())
+
+
+def parmak_izi(metin: str) -> str:
+    """Context metninin ozeti; saat satiri haric (her dakika degisir, cevabi etkilemez)."""
+    metin = "\n".join(s for s in metin.splitlines() if not s.startswith("📅 Şu anki tarih"))
+    return hashlib.sha1(metin.encode("utf-8")).hexdigest()[:16]
+
+
+def bitki_sorusu(soru_norm: str, bitkiler: List[dict]) -> Optional[dict]:
+    """Soruda tek bir bitki adi geciyor ve tarla durumu sorulmuyorsa o bitkiyi dondurur."""
+    kelimeler = soru_norm.split()
+    if " su an " in f" {soru_norm} " or any(w.startswith(DINAMIK_KOKLER) for w in kelimeler):
+        return None
+    eslesen = [b for b in bitkiler if normalize(b["name"]) in soru_norm]
+    return eslesen[0] if len(eslesen) == 1 else None
+
+
+def bitki_kapsami(bitki_metni: str) -> Tuple:
+    return ("bitki", parmak_izi(bitki_metni))
+
+
+def tarla_kapsami(field_id: int, context_metni: str) -> Tuple:
+    return ("tarla", field_id, parmak_izi(context_metni))
+
+
+def _ttl(kapsam: Tuple) -> int:
+    return ANSWER_CACHE_STATIC_TTL if kapsam[0] == "bitki" else ANSWER_CACHE_TTL
+
+
+# ============================================================
+# 2. BENZERLIK (hash'lenmis karakter 3-gram)
+# ============================================================
+
+def vektor(soru_norm: str) -> np.ndarray:
+    metin = f" {soru_norm} "
+    v = np.zeros(VEKTOR_BOYUTU, dtype=np.float32)
+    for i in range(len(metin) - 2):
+        v[zlib.crc32(metin[i:i + 3].encode()) % VEKTOR_BOYUTU] += 1.0
+    norm = np.linalg.norm(v)
+    return v / norm if norm else v
+
+
+def kelime_kumesi(soru_norm: str) -> frozenset:
+    return frozenset(soru_norm.split()) - DOLGU_KELIMELERI
+
+
+def _en_yakin(kapsam: Hashable, soru_norm: str) -> Optional[str]:
+    kayit = _indeks.get(kapsam)
+    if not kayit:
+        return None
+    sorular, matris = kayit
+    benzerlik = matris @ vektor(soru_norm)
+    kelimeler = kelime_kumesi(soru_norm)
+    # Esik ustundeki adaylar benzerlige gore; ilk kelime kumesi ayni olan kabul edilir
+    for i in np.argsort(-benzerlik):
+        if benzerlik[i] < ANSWER_CACHE_SIMILARITY:
+            break
+        if kelime_kumesi(sorular[i]) == kelimeler:
+            return sorular[i]
+    return None
+
+
+# ============================================================
+# 3. OKU / YAZ
+# ============================================================
+
+def bul(kapsam: Tuple, soru: str) -> Optional[str]:
+    soru_norm = normalize(soru)
+    cevap = _cevaplar.get((kapsam, soru_norm))
+    if cevap is None and ANSWER_CACHE_SEMANTIC:
+        yakin = _en_yakin(kapsam, soru_norm)
+        if yakin is not None:
+            cevap = _cevaplar.get((kapsam, yakin))
+    return cevap
+
+
+def kaydet(kapsam: Tuple, soru: str, cevap: str) -> None:
+    soru_norm = normalize(soru)
+    _cevaplar.set((kapsam, soru_norm), cevap, ttl=_ttl(kapsam))
+    if not ANSWER_CACHE_SEMANTIC:
+        return
+    with _indeks_lock:
+        sorular, matris = _indeks.get(kapsam) or ([], np.zeros((0, VEKTOR_BOYUTU), dtype=np.float32))
+        if soru_norm in sorular:
+            return
+        _indeks.set(kapsam, (sorular + [soru_norm], np.vstack([matris, vektor(soru_norm)])), ttl=_ttl(kapsam))
+
+
+def temizle() -> None:
+    _cevaplar.clear()
+    _indeks.clear()
+
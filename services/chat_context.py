@@ -0,0 +1,472 @@
+"""
+Chatbot Tarla Baglami
+=====================
+Her sohbet mesajinda LLM'e giden tarla baglami burada toplanir:
+  - DB kaynaklari (tarla, bitki, son sensor olcumleri, cihazlar, sulama gecmisi,
+    DB tahminleri, bildirimler) tek oturumda
+  - Anlik hava, saatlik tahmin, ML dogrulama ve sulama karari - eskiden
+    127.0.0.1:8000'e yapilan HTTP cagrilari yerine dogrudan fonksiyon cagrisi
+
+Bes kaynak ThreadPoolExecutor ile ayni anda toplanir (her biri kendi oturumuyla).
+Sonuc yapisal (dict) olarak tarla basina CHATBOT_CONTEXT_TTL saniye onbellekte
+tutulur; ayni sohbetteki sonraki mesajlar tekrar toplamaz. Yeni sensor olcumu,
+karar degisikligi, sulama olayi ve bitki guncellemesinde gecersiz kilinir.
+
+Prompt boyutu token butcesiyle sinirlidir:
+  - Baglam oncelikli bolumlere ayrilir; butce asilirsa en dusuk oncelikliler
+    (cihaz listesi, eski tahminler, bildirimler...) once atilir
+  - Sensor gecmisi satir satir degil, 7 gunluk istatistik + egilim olarak yazilir
+  - Sohbet gecmisinde butceye sigmayan eski turlar tek bir ozet mesajina indirgenir
+"""
+
+import datetime
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+
+import models
+from database import SessionLocal
+from ml.predictor import predict_rain_from_db
+from services import plant_catalog
+from services.irrigation_decision import karar_hesapla
+from services.ttl_cache import TTLCache
+from services.weather import anlik_hava, saatlik_tahmin_olustur
+
+logger = logging.getLogger("chat_context")
+
+CHATBOT_CONTEXT_TTL = int(os.getenv("CHATBOT_CONTEXT_TTL", "120"))
+CHATBOT_CONTEXT_MAX = int(os.getenv("CHATBOT_CONTEXT_MAX", "5000"))
+CHATBOT_CONTEXT_TOKENS = int(os.getenv("CHATBOT_CONTEXT_TOKENS", "1200"))
+CHATBOT_HISTORY_TOKENS = int(os.getenv("CHATBOT_HISTORY_TOKENS", "1000"))
+CHATBOT_MESSAGE_TOKENS = int(os.getenv("CHATBOT_MESSAGE_TOKENS", "400"))
+SENSOR_OZET_GUN = 7
+
+_baglam_onbellegi = TTLCache("chatbot_baglam", ttl_seconds=CHATBOT_CONTEXT_TTL, max_entries=CHATBOT_CONTEXT_MAX)
+
+
+# ============================================================
+# 1. KAYNAKLAR
+# ============================================================
+
+def zaman_metni(deger: Optional[datetime.datetime], bicim: str = "%d.%m.%Y %H:%M") -> str:
+    return deger.strftime(bicim) if deger else "?"
+
+
+def bitki_sozlugu(bitki: plant_catalog.Bitki) -> Dict[str, Any]:
+    veri = {ad: getattr(bitki, ad) for ad in plant_catalog.ALANLAR}
+    veri["ipuclari"] = list(bitki.ipuclari)
+    return veri
+
+
+def _db_kaynaklari(field_id: int) -> Optional[Dict[str, Any]]:
+    """Tarlaya ait DB verileri (ORM nesnesi degil, onbellege uygun dict'ler)."""
+    db = SessionLocal()
+    try:
+        field = db.query(models.Field).filter(models.Field.id == field_id).first()
+        if not field:
+            return None
+
+        bitki = plant_catalog.getir(field.plant_type_id)
+        veri = {
+            "tarla": {
+                "id": field.id, "ad": field.name, "konum": field.location, "ilce": field.ilce,
+                "latitude": field.latitude, "longitude": field.longitude,
+                "pump_flow_rate": field.pump_flow_rate, "water_unit_price": field.water_unit_price,
+                "owner_id": field.owner_id,
+            },
+            "bitki": None,
+        }
+        if bitki:
+            veri["bitki"] = bitki_sozlugu(bitki)
+
+        veri["sensor_loglari"] = [
+            {"timestamp": l.timestamp, "moisture": l.moisture, "temperature": l.temperature, "is_raining": l.is_raining}
+            for l in db.query(models.SensorLog).filter(models.SensorLog.field_id == field_id)
+            .order_by(models.SensorLog.timestamp.desc()).limit(10)
+        ]
+        son_zaman = db.query(func.max(models.SensorLog.timestamp))\
+            .filter(models.SensorLog.field_id == field_id).scalar()
+        veri["sensor_istatistik"] = None
+        if son_zaman:
+            adet, nem_ort, nem_min, nem_max, sic_ort, yagmurlu = db.query(
+                func.count(models.SensorLog.id), func.avg(models.SensorLog.moisture),
+                func.min(models.SensorLog.moisture), func.max(models.SensorLog.moisture),
+                func.avg(models.SensorLog.temperature), func.sum(models.SensorLog.is_raining),
+            ).filter(
+                models.SensorLog.field_id == field_id,
+                models.SensorLog.timestamp >= son_zaman - datetime.timedelta(days=SENSOR_OZET_GUN),
+            ).one()
+            veri["sensor_istatistik"] = {
+                "adet": adet, "nem_ort": nem_ort, "nem_min": nem_min, "nem_max": nem_max,
+                "sicaklik_ort": sic_ort, "yagmurlu": int(yagmurlu or 0),
+            }
+        veri["sensorler"] = [
+            {"name": s.name, "sensor_code": s.sensor_code, "type": s.type, "status": s.status, "battery": s.battery}
+            for s in db.query(models.Sensor).filter(models.Sensor.field_id == field_id)
+        ]
+        veri["sulamalar"] = [
+            {"start_time": i.start_time, "duration_minutes": i.duration_minutes,
+             "water_amount_liters": i.water_amount_liters, "cost_total": i.cost_total}
+            for i in db.query(models.IrrigationLog).filter(models.IrrigationLog.field_id == field_id)
+            .order_by(models.IrrigationLog.start_time.desc()).limit(5)
+        ]
+        veri["db_tahminleri"] = [
+            {"forecast_date": f.forecast_date, "rain_probability": f.rain_probability,
+             "expected_rain_amount": f.expected_rain_amount}
+            for f in db.query(models.WeatherForecast).filter(models.WeatherForecast.field_id == field_id)
+            .order_by(models.WeatherForecast.forecast_date.asc()).limit(5)
+        ]
+        veri["bildirimler"] = []
+        if field.owner_id:
+            veri["bildirimler"] = [
+                {"created_at": n.created_at, "message": n.message, "is_read": n.is_read}
+                for n in db.query(models.Notification).filter(models.Notification.user_id == field.owner_id)
+                .order_by(models.Notification.created_at.desc()).limit(5)
+            ]
+        return veri
+    finally:
+        db.close()
+
+
+def _anlik_hava(ilce: str) -> dict:
+    try:
+        return anlik_hava(ilce=ilce)
+    except Exception:
+        return {}
+
+
+def _saatlik_tahmin(ilce: str) -> dict:
+    try:
+        return saatlik_tahmin_olustur(ilce=ilce, saat=24)
+    except Exception:
+        return {}
+
+
+def _ml_tahmini(field_id: int) -> dict:
+    db = SessionLocal()
+    try:
+        return predict_rain_from_db(db, field_id)
+    except Exception:
+        return {}
+    finally:
+        db.close()
+
+
+def _sulama_karari(field_id: int) -> dict:
+    # Salt okuma: karar gunlugu / canli akis / onbellek yazimi endpoint ve scheduler akisinda
+    db = SessionLocal()
+    try:
+        return karar_hesapla(field_id, db, onbellege_yaz=False)[0]
+    except Exception:
+        return {}
+    finally:
+        db.close()
+
+
+# ============================================================
+# 2. TOPLAMA + ONBELLEK
+# ============================================================
+
+def baglam_verisi(field_id: int, ilce: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Tarlanin yapisal baglamini doner (tarla yoksa None). ilce cagiran tarafindan
+    biliniyorsa hava kaynaklari DB sorgusunu beklemeden baslar.
+    """
+    onbellekte = _baglam_onbellegi.get(field_id)
+    if onbellekte is not None:
+        return onbellekte
+
+    ilce = ilce or "cankaya"
+    with ThreadPoolExecutor(max_workers=5) as havuz:
+        db_is = havuz.submit(_db_kaynaklari, field_id)
+        anlik_is = havuz.submit(_anlik_hava, ilce)
+        saatlik_is = havuz.submit(_saatlik_tahmin, ilce)
+        ml_is = havuz.submit(_ml_tahmini, field_id)
+        karar_is = havuz.submit(_sulama_karari, field_id)
+
+        veri = db_is.result()
+        if veri is None:
+            return None
+        veri.update({
+            "anlik_hava": anlik_is.result(),
+            "saatlik": saatlik_is.result(),
+            "ml": ml_is.result(),
+            "karar": karar_is.result(),
+            "olusturma": datetime.datetime.now(),
+        })
+
+    _baglam_onbellegi.set(field_id, veri)
+    return veri
+
+
+def gecersiz_kil(field_id: int) -> None:
+    _baglam_onbellegi.invalidate(field_id)
+
+
+def tumunu_gecersiz_kil() -> None:
+    _baglam_onbellegi.clear()
+
+
+# ============================================================
+# 3. TOKEN TAHMINI
+# ============================================================
+
+def token_tahmini(metin: str) -> int:
+    """Kaba token tahmini (Turkce metinde ~3.5 karakter / token)."""
+    return int(len(metin) / 3.5) + 1
+
+
+def _kirp(metin: str, token: int) -> str:
+    sinir = int(token * 3.5)
+    return metin if len(metin) <= sinir else metin[:sinir].rstrip() + " …"
+
+
+# ============================================================
+# 4. METNE DONUSTURME (SYSTEM_PROMPT'a giden context)
+# ============================================================
+# Oncelik: 0 = her zaman kalir, buyudukce butce asiminda once atilir
+
+def _bitki_bolumleri(bitki: Dict[str, Any]) -> List[Tuple[int, str]]:
+    bolumler = []
+    parts = ["=== BİTKİ BİLGİLERİ ==="]
+    parts.append(f"Bitki: {bitki['icon']} {bitki['name']}")
+    parts.append(f"Kategori: {bitki['category']}")
+    parts.append(f"Minimum Nem: %{bitki['min_moisture']}")
+    parts.append(f"Maksimum Nem: %{bitki['max_moisture']}")
+    parts.append(f"Kritik Nem (ACİL): %{bitki['critical_moisture']}")
+    parts.append(f"Yağmur için Max Bekleme: {bitki['max_wait_hours']} saat")
+    parts.append(f"Su İhtiyacı: {bitki['water_need']}")
+    bolumler.append((0, "\n".join(parts)))
+
+    parts = []
+    if bitki["water_amount"]:
+        parts.append(f"Su Miktarı: {bitki['water_amount']}")
+    if bitki["soil_type"]:
+        parts.append(f"Uygun Toprak: {bitki['soil_type']}")
+    if bitki["ideal_temp"]:
+        parts.append(f"İdeal Sıcaklık: {bitki['ideal_temp']}")
+    if bitki["planting_time"]:
+        parts.append(f"Ekim Zamanı: {bitki['planting_time']}")
+    if bitki["harvest_time"]:
+        parts.append(f"Hasat Zamanı: {bitki['harvest_time']}")
+    if bitki["ipuclari"]:
+        parts.append(f"Uzman Tüyoları: {', '.join(bitki['ipuclari'])}")
+    if parts:
+        bolumler.append((3, "\n".join(parts)))
+    return bolumler
+
+
+def bitki_metni(bitki: Dict[str, Any]) -> str:
+    """Yalnizca bitki kutuphanesi bilgisi (tarla/sensor/hava yok) - statik sorular icin context."""
+    return "\n".join(metin for _, metin in _bitki_bolumleri(bitki))
+
+
+def _bolumler(veri: Dict[str, Any]) -> List[Tuple[int, str]]:
+    bolumler = []
+    tarla = veri["tarla"]
+
+    # 1. TARLA BİLGİLERİ
+    parts = ["=== TARLA BİLGİLERİ ==="]
+    parts.append(f"Tarla Adı: {tarla['ad']}")
+    parts.append(f"Konum: {tarla['konum']}")
+    parts.append(f"İlçe: {tarla['ilce']}")
+    if tarla["latitude"] and tarla["longitude"]:
+        parts.append(f"Koordinat: {tarla['latitude']}, {tarla['longitude']}")
+    parts.append(f"Pompa Debi: {tarla['pump_flow_rate']} L/dk")
+    parts.append(f"Su Birim Fiyatı: {tarla['water_unit_price']} TL/L")
+    bolumler.append((0, "\n".join(parts)))
+
+    # 2. BİTKİ BİLGİLERİ (eşikler her zaman, tanıtım bilgileri düşük öncelik)
+    if veri["bitki"]:
+        bolumler.extend(_bitki_bolumleri(veri["bitki"]))
+
+    # 3. SENSÖR ÖZETİ (istatistik + eğilim) ve son ham ölçümler
+    sensor_logs = veri["sensor_loglari"]
+    if sensor_logs:
+        son, eski = sensor_logs[0], sensor_logs[-1]
+        parts = [f"=== SENSÖR ÖZETİ (son {SENSOR_OZET_GUN} gün) ==="]
+        ist = veri.get("sensor_istatistik")
+        if ist and ist["adet"]:
+            parts.append(
+                f"{ist['adet']} ölçüm → Nem ort %{ist['nem_ort']:.1f} (min %{ist['nem_min']}, max %{ist['nem_max']}), "
+                f"Sıcaklık ort {ist['sicaklik_ort']:.1f}°C, Yağmurlu ölçüm: {ist['yagmurlu']}"
+            )
+        if len(sensor_logs) > 1:
+            fark = son["moisture"] - eski["moisture"]
+            parts.append(
+                f"Son {len(sensor_logs)} ölçüm eğilimi: nem {fark:+.1f} puan "
+                f"({zaman_metni(eski['timestamp'])} %{eski['moisture']} → {zaman_metni(son['timestamp'])} %{son['moisture']})"
+            )
+        parts.append(f"📊 ANLIK: Nem %{son['moisture']}, Sıcaklık {son['temperature']}°C ({zaman_metni(son['timestamp'])})")
+        bolumler.append((0, "\n".join(parts)))
+
+        parts = ["=== SON SENSÖR VERİLERİ (en yeniden eskiye) ==="]
+        for log in sensor_logs[:5]:
+            rain_str = "Yağmur VAR" if log["is_raining"] else "Yağmur YOK"
+            parts.append(
+                f"  {zaman_metni(log['timestamp'])} → Nem: %{log['moisture']}, Sıcaklık: {log['temperature']}°C, {rain_str}"
+            )
+        bolumler.append((3, "\n".join(parts)))
+
+    # 4. SENSÖR CİHAZLARI
+    if veri["sensorler"]:
+        parts = ["=== SENSÖR CİHAZLARI ==="]
+        for s in veri["sensorler"]:
+            parts.append(
+                f"  {s['name']} ({s['sensor_code']}) - Tip: {s['type']}, Durum: {s['status']}, Batarya: %{s['battery']}"
+            )
+        bolumler.append((5, "\n".join(parts)))
+
+    # 5. SULAMA GEÇMİŞİ (son 5 kayıt)
+    if veri["sulamalar"]:
+        parts = ["=== SON SULAMA GEÇMİŞİ ==="]
+        for ilog in veri["sulamalar"]:
+            parts.append(
+                f"  {zaman_metni(ilog['start_time'])} → Süre: {ilog['duration_minutes']} dk, "
+                f"Su: {ilog['water_amount_liters']} L, Maliyet: {ilog['cost_total']} TL"
+            )
+        bolumler.append((3, "\n".join(parts)))
+
+    # 6. HAVA TAHMİNLERİ (DB'deki)
+    if veri["db_tahminleri"]:
+        parts = ["=== DB HAVA TAHMİNLERİ (5 günlük) ==="]
+        for f in veri["db_tahminleri"]:
+            parts.append(
+                f"  {zaman_metni(f['forecast_date'], '%d.%m.%Y')} → Yağış Olasılığı: %{f['rain_probability']}, "
+                f"Beklenen Yağış: {f['expected_rain_amount']} mm"
+            )
+        bolumler.append((4, "\n".join(parts)))
+
+    # 7. ANLIK HAVA DURUMU (Open-Meteo)
+    ilce = tarla["ilce"] or "cankaya"
+    current_weather = veri["anlik_hava"]
+    if current_weather and "hata" not in current_weather:
+        parts = ["=== ANLIK HAVA DURUMU (Open-Meteo) ==="]
+        parts.append(f"Konum: {current_weather.get('konum', ilce)}")
+        parts.append(f"Sıcaklık: {current_weather.get('sicaklik')}°C")
+        parts.append(f"Hissedilen: {current_weather.get('hissedilen')}°C")
+        parts.append(f"Nem: %{current_weather.get('nem')}")
+        parts.append(f"Rüzgar: {current_weather.get('ruzgar_hizi')} km/s {current_weather.get('ruzgar_yonu_text', '')}")
+        parts.append(f"Durum: {current_weather.get('emoji', '')} {current_weather.get('durum', '')}")
+        parts.append(f"Yağış Var mı: {'Evet' if current_weather.get('yagis_var_mi') else 'Hayır'}")
+        bolumler.append((2, "\n".join(parts)))
+
+    # 8. SAATLİK TAHMİN (Open-Meteo)
+    hourly = veri["saatlik"]
+    if hourly and "hata" not in hourly:
+        parts = ["=== ÖNÜMÜZDEKİ 24 SAAT TAHMİNİ ==="]
+        parts.append(f"1 saat içinde yağış: {'Evet' if hourly.get('onumuzdeki_1_saat_yagis') else 'Hayır'}")
+        parts.append(f"3 saat içinde yağış: {'Evet' if hourly.get('onumuzdeki_3_saat_yagis') else 'Hayır'}")
+        parts.append(f"6 saat içinde yağış: {'Evet' if hourly.get('onumuzdeki_6_saat_yagis') else 'Hayır'}")
+        ilk_yagis = hourly.get("ilk_yagis")
+        if ilk_yagis:
+            parts.append(f"İlk Yağış: {ilk_yagis.get('kac_saat_sonra', '?')} saat sonra ({ilk_yagis.get('saat', '')})")
+        bolumler.append((1, "\n".join(parts)))
+
+    # 9. ML TAHMİN SONUCU
+    ml_result = veri["ml"]
+    if ml_result and "hata" not in str(ml_result):
+        parts = ["=== ML YAĞMUR TAHMİN DOĞRULAMA ==="]
+        parts.append(f"Sulama Kararı: {ml_result.get('sulama_karari', 'Bilinmiyor')}")
+        parts.append(f"Karar Açıklaması: {ml_result.get('karar_aciklama', '')}")
+        parts.append(f"Tahmin: {'Yağmur gelecek' if ml_result.get('tahmin') == 1 else 'Yağmur gelmeyecek'}")
+        parts.append(f"Güven: %{round(ml_result.get('guven', 0) * 100, 1)}")
+        bolumler.append((1, "\n".join(parts)))
+
+    # 10. AKILLI SULAMA KARARI
+    karar = (veri["karar"] or {}).get("karar")
+    if karar:
+        parts = ["=== AKILLI SULAMA KARAR SİSTEMİ ==="]
+        parts.append(f"Durum: {karar.get('durum', '')}")
+        parts.append(f"Aksiyon: {karar.get('aksiyon', '')}")
+        parts.append(f"Aciliyet: {karar.get('aciliyet', '')}")
+        parts.append(f"Detay: {karar.get('detay', '')}")
+        parts.append(f"Pompa: {karar.get('pompa', '')}")
+        bolumler.append((0, "\n".join(parts)))
+
+    # 11. BİLDİRİMLER (owner'ın son 5 bildirimi)
+    if veri["bildirimler"]:
+        parts = ["=== SON BİLDİRİMLER ==="]
+        for n in veri["bildirimler"]:
+            read_str = "✓ Okundu" if n["is_read"] else "● Okunmadı"
+            parts.append(f"  [{read_str}] {zaman_metni(n['created_at'])}: {n['message']}")
+        bolumler.append((4, "\n".join(parts)))
+
+    return bolumler
+
+
+def baglam_metni(veri: Optional[Dict[str, Any]], token_butcesi: Optional[int] = None) -> str:
+    """Bolumleri sirasiyla birlestirir; butce asilirsa dusuk oncelikliler atilir."""
+    if veri is None:
+        return "Tarla bulunamadı."
+    butce = CHATBOT_CONTEXT_TOKENS if token_butcesi is None else token_butcesi
+
+    bolumler = _bolumler(veri)
+    bolumler.append((0, f"📅 Şu anki tarih ve saat: {datetime.datetime.now().strftime('%d.%m.%Y %H:%M')}"))
+    tokenlar = [token_tahmini(metin) for _, metin in bolumler]
+    kalan = set(range(len(bolumler)))
+
+    # En dusuk oncelikli (buyuk sayi), esitlikte en sondaki bolum once atilir
+    for i in sorted(range(len(bolumler)), key=lambda i: (-bolumler[i][0], -i)):
+        if sum(tokenlar[j] for j in kalan) <= butce or bolumler[i][0] == 0:
+            break
+        kalan.discard(i)
+
+    return "\n\n".join(metin for i, (_, metin) in enumerate(bolumler) if i in kalan)
+
+
+# ============================================================
+# 5. SOHBET GECMISI
+# ============================================================
+
+KONU_AYRACI = " | "
+OZET_KONU_SAYISI = 8
+
+
+def konu_ozeti(mesajlar: List[dict], onceki: Optional[str] = None) -> str:
+    """Kullanici sorularini kisa konu listesine ekler (yuvarlanan ozet; en yeni OZET_KONU_SAYISI konu kalir)."""
+    konular = onceki.split(KONU_AYRACI) if onceki else []
+    konular += [
+        _kirp(m["content"].strip().replace("\n", " "), 25)
+        for m in mesajlar if m["role"] == "user"
+    ]
+    return KONU_AYRACI.join(konular[-OZET_KONU_SAYISI:])
+
+
+def _ozet_mesaji(adet: int, konular: str, token: int) -> dict:
+    ozet = f"(Önceki konuşma özeti: {adet} mesaj. Kullanıcının sorduğu konular: {konular})"
+    return {"role": "system", "content": _kirp(ozet, token)}
+
+
+def gecmisi_sikistir(gecmis: List[dict], token_butcesi: Optional[int] = None,
+                     onceki_ozet: Optional[Tuple[int, str]] = None) -> List[dict]:
+    """
+    En yeni turlardan geriye dogru butceye sigani aynen tutar (uzun mesajlar kirpilir);
+    sigmayan eski turlar tek bir "onceki konusma ozeti" mesajina indirgenir.
+    onceki_ozet: (mesaj sayisi, konular) - kayitli konusmanin daha once ozetlenmis kismi.
+    """
+    butce = CHATBOT_HISTORY_TOKENS if token_butcesi is None else token_butcesi
+    ozet_payi = min(150, butce // 5)  # ozet mesajina ayrilan pay
+    if onceki_ozet or sum(token_tahmini(m["content"]) for m in gecmis) > butce:
+        butce -= ozet_payi
+    tutulan: List[dict] = []
+    harcanan = 0
+    sinir = len(gecmis)
+    for i in range(len(gecmis) - 1, -1, -1):
+        mesaj = {"role": gecmis[i]["role"], "content": _kirp(gecmis[i]["content"], CHATBOT_MESSAGE_TOKENS)}
+        maliyet = token_tahmini(mesaj["content"])
+        if harcanan + maliyet > butce:
+            break
+        tutulan.append(mesaj)
+        harcanan += maliyet
+        sinir = i
+    tutulan.reverse()
+
+    eski = gecmis[:sinir]
+    if eski or onceki_ozet:
+        adet, konular = onceki_ozet or (0, None)
+        tutulan.insert(0, _ozet_mesaji(adet + len(eski), konu_ozeti(eski, konular), ozet_payi))
+    return tutulan
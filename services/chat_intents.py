@@ -0,0 +1,178 @@
+"""
+Chatbot Hizli Yol (yapisal niyetler)
+====================================
+"Nem kac?", "Pompa acik mi?", "Yagmur ne zaman?" gibi sorular chat_context'in zaten
+topladigi veriden (sensor anligi + karar motoru + saatlik tahmin) sablonla cevaplanir;
+LLM yalnizca acik uclu tavsiye sorularinda cagrilir.
+
+Siniflandirici kural tabanlidir: kisa soru + tek bir niyetin anahtar kelimesi + soru kalibi.
+Birden fazla niyet eslesirse, tavsiye/aciklama istenirse veya veri eksikse None doner
+(soru LLM'e gider). Sablonlar anlik olcumu verir; olmasi gereken / ideal deger ve
+(yagmur disinda) gelecek zaman sorulari da acik uclu sayilir.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from services import chat_context
+from services.answer_cache import normalize
+
+MAX_KELIME = 8
+
+# niyet -> (konu kokleri, soru kaliplari) - normalize (ASCII, kucuk harf) metin uzerinde
+NIYETLER = {
+    "nem": (("nem",), ("kac", "ne", "nedir", "yuzde", "durum", "seviye", "nasil")),
+    "sicaklik": (("sicaklik", "derece"), ("kac", "ne", "nedir")),
+    "pompa": (("pompa",), ("acik", "kapali", "calis", "durum", "ne")),
+    "yagmur": (("yagmur", "yagis"), ("ne zaman", "yagacak", "var mi", "gelecek", "bekleniyor", "yok mu")),
+}
+# Bu kokler gecerse soru acik uclu kabul edilir (LLM)
+ACIK_UCLU = (
+    "neden", "nicin", "niye", "yapmali", "yapayim", "yapmam", "oner", "tavsiye", "yorum", "acikla",
+    "olur", "etki", "gerek",
+    # hedef deger: "ideal nem ne?", "sicaklik ne olmali?"
+    "ideal", "uygun", "hedef",
+)
+# Gereklilik kipi (olmali, acilmali, sulamali miyim): tavsiye sorusu
+GEREKLILIK_EKLERI = ("mali", "meli", "malidir", "melidir", "maliyim", "meliyim")
+# Yagmur disindaki niyetler anligi cevaplar; bu kaliplar veya gelecek zaman eki (-acak/-ecek)
+# gecerse soru acik uclu kabul edilir ("Yarin sicaklik kac olacak?")
+ZAMAN_KALIPLARI = ("yarin", "haftaya", "ne zaman", "sonra")
+GELECEK_EKLERI = ("acak", "ecek")
+
+_sayaclar: Dict[str, int] = {}
+_sayac_lock = threading.Lock()
+
+
+# ============================================================
+# 1. SINIFLANDIRICI
+# ============================================================
+
+def _gecer(metin: str, kelimeler: list, kaliplar: tuple) -> bool:
+    """Cok kelimeli kalip ifade olarak, kisa kalip (<=3 harf) tam kelime, digerleri kelime basi olarak aranir."""
+    for k in kaliplar:
+        if " " in k:
+            if f" {k} " in f" {metin} ":
+                return True
+        elif any(w == k or (len(k) > 3 and w.startswith(k)) for w in kelimeler):
+            return True
+    return False
+
+
+def niyet_bul(soru: str) -> Optional[str]:
+    metin = normalize(soru)
+    kelimeler = metin.split()
+    if not kelimeler or len(kelimeler) > MAX_KELIME:
+        return None
+    if _gecer(metin, kelimeler, ACIK_UCLU) or any(w.endswith(GEREKLILIK_EKLERI) for w in kelimeler):
+        return None
+
+    bulunan = [
+        niyet for niyet, (konular, kaliplar) in NIYETLER.items()
+        if any(w.startswith(konular) for w in kelimeler) and _gecer(metin, kelimeler, kaliplar)
+    ]
+    if len(bulunan) != 1:
+        return None
+    if bulunan[0] != "yagmur" and (
+        _gecer(metin, kelimeler, ZAMAN_KALIPLARI) or any(e in w for w in kelimeler for e in GELECEK_EKLERI)
+    ):
+        return None
+    return bulunan[0]
+
+
+# ============================================================
+# 2. SABLONLAR (veri: chat_context.baglam_verisi sonucu)
+# ============================================================
+
+def _nem(veri: Dict[str, Any]) -> Optional[str]:
+    loglar, bitki = veri["sensor_loglari"], veri["bitki"]
+    if not loglar:
+        return None
+    son = loglar[0]
+    nem = son["moisture"]
+    satirlar = [f"💧 {veri['tarla']['ad']}: anlık toprak nemi %{nem} ({chat_context.zaman_metni(son['timestamp'])})."]
+    if bitki:
+        if nem < bitki["critical_moisture"]:
+            durum = "🚨 KRİTİK seviyenin altında"
+        elif nem < bitki["min_moisture"]:
+            durum = "⚠️ ideal aralığın altında"
+        elif nem > bitki["max_moisture"]:
+            durum = "🌊 ideal aralığın üstünde"
+        else:
+            durum = "✅ ideal aralıkta"
+        satirlar.append(
+            f"{bitki['icon']} {bitki['name']} için ideal aralık %{bitki['min_moisture']}–%{bitki['max_moisture']}, "
+            f"kritik sınır %{bitki['critical_moisture']} → {durum}."
+        )
+    if len(loglar) > 1:
+        satirlar.append(f"Son {len(loglar)} ölçümde değişim: {nem - loglar[-1]['moisture']:+.1f} puan.")
+    return "\n".join(satirlar)
+
+
+def _sicaklik(veri: Dict[str, Any]) -> Optional[str]:
+    loglar, hava = veri["sensor_loglari"], veri["anlik_hava"]
+    satirlar = []
+    if loglar:
+        satirlar.append(
+            f"🌡️ Tarla sensörü: {loglar[0]['temperature']}°C ({chat_context.zaman_metni(loglar[0]['timestamp'])})."
+        )
+    if hava and "hata" not in hava:
+        satirlar.append(
+            f"{hava.get('emoji', '')} {hava.get('konum', '')} anlık hava: {hava.get('sicaklik')}°C "
+            f"(hissedilen {hava.get('hissedilen')}°C), {hava.get('durum', '')}."
+        )
+    return "\n".join(satirlar) or None
+
+
+def _pompa(veri: Dict[str, Any]) -> Optional[str]:
+    karar = (veri["karar"] or {}).get("karar")
+    if not karar:
+        return None
+    return (
+        f"⚙️ Pompa: {karar.get('pompa', '')} — {karar.get('aksiyon', '')}\n"
+        f"Durum: {karar.get('durum', '')} (aciliyet: {karar.get('aciliyet', '')})\n"
+        f"{karar.get('detay', '')}"
+    )
+
+
+def _yagmur(veri: Dict[str, Any]) -> Optional[str]:
+    saatlik = veri["saatlik"]
+    if not saatlik or "hata" in saatlik:
+        return None
+    ilk = saatlik.get("ilk_yagis")
+    if ilk:
+        satirlar = [
+            f"🌧️ İlk yağış {ilk.get('kac_saat_sonra', '?')} saat sonra ({ilk.get('saat', '')}) bekleniyor"
+            + (f", olasılık %{ilk['olasilik']}." if ilk.get("olasilik") is not None else ".")
+        ]
+    else:
+        satirlar = ["☀️ Önümüzdeki saatlerde yağış beklenmiyor."]
+    ml = veri["ml"]
+    if ml and "hata" not in str(ml) and ml.get("karar_aciklama"):
+        satirlar.append(f"🤖 ML doğrulaması: {ml['karar_aciklama']}")
+    return "\n".join(satirlar)
+
+
+SABLONLAR: Dict[str, Callable[[Dict[str, Any]], Optional[str]]] = {
+    "nem": _nem,
+    "sicaklik": _sicaklik,
+    "pompa": _pompa,
+    "yagmur": _yagmur,
+}
+
+
+def cevapla(niyet: str, veri: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Sablon cevabi; veri yetersizse None (LLM'e dusulur)."""
+    if veri is None:
+        return None
+    cevap = SABLONLAR[niyet](veri)
+    if cevap is not None:
+        with _sayac_lock:
+            _sayaclar[niyet] = _sayaclar.get(niyet, 0) + 1
+    return cevap
+
+
+def istatistik() -> Dict[str, int]:
+    """/metrics icin niyet basina hizli yoldan verilen cevap sayisi."""
+    with _sayac_lock:
+        return dict(_sayaclar)
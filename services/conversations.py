@@ -0,0 +1,92 @@
+"""
+Chatbot Konusma Deposu
+======================
+- Istemci tum gecmisi her mesajda yeniden gondermez; yalnizca conversation_id + yeni mesaj
+- Mesajlar conversation_messages tablosuna yalnizca eklenir (append-only)
+- Son CONVERSATION_KEEP_MESSAGES mesaj prompt'a aynen gider; daha eskileri
+  konusma satirindaki yuvarlanan ozete katlanir, prompt'a tek ozet mesaji olarak girer
+"""
+
+import datetime
+import os
+from typing import List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+import models
+from services import chat_context
+
+CONVERSATION_KEEP_MESSAGES = int(os.getenv("CONVERSATION_KEEP_MESSAGES", "8"))
+# Ozetlenmemis mesaj sayisi KEEP + bu payi asinca ozet yuvarlanir (her turda degil, toplu)
+CONVERSATION_SUMMARY_SLACK = int(os.getenv("CONVERSATION_SUMMARY_SLACK", "6"))
+
+
+def konusma_getir(db: Session, user_id: int, field_id: int,
+                  conversation_id: Optional[int] = None) -> models.Conversation:
+    """
+    conversation_id verilmisse kullanici/tarla eslesmesini dogrulayip dondurur,
+    verilmemisse yeni konusma acar (flush edilir, commit cagirana birakilir).
+    Bulunamazsa LookupError, baska tarlaya aitse ValueError.
+    """
+    if conversation_id is None:
+        konusma = models.Conversation(user_id=user_id, field_id=field_id)
+        db.add(konusma)
+        db.flush()
+        return konusma
+
+    konusma = db.get(models.Conversation, conversation_id)
+    if konusma is None or konusma.user_id != user_id:
+        raise LookupError(conversation_id)
+    if konusma.field_id != field_id:
+        raise ValueError(conversation_id)
+    return konusma
+
+
+def _ozetlenmemis(db: Session, konusma: models.Conversation) -> List[models.ConversationMessage]:
+    return db.query(models.ConversationMessage).filter(
+        models.ConversationMessage.conversation_id == konusma.id,
+        models.ConversationMessage.id > (konusma.summarized_upto_id or 0),
+    ).order_by(models.ConversationMessage.id).all()
+
+
+def gecmis(db: Session, konusma: models.Conversation) -> Tuple[List[dict], Optional[Tuple[int, str]]]:
+    """Prompt icin (ozetlenmemis mesajlar, (ozetteki mesaj sayisi, konular) veya None)."""
+    mesajlar = [{"role": m.role, "content": m.content} for m in _ozetlenmemis(db, konusma)]
+    ozet = (konusma.summarized_count, konusma.summary) if konusma.summarized_count else None
+    return mesajlar, ozet
+
+
+def mesajlari_ekle(db: Session, konusma: models.Conversation, mesajlar: List[dict]) -> None:
+    """Mesajlari ekler, sayaclari gunceller, gerekirse ozeti yuvarlar. Commit cagirana birakilir."""
+    simdi = datetime.datetime.now()
+    for m in mesajlar:
+        db.add(models.ConversationMessage(
+            conversation_id=konusma.id, role=m["role"], content=m["content"], created_at=simdi,
+        ))
+    konusma.message_count = (konusma.message_count or 0) + len(mesajlar)
+    konusma.updated_at = simdi
+    db.flush()
+    _ozeti_yuvarla(db, konusma)
+
+
+def _ozeti_yuvarla(db: Session, konusma: models.Conversation) -> None:
+    acik = _ozetlenmemis(db, konusma)
+    if len(acik) <= CONVERSATION_KEEP_MESSAGES + CONVERSATION_SUMMARY_SLACK:
+        return
+    katlanan = acik[:-CONVERSATION_KEEP_MESSAGES]
+    konusma.summary = chat_context.konu_ozeti(
+        [{"role": m.role, "content": m.content} for m in katlanan], konusma.summary,
+    )
+    konusma.summarized_count = (konusma.summarized_count or 0) + len(katlanan)
+    konusma.summarized_upto_id = katlanan[-1].id
+
+
+def mesajlar(db: Session, konusma_id: int, limit: int = 50,
+             once_id: Optional[int] = None) -> List[models.ConversationMessage]:
+    """Konusmanin mesajlari (en yeniden eskiye), once_id ile geriye dogru sayfalanir."""
+    sorgu = db.query(models.ConversationMessage).filter(
+        models.ConversationMessage.conversation_id == konusma_id,
+    )
+    if once_id is not None:
+        sorgu = sorgu.filter(models.ConversationMessage.id < once_id)
+    return sorgu.order_by(models.ConversationMessage.id.desc()).limit(limit).all()
@@ -0,0 +1,63 @@
+"""
+Sulama Karari Onbellegi
+=======================
+check-irrigation sonucu, karari etkileyen girdilerin parmak izi altinda saklanir:
+  - tarlanin son SensorLog kaydi
+  - bitki esikleri (PlantType)
+  - hava tahmini surumu (hava onbelleginin cekilme zamani) + icinde bulunulan saat
+  - ML model surumu (model dosyasinin mtime'i)
+
+Girdilerden biri degisirse parmak izi degisir, eski kayit kullanilmaz. Ayrica
+olay bazli gecersiz kilma yapilir: sensor verisi, yeniden egitim, bitki turu
+guncellemesi ve saatlik hava yenilemesi.
+"""
+
+import datetime
+import hashlib
+import os
+from typing import Any, Dict, Optional
+
+from services.ttl_cache import TTLCache
+
+DECISION_CACHE_TTL = int(os.getenv("DECISION_CACHE_TTL", "3600"))
+DECISION_CACHE_MAX = int(os.getenv("DECISION_CACHE_MAX", "20000"))
+
+_karar_onbellegi = TTLCache("karar", ttl_seconds=DECISION_CACHE_TTL, max_entries=DECISION_CACHE_MAX)
+
+
+def karar_parmak_izi(field, bitki, last_log, hava_surumu: Optional[float], model_surumu: Optional[float]) -> str:
+    parcalar = (
+        field.id, field.ilce, field.latitude, field.longitude,
+        getattr(bitki, "id", None), getattr(bitki, "name", None),
+        getattr(bitki, "critical_moisture", None), getattr(bitki, "min_moisture", None),
+        getattr(bitki, "max_moisture", None), getattr(bitki, "max_wait_hours", None),
+        last_log.id, last_log.timestamp.isoformat() if last_log.timestamp else None,
+        last_log.moisture, last_log.temperature,
+        hava_surumu,
+        # Saatlik tahmin listesi ve 1/3/6 saat bayraklari "simdi"ye gore hesaplanir
+        datetime.datetime.now().strftime("%Y%m%d%H"),
+        model_surumu,
+    )
+    return hashlib.sha1(repr(parcalar).encode()).hexdigest()
+
+
+def onbellekten_al(field_id: int, parmak_izi: str) -> Optional[dict]:
+    kayit = _karar_onbellegi.get(field_id, gecerli_mi=lambda v: v[0] == parmak_izi)
+    return kayit[1] if kayit else None
+
+
+def onbellege_yaz(field_id: int, parmak_izi: str, sonuc: dict) -> None:
+    # Tarla basina tek kayit: yeni parmak izi eskisinin yerine gecer
+    _karar_onbellegi.set(field_id, (parmak_izi, sonuc))
+
+
+def tarla_gecersiz_kil(field_id: int) -> None:
+    _karar_onbellegi.invalidate(field_id)
+
+
+def tumunu_gecersiz_kil() -> None:
+    _karar_onbellegi.clear()
+
+
+def istatistik() -> Dict[str, Any]:
+    return _karar_onbellegi.stats()
@@ -0,0 +1,272 @@
+"""
+Sulama Karar Motoru
+===================
+check-irrigation endpoint'indeki karar mantiginin saf (DB / HTTP / ML'den bagimsiz) hali.
+
+Girdiler: anlik nem, bitki esikleri (kritik / min / max), 1-3-6 saatlik yagis
+bayraklari ve ML dogrulama karari. Kurallar KURALLAR tablosunda ONCELIK SIRASIYLA
+tanimlidir; ilk eslesen kural karari verir.
+
+  - karar_ver()        : tek tarla, Turkce karar sozlugunu uretir
+  - kural_sec_toplu()  : binlerce tarla icin tek cagrida NumPy ile kural indeksi
+  - karar_metni()      : kural indeksinden Turkce karar sozlugu
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Union
+
+import numpy as np
+
+# ============================================================
+# 1. KODLU DEGERLER (karar gunlugu ve vektorel form icin)
+# ============================================================
+
+POMPA_KODLARI = {"KAPALI": 0, "YARIM_DOZ": 1, "MİNİMUM_DOZ": 2, "AÇIK": 3}
+ACILIYET_KODLARI = {"YOK": 0, "DÜŞÜK": 1, "ORTA": 2, "YÜKSEK": 3, "ÇOK YÜKSEK": 4}
+ML_KARAR_KODLARI = {"": 0, "NORMAL_SULAMA": 1, "GUVEN_BEKLE": 2, "GUVENME_SULA": 3, "DIKKAT_SURPRIZ": 4}
+
+POMPA_ADLARI = {v: k for k, v in POMPA_KODLARI.items()}
+ACILIYET_ADLARI = {v: k for k, v in ACILIYET_KODLARI.items()}
+ML_KARAR_ADLARI = {v: k for k, v in ML_KARAR_KODLARI.items()}
+
+ML_GUVEN = ML_KARAR_KODLARI["GUVEN_BEKLE"]
+ML_GUVENME = ML_KARAR_KODLARI["GUVENME_SULA"]
+
+
+class _Girdi:
+    """Kural kosullarinin okudugu alanlar. Skaler veya NumPy dizisi olabilir."""
+
+    def __init__(self, nem, kritik, min_nem, max_nem, yagis_1, yagis_3, yagis_6, ml):
+        self.nem = nem
+        self.kritik = kritik
+        self.min_nem = min_nem
+        self.max_nem = max_nem
+        self.y1 = yagis_1
+        self.y3 = yagis_3
+        self.y6 = yagis_6
+        self.yagmur = yagis_1 | yagis_3 | yagis_6
+        self.ml = ml
+        self.kritik_alti = nem < kritik
+        self.dusuk = nem < min_nem
+        self.guven = self.yagmur & (ml == ML_GUVEN)
+        self.guvenme = self.yagmur & (ml == ML_GUVENME)
+
+
+# ============================================================
+# 2. KURAL TABLOSU
+# ============================================================
+
+@dataclass(frozen=True)
+class Kural:
+    kod: str
+    kosul: Callable[[_Girdi], Any]
+    durum: str
+    aksiyon: str
+    aciliyet: str
+    pompa: str
+    detay: str
+    savunmaci: bool = False  # ML override -> SAVUNMACI strateji
+    hedef_min: bool = False  # karar["sulama_hedef_nem"] = min_nem
+
+
+KURALLAR = [
+    # SENARYO 1: KRITIK NEM
+    Kural(
+        "KRITIK_SAVUNMACI",
+        lambda g: g.kritik_alti & g.guvenme,
+        "KRİTİK_SAVUNMACI", "Minimum seviyeye sulama yapılıyor", "YÜKSEK", "MİNİMUM_DOZ",
+        "Toprak nemi %{nem} kritik! Hava tahmini yağmur diyor ama "
+        "ML modeline göre bu tarlaya geçmişte yağmur gelmemiş. "
+        "Bitki korunması için sadece minimum seviyeye (%{min_nem}) sulanıyor. "
+        "Yağmur gelirse fazla su harcanmamış olur.",
+        savunmaci=True, hedef_min=True,
+    ),
+    Kural(
+        "KRITIK",
+        lambda g: g.kritik_alti,
+        "KRİTİK", "ACİL SULAMA BAŞLATILDI", "ÇOK YÜKSEK", "AÇIK",
+        "Toprak nemi %{nem} ile kritik sınırın (%{kritik}) altında! "
+        "Yağmur beklense bile bitki zarar görebilir, acil sulama yapılıyor.",
+    ),
+    # SENARYO 2a: DUSUK NEM + ML tahmine guvenmiyor -> savunmaci mod
+    Kural(
+        "SAVUNMACI_SULAMA",
+        lambda g: g.dusuk & g.guvenme & (g.nem <= g.kritik + 3),
+        "SAVUNMACI_SULAMA", "Minimum seviyeye sulama yapılıyor", "YÜKSEK", "MİNİMUM_DOZ",
+        "Toprak nemi %{nem} kritik sınıra (%{kritik}) çok yakın! "
+        "Hava tahmini yağmur diyor ama ML bu tarlaya güvenmiyor. "
+        "Bitki korunması için minimum seviyeye (%{min_nem}) sulanıyor, sonra durulacak. "
+        "Yağmur gelirse kurtuluruz, gelmezse tekrar sulanır.",
+        savunmaci=True, hedef_min=True,
+    ),
+    Kural(
+        "SAVUNMACI_BEKLEME",
+        lambda g: g.dusuk & g.guvenme,
+        "SAVUNMACI_BEKLEME", "Bekleniyor - kritik düşerse minimum sulanacak", "ORTA", "KAPALI",
+        "Toprak kuru (%{nem}) ve yağmur tahmini var ama ML güvenmiyor. "
+        "Nem henüz kritik seviyeye (%{kritik}) düşmedi. Bekleniyor. "
+        "Kritik sınıra düşerse sadece minimum seviyeye (%{min_nem}) sulanacak.",
+        savunmaci=True,
+    ),
+    # SENARYO 2b: DUSUK NEM + ML tahmini onayliyor -> erteleme
+    Kural(
+        "ERTELE_1S_ML",
+        lambda g: g.dusuk & g.guven & g.y1,
+        "SULAMA ERTELENDİ", "1 saat bekle, yağmur geliyor (ML onaylı)", "DÜŞÜK", "KAPALI",
+        "Toprak kuru (%{nem}) ama 1 saat içinde yağış bekleniyor. "
+        "ML modeli de bu tarlada yağmurun gerçekleşeceğini doğruluyor. "
+        "Doğal sulama için bekleniyor.",
+    ),
+    Kural(
+        "ERTELE_3S_ML",
+        lambda g: g.dusuk & g.guven & g.y3 & (g.nem > g.kritik + 5),
+        "SULAMA ERTELENDİ", "{ilk_yagis_saat} saat sonra yağmur (ML onaylı)", "ORTA", "KAPALI",
+        "Toprak kuru (%{nem}) ama {ilk_yagis_saat} saat içinde yağış var. "
+        "ML modeli bu tarlada yağmurun güvenilir olduğunu doğruluyor.",
+    ),
+    Kural(
+        "KISMI_ML",
+        lambda g: g.dusuk & g.guven & g.y6 & (g.nem > g.kritik + 10),
+        "KISMI SULAMA ÖNERİLİR", "Hafif sulama, {ilk_yagis_saat} saat sonra yağmur (ML onaylı)", "ORTA", "YARIM_DOZ",
+        "Toprak kuru (%{nem}), yağmur {ilk_yagis_saat} saat sonra. "
+        "ML tahmine güveniyor, yarım doz sulama ile yağmura bırakılabilir.",
+    ),
+    Kural(
+        "SULAMA_GEREKLI_ML",
+        lambda g: g.dusuk & g.guven,
+        "SULAMA GEREKLİ", "Tam sulama başlatılıyor", "YÜKSEK", "AÇIK",
+        "Toprak kuru (%{nem}) ve yağmur beklenmiyor. "
+        "Sulama pompası çalıştırılıyor.",
+    ),
+    # SENARYO 2c: DUSUK NEM + ML yok / yagmur yok -> klasik mantik
+    Kural(
+        "ERTELE_1S",
+        lambda g: g.dusuk & g.y1,
+        "SULAMA ERTELENDİ", "1 saat bekle, yağmur geliyor", "DÜŞÜK", "KAPALI",
+        "Toprak kuru (%{nem}) ama 1 saat içinde yağış bekleniyor. "
+        "Doğal sulama için bekleniyor, su tasarrufu sağlanıyor.",
+    ),
+    Kural(
+        "ERTELE_3S",
+        lambda g: g.dusuk & g.y3 & (g.nem > g.kritik + 5),
+        "SULAMA ERTELENDİ", "{ilk_yagis_saat} saat sonra yağmur bekleniyor", "ORTA", "KAPALI",
+        "Toprak kuru (%{nem}) ama {ilk_yagis_saat} saat içinde yağış var. "
+        "Bitki bu süre dayanabilir, yağmur beklenecek.",
+    ),
+    Kural(
+        "KISMI",
+        lambda g: g.dusuk & g.y6 & (g.nem > g.kritik + 10),
+        "KISMI SULAMA ÖNERİLİR", "Hafif sulama yap, {ilk_yagis_saat} saat sonra yağmur var", "ORTA", "YARIM_DOZ",
+        "Toprak kuru (%{nem}), yağmur {ilk_yagis_saat} saat sonra. "
+        "Yarım doz sulama yapılıp yağmura bırakılabilir.",
+    ),
+    Kural(
+        "SULAMA_GEREKLI",
+        lambda g: g.dusuk,
+        "SULAMA GEREKLİ", "Tam sulama başlatılıyor", "YÜKSEK", "AÇIK",
+        "Toprak kuru (%{nem}) ve önümüzdeki {max_bekleme} saat yağış beklenmiyor. "
+        "Sulama pompası çalıştırılıyor.",
+    ),
+    # SENARYO 3: ASIRI NEM
+    Kural(
+        "ASIRI_ISLAK",
+        lambda g: g.nem > g.max_nem,
+        "AŞIRI ISLAK", "Sulama durduruldu", "YOK", "KAPALI",
+        "Toprak nemi %{nem} ile üst sınırın (%{max_nem}) üzerinde. "
+        "Aşırı sulama kök çürümesine neden olabilir!",
+    ),
+    # SENARYO 4: IDEAL NEM (her zaman eslesir)
+    Kural(
+        "IDEAL",
+        lambda g: True,
+        "İDEAL", "Sulama gerekmiyor", "YOK", "KAPALI",
+        "Toprak nemi %{nem} ideal aralıkta (%{min_nem}-%{max_nem}).",
+    ),
+]
+
+KURAL_INDEKSI = {k.kod: i for i, k in enumerate(KURALLAR)}
+# Kural indeksi -> kodlu pompa / aciliyet (vektorel sonuclar icin)
+KURAL_POMPA_KODU = np.array([POMPA_KODLARI[k.pompa] for k in KURALLAR], dtype=np.int8)
+KURAL_ACILIYET_KODU = np.array([ACILIYET_KODLARI[k.aciliyet] for k in KURALLAR], dtype=np.int8)
+
+
+def ml_karar_kodu(ml_karari: Optional[str]) -> int:
+    return ML_KARAR_KODLARI.get(ml_karari or "", 0)
+
+
+# ============================================================
+# 3. TEK TARLA
+# ============================================================
+
+def kural_sec(nem: float, kritik: float, min_nem: float, max_nem: float,
+              yagis_1: bool, yagis_3: bool, yagis_6: bool, ml_karari: Union[str, int] = "") -> int:
+    """Ilk eslesen kuralin indeksini dondurur."""
+    ml = ml_karari if isinstance(ml_karari, int) else ml_karar_kodu(ml_karari)
+    g = _Girdi(nem, kritik, min_nem, max_nem, bool(yagis_1), bool(yagis_3), bool(yagis_6), ml)
+    for i, kural in enumerate(KURALLAR):
+        if kural.kosul(g):
+            return i
+    return len(KURALLAR) - 1
+
+
+def karar_metni(kural_indeksi: int, nem: float, kritik: float, min_nem: float, max_nem: float,
+                max_bekleme: int = 6, ilk_yagis_saat: Any = "?") -> Dict[str, Any]:
+    """Kural indeksinden API'nin dondurdugu Turkce karar sozlugunu uretir."""
+    kural = KURALLAR[kural_indeksi]
+    degerler = {
+        "nem": nem, "kritik": kritik, "min_nem": min_nem, "max_nem": max_nem,
+        "max_bekleme": max_bekleme, "ilk_yagis_saat": ilk_yagis_saat,
+    }
+    karar = {
+        "durum": kural.durum,
+        "aksiyon": kural.aksiyon.format(**degerler),
+        "aciliyet": kural.aciliyet,
+        "detay": kural.detay.format(**degerler),
+        "pompa": kural.pompa,
+    }
+    if kural.hedef_min:
+        karar["sulama_hedef_nem"] = min_nem
+    return karar
+
+
+def karar_ver(nem: float, kritik: float, min_nem: float, max_nem: float,
+              yagis_1: bool = False, yagis_3: bool = False, yagis_6: bool = False,
+              ml_karari: str = "", max_bekleme: int = 6, ilk_yagis_saat: Any = "?") -> Dict[str, Any]:
+    """
+    Tek tarla icin karar. Dondurur:
+      kural, karar (Turkce sozluk), ml_override, ml_strateji
+    """
+    idx = kural_sec(nem, kritik, min_nem, max_nem, yagis_1, yagis_3, yagis_6, ml_karari)
+    kural = KURALLAR[idx]
+    return {
+        "kural": kural.kod,
+        "kural_indeksi": idx,
+        "karar": karar_metni(idx, nem, kritik, min_nem, max_nem, max_bekleme, ilk_yagis_saat),
+        "ml_override": kural.savunmaci,
+        "ml_strateji": "SAVUNMACI" if kural.savunmaci else None,
+    }
+
+
+# ============================================================
+# 4. VEKTOREL (binlerce tarla tek cagrida)
+# ============================================================
+
+def kural_sec_toplu(nem, kritik, min_nem, max_nem, yagis_1, yagis_3, yagis_6, ml_kodu) -> np.ndarray:
+    """
+    Tum girdiler ayni uzunlukta dizi (veya yayinlanabilir skaler). ml_kodu
+    ML_KARAR_KODLARI degerleridir. Tarla basina kural indeksi (int8) doner.
+    """
+    nem = np.asarray(nem, dtype=float)
+    g = _Girdi(
+        nem,
+        np.asarray(kritik, dtype=float),
+        np.asarray(min_nem, dtype=float),
+        np.asarray(max_nem, dtype=float),
+        np.asarray(yagis_1, dtype=bool),
+        np.asarray(yagis_3, dtype=bool),
+        np.asarray(yagis_6, dtype=bool),
+        np.asarray(ml_kodu, dtype=np.int8),
+    )
+    kosullar = [np.broadcast_to(np.asarray(k.kosul(g), dtype=bool), nem.shape) for k in KURALLAR[:-1]]
+    return np.select(kosullar, np.arange(len(KURALLAR) - 1, dtype=np.int8),
+                     default=len(KURALLAR) - 1).astype(np.int8)
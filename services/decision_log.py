@@ -0,0 +1,125 @@
+"""
+Sulama Karar Gunlugu
+====================
+Her hesaplanan sulama karari decision_logs tablosuna kodlu olarak eklenir
+(uzun Turkce metinler yerine kural / aciliyet / pompa kodlari + sayisal girdiler).
+
+Yazimlar bellekte tamponlanir; tampon DECISION_LOG_FLUSH_SIZE'a ulasinca ya da
+scheduler'in dakikalik isinde tek bir toplu INSERT ile yazilir.
+Saklama suresi DECISION_LOG_RETENTION_DAYS (varsayilan 30 gun).
+"""
+
+import datetime
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+import models
+from database import SessionLocal
+from services.decision_engine import (
+    ACILIYET_ADLARI, KURALLAR, KURAL_ACILIYET_KODU, KURAL_POMPA_KODU, ML_KARAR_ADLARI, POMPA_ADLARI,
+    ml_karar_kodu,
+)
+
+logger = logging.getLogger("decision_log")
+
+DECISION_LOG_FLUSH_SIZE = int(os.getenv("DECISION_LOG_FLUSH_SIZE", "200"))
+DECISION_LOG_RETENTION_DAYS = int(os.getenv("DECISION_LOG_RETENTION_DAYS", "30"))
+
+_tampon: List[Dict[str, Any]] = []
+_tampon_lock = threading.Lock()
+
+
+def kaydet(field_id: int, kural_indeksi: int, ml_karari: Optional[str], yagis_1: bool, yagis_3: bool,
+           yagis_6: bool, ilk_yagis_saat: Optional[int], moisture: float, temperature: float,
+           sensor_log_id: Optional[int] = None) -> None:
+    """Karari tampona ekler; tampon doluysa toplu yazar."""
+    kayit = {
+        "field_id": field_id,
+        "created_at": datetime.datetime.now(),
+        "kural": kural_indeksi,
+        "aciliyet": int(KURAL_ACILIYET_KODU[kural_indeksi]),
+        "pompa": int(KURAL_POMPA_KODU[kural_indeksi]),
+        "ml_karari": ml_karar_kodu(ml_karari),
+        "yagis_bayraklari": int(bool(yagis_1)) | int(bool(yagis_3)) << 1 | int(bool(yagis_6)) << 2,
+        "ilk_yagis_saat": ilk_yagis_saat if isinstance(ilk_yagis_saat, int) else None,
+        "moisture": moisture,
+        "temperature": temperature,
+        "sensor_log_id": sensor_log_id,
+    }
+    with _tampon_lock:
+        _tampon.append(kayit)
+        dolu = len(_tampon) >= DECISION_LOG_FLUSH_SIZE
+    if dolu:
+        tamponu_bosalt()
+
+
+def tamponu_bosalt() -> int:
+    """Tampondaki kararlari tek transaction'da yazar."""
+    with _tampon_lock:
+        if not _tampon:
+            return 0
+        satirlar = list(_tampon)
+        _tampon.clear()
+
+    db = SessionLocal()
+    try:
+        db.execute(insert(models.DecisionLog), satirlar)
+        db.commit()
+        return len(satirlar)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Karar günlüğü yazılamadı ({len(satirlar)} kayıt): {e}")
+        return 0
+    finally:
+        db.close()
+
+
+def eski_kayitlari_sil(gun: int = DECISION_LOG_RETENTION_DAYS) -> int:
+    """Saklama süresini aşan kararları siler."""
+    sinir = datetime.datetime.now() - datetime.timedelta(days=gun)
+    db = SessionLocal()
+    try:
+        silinen = db.query(models.DecisionLog).filter(models.DecisionLog.created_at < sinir)\
+            .delete(synchronize_session=False)
+        db.commit()
+        return silinen
+    finally:
+        db.close()
+
+
+def kayit_coz(kayit: models.DecisionLog) -> Dict[str, Any]:
+    """Kodlu kaydı okunabilir sözlüğe çevirir."""
+    kural = KURALLAR[kayit.kural] if kayit.kural is not None and kayit.kural < len(KURALLAR) else None
+    bayrak = kayit.yagis_bayraklari or 0
+    return {
+        "id": kayit.id,
+        "zaman": kayit.created_at.isoformat() if kayit.created_at else None,
+        "kural": kural.kod if kural else None,
+        "durum": kural.durum if kural else None,
+        "aciliyet": ACILIYET_ADLARI.get(kayit.aciliyet),
+        "pompa": POMPA_ADLARI.get(kayit.pompa),
+        "ml_karari": ML_KARAR_ADLARI.get(kayit.ml_karari) or None,
+        "yagis_1_saat": bool(bayrak & 1),
+        "yagis_3_saat": bool(bayrak & 2),
+        "yagis_6_saat": bool(bayrak & 4),
+        "ilk_yagis_saat": kayit.ilk_yagis_saat,
+        "nem": kayit.moisture,
+        "sicaklik": kayit.temperature,
+        "sensor_log_id": kayit.sensor_log_id,
+    }
+
+
+def sorgula(db: Session, field_id: int, baslangic: Optional[datetime.datetime] = None,
+            bitis: Optional[datetime.datetime] = None, limit: int = 100) -> List[models.DecisionLog]:
+    """Tarlanın kararlarını zaman aralığında, yeniden eskiye döner (field_id, created_at indeksi)."""
+    sorgu = db.query(models.DecisionLog).filter(models.DecisionLog.field_id == field_id)
+    if baslangic:
+        sorgu = sorgu.filter(models.DecisionLog.created_at >= baslangic)
+    if bitis:
+        sorgu = sorgu.filter(models.DecisionLog.created_at <= bitis)
+    return sorgu.order_by(models.DecisionLog.created_at.desc()).limit(limit).all()
@@ -0,0 +1,92 @@
+"""
+Kullanici Bazli Canli Olay Yayini (SSE)
+=======================================
+Her acik /stream/user/{id} baglantisi bir asyncio.Queue ile abone olur.
+yayinla() her thread'den cagrilabilir (senkron endpoint'ler threadpool'da,
+scheduler kendi thread'inde calisir): olay abonenin event loop'una
+call_soon_threadsafe ile birakilir, cagiran hic beklemez.
+
+Yavas istemci kuyrugu doldurursa en eski olay atilir; sunucu yuku acik sekme
+sayisina degil degisim hizina bagli kalir.
+
+sse_metni() tum SSE endpoint'lerinin (canli akis, chatbot token akisi) ortak cercevesidir.
+"""
+
+import asyncio
+import datetime
+import itertools
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("event_bus")
+
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "100"))
+
+_aboneler: Dict[int, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = defaultdict(list)
+_lock = threading.Lock()
+_sira = itertools.count(1)
+
+
+def abone_ol(user_id: int) -> asyncio.Queue:
+    """Cagiranin event loop'u icinde calistirilmali (SSE generator'i)."""
+    kuyruk = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+    with _lock:
+        _aboneler[user_id].append((asyncio.get_running_loop(), kuyruk))
+    return kuyruk
+
+
+def abonelikten_cik(user_id: int, kuyruk: asyncio.Queue) -> None:
+    with _lock:
+        kalan = [(l, k) for l, k in _aboneler.get(user_id, []) if k is not kuyruk]
+        if kalan:
+            _aboneler[user_id] = kalan
+        else:
+            _aboneler.pop(user_id, None)
+
+
+def _birak(kuyruk: asyncio.Queue, olay: dict) -> None:
+    if kuyruk.full():
+        try:
+            kuyruk.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+    kuyruk.put_nowait(olay)
+
+
+def yayinla(user_id: int, tur: str, veri: Any) -> int:
+    """Olayi kullanicinin tum acik baglantilarina iletir; iletilen baglanti sayisini doner."""
+    if user_id is None:
+        return 0
+    with _lock:
+        hedefler = list(_aboneler.get(user_id, ()))
+    if not hedefler:
+        return 0
+
+    olay = {"id": next(_sira), "tur": tur, "zaman": datetime.datetime.now().isoformat(), "veri": veri}
+    for loop, kuyruk in hedefler:
+        try:
+            loop.call_soon_threadsafe(_birak, kuyruk, olay)
+        except RuntimeError:
+            # Loop kapanmis: baglanti temizligi generator'in finally blogunda yapilir
+            logger.debug(f"Kapali loop'a olay atlanadi (kullanici {user_id})")
+    return len(hedefler)
+
+
+def abone_sayisi() -> Dict[int, int]:
+    with _lock:
+        return {uid: len(v) for uid, v in _aboneler.items()}
+
+
+def _json_varsayilan(deger):
+    return deger.isoformat() if hasattr(deger, "isoformat") else str(deger)
+
+
+def sse_metni(tur: str, veri: Any, olay_id: Optional[int] = None) -> str:
+    """Tek SSE olayi: (id), event ve JSON data satirlari. datetime ISO metne cevrilir."""
+    metin = json.dumps(veri, ensure_ascii=False, default=_json_varsayilan)
+    kimlik = f"id: {olay_id}\n" if olay_id is not None else ""
+    return f"{kimlik}event: {tur}\ndata: {metin}\n\n"
@@ -0,0 +1,40 @@
+"""
+Tarla Karar Girdileri
+=====================
+Sulama karari (irrigation_decision) ve nem projeksiyonu (moisture_simulator)
+ayni girdileri ayni sekilde okur:
+  - son_sensor_loglari : her tarlanin en son SensorLog kaydi (tek sorgu)
+  - hava_anahtari      : tarlanin saatlik tahmin konumu (get_hourly_weather argumanlari)
+"""
+
+from typing import Dict, List
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+import models
+
+
+def hava_anahtari(field) -> tuple:
+    """
+    get_hourly_weather argumanlari: tarlanin ilcesi, yoksa "cankaya".
+    Koordinat gonderilmez; konum_coz ilce verildiginde koordinata bakmadigi icin
+    eski (loopback HTTP) davranisla aynidir.
+    """
+    ilce = getattr(field, 'ilce', None) or "cankaya"
+    return (ilce, None, None)
+
+
+def son_sensor_loglari(db: Session, field_ids: List[int]) -> Dict[int, models.SensorLog]:
+    """Her tarlanin en son SensorLog kaydini tek sorguda doner"""
+    son_zaman = db.query(
+        models.SensorLog.field_id,
+        func.max(models.SensorLog.timestamp).label("ts"),
+    ).filter(models.SensorLog.field_id.in_(field_ids))\
+        .group_by(models.SensorLog.field_id).subquery()
+
+    loglar = db.query(models.SensorLog).join(
+        son_zaman,
+        (models.SensorLog.field_id == son_zaman.c.field_id) & (models.SensorLog.timestamp == son_zaman.c.ts),
+    ).all()
+    return {log.field_id: log for log in loglar}
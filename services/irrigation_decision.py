@@ -0,0 +1,189 @@
+"""
+Sulama Karari Hesabi
+====================
+check-irrigation / check-all-fields kararinin girdileri toplanip karar motoruna
+(decision_engine) verilir ve cevap raporu olusturulur. Karar onbellegi disinda yan
+etkisi yoktur; karar gunlugu, canli akis ve chatbot baglami gecersizlemesi
+routers/simulation.py'de (_karari_isle) kalir. Chatbot baglami karari buradan
+salt okur.
+  - karar_hesapla    : tek tarla (onbellek -> tahmin -> ML -> karar)
+  - hava_ozeti       : saatlik tahmin cevabindan yagis bayraklari
+  - karar_raporu     : karar motoru sonucu + check-irrigation cevabi (saf)
+  - girdi_parmak_izi : karar onbellegi anahtari (son olcum, esikler, tahmin, model)
+"""
+
+import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+import models
+from ml.predictor import model_surumu, predict_rain
+from services import decision_cache, plant_catalog
+from services.decision_engine import karar_ver
+from services.field_inputs import hava_anahtari
+from services.weather import hava_surumu, saatlik_tahmin_olustur
+
+
+# ============================================================
+# 1. GIRDILER
+# ============================================================
+
+def get_hourly_weather(ilce: str = None, lat: float = None, lon: float = None):
+    """Saatlik hava tahminini ceker (scheduler'in doldurdugu onbellekten)"""
+    try:
+        if ilce:
+            return saatlik_tahmin_olustur(ilce=ilce, saat=24)
+        return saatlik_tahmin_olustur(lat=lat, lon=lon, saat=24)
+    except Exception:
+        return None
+
+
+def hava_ozeti(weather_data: dict, ilce: str) -> dict:
+    """Saatlik tahmin cevabindan karar motorunun kullandigi yagis bayraklarini cikarir"""
+    if weather_data and "hata" not in weather_data:
+        return {
+            "konum": weather_data.get("konum", ilce),
+            "yagis_1_saat": weather_data.get("onumuzdeki_1_saat_yagis", False),
+            "yagis_3_saat": weather_data.get("onumuzdeki_3_saat_yagis", False),
+            "yagis_6_saat": weather_data.get("onumuzdeki_6_saat_yagis", False),
+            "ilk_yagis": weather_data.get("ilk_yagis"),
+            "saatlik": weather_data.get("saatlik_tahmin", [])[:12],  # Ilk 12 saat
+        }
+    return {
+        "konum": ilce,
+        "yagis_1_saat": False,
+        "yagis_3_saat": False,
+        "yagis_6_saat": False,
+        "ilk_yagis": None,
+        "saatlik": [],
+    }
+
+
+def _ml_dogrulama(field_id: int, last_log) -> dict:
+    """ML hava tahmini dogrulama (model yoksa bilgilendirme mesaji doner)"""
+    try:
+        return predict_rain(field_id, {
+            "moisture": last_log.moisture,
+            "temperature": last_log.temperature,
+        })
+    except Exception:
+        return {"mesaj": "ML modeli henüz eğitilmedi. POST /prediction/train-all çağırın."}
+
+
+def girdi_parmak_izi(field, bitki, last_log, anahtar: tuple) -> str:
+    return decision_cache.karar_parmak_izi(
+        field, bitki, last_log, hava_surumu(*anahtar), model_surumu(field.id)
+    )
+
+
+# ============================================================
+# 2. KARAR + RAPOR
+# ============================================================
+
+def karar_raporu(field, bitki, last_log, ilce: str, hava: dict, ml_tahmin: dict) -> Tuple[dict, dict]:
+    """
+    Karar motorunu calistirip check-irrigation cevabini olusturur (yan etkisiz).
+    (karar motoru sonucu, cevap) doner.
+    """
+
+    # Kritik sinirlar (varsayilan degerlerle)
+    kritik_nem = getattr(bitki, 'critical_moisture', 10.0) or 10.0
+    min_nem = bitki.min_moisture
+    max_nem = bitki.max_moisture
+    max_bekleme = getattr(bitki, 'max_wait_hours', 6) or 6
+
+    mevcut_nem = last_log.moisture
+    ilk_yagis = hava["ilk_yagis"]
+
+    # ML'den gelen sulama karari
+    ml_sulama_karari = ml_tahmin.get("sulama_karari", "") if isinstance(ml_tahmin, dict) else ""
+
+    # AKILLI KARAR (ML destekli savunmaci sulama - kurallar services/decision_engine.py'de)
+    sonuc = karar_ver(
+        mevcut_nem, kritik_nem, min_nem, max_nem,
+        yagis_1=hava["yagis_1_saat"],
+        yagis_3=hava["yagis_3_saat"],
+        yagis_6=hava["yagis_6_saat"],
+        ml_karari=ml_sulama_karari,
+        max_bekleme=max_bekleme,
+        ilk_yagis_saat=ilk_yagis["kac_saat_sonra"] if ilk_yagis else "?",
+    )
+
+    return sonuc, {
+        "tarla": {
+            "id": field.id,
+            "ad": field.name,
+            "ilce": ilce,
+            "konum_detay": hava["konum"]
+        },
+        "bitki": {
+            "ad": bitki.name,
+            "kritik_nem": kritik_nem,
+            "min_nem": min_nem,
+            "max_nem": max_nem,
+            "max_yagmur_bekleme_saat": max_bekleme
+        },
+        "sensor": {
+            "anlik_nem": mevcut_nem,
+            "olcum_zamani": last_log.timestamp.strftime("%d/%m/%Y %H:%M"),
+            "sicaklik": last_log.temperature
+        },
+        "hava_durumu": {
+            "konum": hava["konum"],
+            "1_saat_icinde_yagis": hava["yagis_1_saat"],
+            "3_saat_icinde_yagis": hava["yagis_3_saat"],
+            "6_saat_icinde_yagis": hava["yagis_6_saat"],
+            "ilk_yagis": ilk_yagis,
+            "onumuzdeki_12_saat": hava["saatlik"]
+        },
+        "karar": sonuc["karar"],
+        "ml_tahmin": ml_tahmin,
+        "ml_override": sonuc["ml_override"],
+        "ml_strateji": sonuc["ml_strateji"],
+        "zaman_damgasi": datetime.datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+    }
+
+
+def karar_hesapla(field_id: int, db: Session, onbellege_yaz: bool = True) -> Tuple[dict, Optional[tuple]]:
+    """
+    check-irrigation kararini hesaplar; karar onbellegi disinda yan etkisi yoktur.
+    (cevap, yeni) doner: yeni, onbellekten gelmeyen kararda _karari_isle argumanlari, aksi halde None.
+    Tarla yoksa LookupError.
+    """
+    # A. Veritabanindan son toprak nemini bul
+    last_log = db.query(models.SensorLog)\
+        .filter(models.SensorLog.field_id == field_id)\
+        .order_by(models.SensorLog.timestamp.desc())\
+        .first()
+
+    if not last_log:
+        return {"mesaj": "Henüz sensör verisi gelmedi, karar verilemiyor."}, None
+
+    # B. Tarla ve Bitki bilgilerini cek
+    field = db.query(models.Field).filter(models.Field.id == field_id).first()
+    if not field:
+        raise LookupError(field_id)
+
+    bitki = plant_catalog.getir(field.plant_type_id)
+
+    # Girdiler (son olcum, esikler, tahmin, model) degismediyse onbellekteki karar
+    anahtar = hava_anahtari(field)
+    parmak_izi = girdi_parmak_izi(field, bitki, last_log, anahtar)
+    onbellekte = decision_cache.onbellekten_al(field_id, parmak_izi)
+    if onbellekte is not None:
+        return onbellekte, None
+
+    # C. SAATLIK HAVA TAHMINI CEK (Ilce bazli!)
+    ilce = anahtar[0]
+    hava = hava_ozeti(get_hourly_weather(*anahtar), ilce)
+
+    # D. ML HAVA TAHMINI DOGRULAMA
+    ml_tahmin = _ml_dogrulama(field_id, last_log)
+
+    # E-F. KARAR + SONUC RAPORU
+    sonuc, rapor = karar_raporu(field, bitki, last_log, ilce, hava, ml_tahmin)
+    if onbellege_yaz:
+        # Tahmin bu istekle onbellege girmis olabilir; parmak izi guncel surumle yazilir
+        decision_cache.onbellege_yaz(field_id, girdi_parmak_izi(field, bitki, last_log, anahtar), rapor)
+    return rapor, (field, last_log, hava, ml_tahmin, sonuc)
@@ -0,0 +1,186 @@
+"""
+Sulama Maliyet / Su Kullanimi Ozetleri
+======================================
+irrigation_logs her olay icin bir satir tutar; panolar ise gunluk/haftalik/aylik
+toplam ister. Toplamlar irrigation_daily_stats tablosunda (tarla, gun) basina tek
+satir olarak artimli tutulur:
+  - Yeni sulama kayitlari yazilirken loglari_isle() ayni transaction'da
+    INSERT ... ON CONFLICT DO UPDATE SET x = x + excluded.x calistirir
+  - Haftalik/aylik ozetler gunluk satirlardan SQL GROUP BY ile cikarilir
+    (tarla basina yilda en fazla 365 satir - ham log sayisindan bagimsiz)
+  - olaylari_kaydet() kontrolcuden gelen pompa calismalarini litre/maliyetiyle
+    birlikte tek transaction'da hem irrigation_logs'a hem ozete yazar
+  - yeniden_olustur() tabloyu ham loglardan bastan hesaplar (seed / onarim)
+"""
+
+import datetime
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+import models
+from database import bulk_insert, bulk_upsert
+
+METRIKLER = ["water_amount_liters", "cost_total", "duration_minutes", "event_count"]
+
+# SQLite tarih ifadeleri: haftalar pazartesi baslar
+PERIYOTLAR = {
+    "gunluk": lambda kolon: func.date(kolon),
+    "haftalik": lambda kolon: func.date(kolon, "-6 days", "weekday 1"),
+    "aylik": lambda kolon: func.strftime("%Y-%m", kolon),
+}
+
+
+def sulama_miktari(pompa_debisi, dakika):
+    """Calisma suresinden litre; pump_flow_rate saatlik litre (numpy dizileriyle de calisir)"""
+    return pompa_debisi * dakika / 60
+
+
+def sulama_maliyeti(litre, su_fiyati):
+    """Litreden TL maliyet; water_unit_price m3 (1000 L) basina"""
+    return litre * su_fiyati / 1000
+
+
+def _gun(zaman) -> datetime.date:
+    return zaman.date() if isinstance(zaman, datetime.datetime) else zaman
+
+
+def loglari_isle(db: Session, loglar: Iterable[dict]) -> int:
+    """
+    Yeni sulama olaylarini (field_id, start_time, duration_minutes,
+    water_amount_liters, cost_total) gunluk toplamlara ekler. Commit cagirana birakilir.
+    """
+    toplamlar: Dict[tuple, List[float]] = defaultdict(lambda: [0.0, 0.0, 0.0, 0])
+    for log in loglar:
+        t = toplamlar[(log["field_id"], _gun(log["start_time"]))]
+        t[0] += log.get("water_amount_liters") or 0.0
+        t[1] += log.get("cost_total") or 0.0
+        t[2] += log.get("duration_minutes") or 0.0
+        t[3] += 1
+    if not toplamlar:
+        return 0
+
+    field_ids = {fid for fid, _ in toplamlar}
+    sahipler = dict(db.query(models.Field.id, models.Field.owner_id).filter(models.Field.id.in_(field_ids)).all())
+    rows = [
+        {"field_id": fid, "user_id": sahipler.get(fid), "day": gun, **dict(zip(METRIKLER, degerler))}
+        for (fid, gun), degerler in toplamlar.items()
+    ]
+    return bulk_upsert(
+        db, models.IrrigationDailyStat, rows, conflict_cols=["field_id", "day"],
+        update_cols=METRIKLER, increment_cols=METRIKLER,
+    )
+
+
+def olaylari_kaydet(db: Session, olaylar: List[dict]) -> List[dict]:
+    """
+    Pompa calisma olaylarini (field_id, start_time, duration_minutes) toplu kaydeder.
+    Litre ve maliyet tarlanin pump_flow_rate / water_unit_price degerlerinden vektorel
+    hesaplanir; loglar ve gunluk ozetler tek commit ile yazilir.
+    Bilinmeyen tarla varsa KeyError (eksik id'lerle) firlatir, hicbir sey yazilmaz.
+    """
+    field_ids = {o["field_id"] for o in olaylar}
+    tarlalar = {
+        fid: (debi, fiyat)
+        for fid, debi, fiyat in db.query(
+            models.Field.id, models.Field.pump_flow_rate, models.Field.water_unit_price,
+        ).filter(models.Field.id.in_(field_ids))
+    }
+    eksik = field_ids - tarlalar.keys()
+    if eksik:
+        raise KeyError(sorted(eksik))
+
+    debi = np.array([tarlalar[o["field_id"]][0] or 0.0 for o in olaylar], dtype=float)
+    fiyat = np.array([tarlalar[o["field_id"]][1] or 0.0 for o in olaylar], dtype=float)
+    dakika = np.array([o["duration_minutes"] for o in olaylar], dtype=float)
+    litre = np.round(sulama_miktari(debi, dakika), 1)
+    maliyet = np.round(sulama_maliyeti(litre, fiyat), 2)
+
+    simdi = datetime.datetime.now()
+    rows = [
+        {
+            "field_id": o["field_id"],
+            "start_time": o.get("start_time") or simdi,
+            "duration_minutes": round(float(d), 1),
+            "water_amount_liters": float(l),
+            "cost_total": float(m),
+        }
+        for o, d, l, m in zip(olaylar, dakika, litre, maliyet)
+    ]
+    try:
+        bulk_insert(db, models.IrrigationLog, rows)
+        loglari_isle(db, rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return rows
+
+
+def yeniden_olustur(db: Session, field_ids: Optional[List[int]] = None, commit: bool = True) -> int:
+    """Gunluk toplamlari irrigation_logs'tan bastan hesaplar (commit=False ise commit cagirana birakilir)."""
+    log = models.IrrigationLog
+    sorgu = db.query(
+        log.field_id, models.Field.owner_id, func.date(log.start_time),
+        func.sum(log.water_amount_liters), func.sum(log.cost_total),
+        func.sum(log.duration_minutes), func.count(log.id),
+    ).join(models.Field, models.Field.id == log.field_id)
+    silme = db.query(models.IrrigationDailyStat)
+    if field_ids is not None:
+        sorgu = sorgu.filter(log.field_id.in_(field_ids))
+        silme = silme.filter(models.IrrigationDailyStat.field_id.in_(field_ids))
+
+    rows = [
+        {
+            "field_id": fid, "user_id": uid, "day": datetime.date.fromisoformat(gun),
+            "water_amount_liters": litre or 0.0, "cost_total": maliyet or 0.0,
+            "duration_minutes": dakika or 0.0, "event_count": adet,
+        }
+        for fid, uid, gun, litre, maliyet, dakika, adet in sorgu.group_by(log.field_id, func.date(log.start_time))
+    ]
+    silme.delete(synchronize_session=False)
+    bulk_upsert(db, models.IrrigationDailyStat, rows, conflict_cols=["field_id", "day"])
+    if commit:
+        db.commit()
+    return len(rows)
+
+
+def ozet(db: Session, periyot: str = "gunluk", field_id: Optional[int] = None, user_id: Optional[int] = None,
+         baslangic: Optional[datetime.date] = None, bitis: Optional[datetime.date] = None,
+         tarla_bazinda: bool = False) -> List[dict]:
+    """Gunluk satirlardan periyot (gunluk/haftalik/aylik) bazinda toplamlar."""
+    stat = models.IrrigationDailyStat
+    donem = PERIYOTLAR[periyot](stat.day).label("donem")
+    gruplar = [donem] + ([stat.field_id] if tarla_bazinda else [])
+
+    sorgu = db.query(
+        *gruplar,
+        func.sum(stat.water_amount_liters), func.sum(stat.cost_total),
+        func.sum(stat.duration_minutes), func.sum(stat.event_count),
+    )
+    if field_id is not None:
+        sorgu = sorgu.filter(stat.field_id == field_id)
+    if user_id is not None:
+        sorgu = sorgu.filter(stat.user_id == user_id)
+    if baslangic is not None:
+        sorgu = sorgu.filter(stat.day >= baslangic)
+    if bitis is not None:
+        sorgu = sorgu.filter(stat.day <= bitis)
+
+    sonuc = []
+    for satir in sorgu.group_by(*gruplar).order_by(*gruplar):
+        kayit = {"donem": satir[0]}
+        if tarla_bazinda:
+            kayit["tarla_id"] = satir[1]
+        litre, maliyet, dakika, adet = satir[-4:]
+        kayit.update({
+            "su_litre": round(litre or 0.0, 1),
+            "maliyet_tl": round(maliyet or 0.0, 2),
+            "calisma_dakika": round(dakika or 0.0, 1),
+            "sulama_sayisi": int(adet or 0),
+        })
+        sonuc.append(kayit)
+    return sonuc
@@ -0,0 +1,223 @@
+"""
+LLM Saglayicilari
+=================
+routers/chatbot.py LLM'e dogrudan gitmez, buradaki saglayici arayuzunu kullanir:
+
+  - GroqProvider    : Groq API. Istemci uygulama acilisinda bir kez olusturulur,
+                      HTTP baglanti havuzu tum mesajlarda yeniden kullanilir
+  - StubLLMProvider : Ag gerektirmeyen, deterministik cevap ureten saglayici
+                      (yerel benchmark, yuk testi ve CI icin; gecikme enjeksiyonlu)
+
+Secim LLM_PROVIDER ortam degiskeni ile yapilir: "groq" (varsayilan) veya "stub".
+
+Ortak ayarlar:
+  LLM_MODEL        model adi (varsayilan llama-3.3-70b-versatile)
+  LLM_TEMPERATURE  / LLM_MAX_TOKENS / LLM_TOP_P
+Groq ayarlari:
+  GROQ_API_KEY, LLM_BASE_URL (yerel mock sunucu), LLM_TIMEOUT (sn), LLM_MAX_RETRIES
+Stub ayarlari:
+  LLM_STUB_LATENCY_MS      ilk token'dan onceki yapay gecikme
+  LLM_STUB_TOKEN_DELAY_MS  token'lar arasi yapay gecikme
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Iterator, List, Optional
+
+LLM_MODEL = os.getenv("LLM_MODEL", "llama-3.3-70b-versatile")
+LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.7"))
+LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "1024"))
+LLM_TOP_P = float(os.getenv("LLM_TOP_P", "0.9"))
+
+
+class LLMProviderError(Exception):
+    """Saglayici cevap uretemediginde (yapilandirma, ag, upstream hatasi) firlatilir."""
+
+
+class LLMProvider(ABC):
+    """Saglayici arayuzu. messages OpenAI/Groq bicimindedir: [{"role", "content"}, ...]"""
+
+    ad = "base"
+    model = LLM_MODEL
+
+    def isit(self) -> None:
+        """Uygulama acilisinda baglanti/istemci hazirligi (varsayilan: yok)."""
+
+    @abstractmethod
+    def complete(self, messages: List[dict]) -> str:
+        """Cevabin tamami."""
+
+    @abstractmethod
+    def stream(self, messages: List[dict]) -> Iterator[str]:
+        """Cevap parcalari. Uretec kapatilinca (close) upstream akis da kapatilmali."""
+
+
+# ============================================================
+# 1. GROQ
+# ============================================================
+
+class GroqProvider(LLMProvider):
+    ad = "groq"
+
+    def __init__(self, api_key: Optional[str], model: str = LLM_MODEL, base_url: Optional[str] = None,
+                 timeout: float = 30.0, max_retries: int = 2):
+        self.model = model
+        self._api_key = api_key
+        self._base_url = base_url
+        self._timeout = timeout
+        self._max_retries = max_retries
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _istemci(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    if not self._api_key:
+                        raise LLMProviderError("GROQ_API_KEY tanımlı değil!")
+                    try:
+                        from groq import Groq
+                    except ImportError as e:
+                        raise LLMProviderError("groq paketi kurulu değil") from e
+
+                    ayarlar = {"api_key": self._api_key, "timeout": self._timeout, "max_retries": self._max_retries}
+                    if self._base_url:
+                        ayarlar["base_url"] = self._base_url
+                    self._client = Groq(**ayarlar)
+        return self._client
+
+    def _istek(self, messages: List[dict], **ek):
+        return self._istemci().chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=LLM_TEMPERATURE,
+            max_tokens=LLM_MAX_TOKENS,
+            top_p=LLM_TOP_P,
+            **ek,
+        )
+
+    def isit(self) -> None:
+        """Acilista istemciyi (ve baglanti havuzunu) olusturur; anahtar yoksa sessiz gecer."""
+        try:
+            self._istemci()
+        except LLMProviderError:
+            pass
+
+    def complete(self, messages: List[dict]) -> str:
+        try:
+            return self._istek(messages).choices[0].message.content
+        except LLMProviderError:
+            raise
+        except Exception as e:
+            raise LLMProviderError(str(e)) from e
+
+    def stream(self, messages: List[dict]) -> Iterator[str]:
+        try:
+            akis = self._istek(messages, stream=True)
+        except LLMProviderError:
+            raise
+        except Exception as e:
+            raise LLMProviderError(str(e)) from e
+        try:
+            for chunk in akis:
+                icerik = chunk.choices[0].delta.content if chunk.choices else None
+                if icerik:
+                    yield icerik
+        finally:
+            kapat = getattr(akis, "close", None)
+            if kapat:
+                kapat()
+
+
+# ============================================================
+# 2. STUB (OFFLINE, DETERMINISTIK)
+# ============================================================
+
+class StubLLMProvider(LLMProvider):
+    """
+    Sistem mesajindaki baglamdan birkac satir secip sabit sablonla cevap verir.
+    Ayni mesajlar = ayni cevap; ag ve API anahtari gerekmez.
+    """
+
+    ad = "stub"
+    model = "stub"
+
+    KALIPLAR = [
+        "🌱 {soru} sorunuz için tarlanızın güncel verilerine baktım.",
+        "💧 {soru} — mevcut sensör ve hava verilerine göre değerlendirdim.",
+        "📊 {soru} için sistemdeki son verileri özetliyorum.",
+    ]
+
+    def __init__(self, latency_ms: float = 0.0, token_delay_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self.token_delay_ms = token_delay_ms
+
+    def _cevap(self, messages: List[dict]) -> str:
+        sistem = next((m["content"] for m in messages if m["role"] == "system"), "")
+        soru = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+        ozet = hashlib.sha1((sistem + "\x00" + soru).encode("utf-8")).digest()
+
+        satirlar = [self.KALIPLAR[ozet[0] % len(self.KALIPLAR)].format(soru=soru.strip()[:80])]
+        for etiket in ("📊 ANLIK", "Durum", "Aksiyon", "6 saat içinde yağış"):
+            eslesme = re.search(rf"^\s*{re.escape(etiket)}[:\s](.*)$", sistem, re.MULTILINE)
+            if eslesme:
+                satirlar.append(f"- {etiket}: {eslesme.group(1).strip()}")
+        satirlar.append(f"(stub cevap #{ozet[1:4].hex()})")
+        return "\n".join(satirlar)
+
+    def complete(self, messages: List[dict]) -> str:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return self._cevap(messages)
+
+    def stream(self, messages: List[dict]) -> Iterator[str]:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        for parca in re.findall(r"\S+\s*", self._cevap(messages)):
+            if self.token_delay_ms:
+                time.sleep(self.token_delay_ms / 1000)
+            yield parca
+
+
+# ============================================================
+# 3. SECIM
+# ============================================================
+
+_aktif_saglayici: Optional[LLMProvider] = None
+_saglayici_lock = threading.Lock()
+
+
+def _ortamdan_saglayici() -> LLMProvider:
+    tur = os.getenv("LLM_PROVIDER", "groq").lower()
+    if tur == "stub":
+        return StubLLMProvider(
+            latency_ms=float(os.getenv("LLM_STUB_LATENCY_MS", "0")),
+            token_delay_ms=float(os.getenv("LLM_STUB_TOKEN_DELAY_MS", "0")),
+        )
+    return GroqProvider(
+        api_key=os.getenv("GROQ_API_KEY"),
+        model=LLM_MODEL,
+        base_url=os.getenv("LLM_BASE_URL") or None,
+        timeout=float(os.getenv("LLM_TIMEOUT", "30")),
+        max_retries=int(os.getenv("LLM_MAX_RETRIES", "2")),
+    )
+
+
+def get_llm_provider() -> LLMProvider:
+    global _aktif_saglayici
+    if _aktif_saglayici is None:
+        with _saglayici_lock:
+            if _aktif_saglayici is None:
+                _aktif_saglayici = _ortamdan_saglayici()
+    return _aktif_saglayici
+
+
+def set_llm_provider(saglayici: LLMProvider) -> None:
+    """Testlerde / benchmark'ta saglayiciyi degistirmek icin."""
+    global _aktif_saglayici
+    with _saglayici_lock:
+        _aktif_saglayici = saglayici
@@ -0,0 +1,173 @@
+"""
+Toprak Nemi Ileri Simulasyonu (What-If)
+=======================================
+Tum tarlalar icin onumuzdeki 24-72 saatin nem seyrini tek seferde NumPy ile hesaplar.
+
+Saatlik su dengesi (tarla i, saat t):
+    nem[t+1] = nem[t]
+               - kuruma_i * max(0.2, 1 + SICAKLIK_KATSAYISI * (T[t] - 20))   (buharlasma)
+               + yagis_mm[t] * YAGIS_NEM_KATSAYISI                           (yagmur)
+               + pompa[t] * debi_i / 100 * POMPA_NEM_KATSAYISI               (sulama)
+    0 <= nem <= 100
+
+debi_i: pump_flow_rate, L/saat (seed_db.add_irrigation ile ayni: 1 saat calisma = debi litre)
+kuruma_i: tarlanin SensorLog gecmisinden (yagmursuz ardisik olcumlerdeki nem dususu)
+saatlik medyan kuruma hizi. Veri yoksa VARSAYILAN_KURUMA kullanilir.
+"""
+
+import datetime
+import os
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+import models
+from services import plant_catalog
+from services.field_inputs import hava_anahtari, son_sensor_loglari
+from services.weather import konum_coz, saatlik_ham_veri_toplu, saatlik_kolonlar
+
+VARSAYILAN_KURUMA = float(os.getenv("SIM_VARSAYILAN_KURUMA", "0.4"))  # %/saat
+SICAKLIK_KATSAYISI = float(os.getenv("SIM_SICAKLIK_KATSAYISI", "0.04"))  # 1/°C
+YAGIS_NEM_KATSAYISI = float(os.getenv("SIM_YAGIS_NEM_KATSAYISI", "1.5"))  # % / mm
+POMPA_NEM_KATSAYISI = float(os.getenv("SIM_POMPA_NEM_KATSAYISI", "10.0"))  # % / 100 L
+KURUMA_GECMIS_GUN = int(os.getenv("SIM_KURUMA_GECMIS_GUN", "21"))
+VARSAYILAN_SICAKLIK = 20.0
+
+
+# ============================================================
+# 1. KURUMA HIZI TAHMINI
+# ============================================================
+
+def kuruma_hizlari(db: Session, field_ids: List[int]) -> Dict[int, float]:
+    """SensorLog gecmisinden tarla basina saatlik kuruma hizi (% / saat)."""
+    if not field_ids:
+        return {}
+    # Pencere her tarlanin kendi son olcumune gore: veri akisi durmus tarla da kendi gecmisini kullanir
+    son_zaman = db.query(
+        models.SensorLog.field_id,
+        func.max(models.SensorLog.timestamp).label("ts"),
+    ).filter(models.SensorLog.field_id.in_(field_ids))\
+        .group_by(models.SensorLog.field_id).subquery()
+    rows = db.query(
+        models.SensorLog.field_id, models.SensorLog.timestamp,
+        models.SensorLog.moisture, models.SensorLog.is_raining,
+    ).join(son_zaman, models.SensorLog.field_id == son_zaman.c.field_id).filter(
+        models.SensorLog.timestamp >= func.datetime(son_zaman.c.ts, f"-{KURUMA_GECMIS_GUN} days"),
+    ).all()
+
+    hizlar = {fid: VARSAYILAN_KURUMA for fid in field_ids}
+    if not rows:
+        return hizlar
+
+    df = pd.DataFrame(rows, columns=["field_id", "timestamp", "moisture", "is_raining"])
+    df = df.sort_values(["field_id", "timestamp"])
+    g = df.groupby("field_id")
+    df["dm"] = g["moisture"].diff()
+    df["dh"] = g["timestamp"].diff().dt.total_seconds() / 3600.0
+    df["onceki_yagmur"] = g["is_raining"].shift(1).fillna(True).astype(bool)
+
+    # Yagmursuz, 1-24 saat arali ve nemin dustugu ardisik olcumler
+    kuru = df[(~df["is_raining"].astype(bool)) & (~df["onceki_yagmur"])
+              & (df["dh"] >= 1) & (df["dh"] <= 24) & (df["dm"] < 0)]
+    if kuru.empty:
+        return hizlar
+
+    medyan = (-kuru["dm"] / kuru["dh"]).groupby(kuru["field_id"]).median().clip(0.05, 3.0)
+    hizlar.update({int(k): float(v) for k, v in medyan.items()})
+    return hizlar
+
+
+# ============================================================
+# 2. SU DENGESI (vektorel)
+# ============================================================
+
+def nem_projeksiyonu(baslangic_nem, kuruma_hizi, yagis_mm, sicaklik, pompa_debisi,
+                     kritik, pompa_plani=None) -> Dict[str, np.ndarray]:
+    """
+    baslangic_nem, kuruma_hizi, pompa_debisi, kritik : (N,)
+    yagis_mm, sicaklik, pompa_plani (0-1 arasi calisma orani) : (N, H)
+
+    Dondurur:
+      nem         : (N, H+1) - 0. sutun baslangic
+      kritik_saat : (N,) nemin ilk kez kritigin altina indigi saat, yoksa -1
+    """
+    nem0 = np.asarray(baslangic_nem, dtype=float)
+    yagis = np.asarray(yagis_mm, dtype=float)
+    sic = np.asarray(sicaklik, dtype=float)
+    n, h = yagis.shape
+
+    buharlasma = np.asarray(kuruma_hizi, dtype=float)[:, None] * np.maximum(
+        0.2, 1 + SICAKLIK_KATSAYISI * (sic - VARSAYILAN_SICAKLIK)
+    )
+    kazanc = yagis * YAGIS_NEM_KATSAYISI
+    if pompa_plani is not None:
+        pompa_saatlik = np.asarray(pompa_debisi, dtype=float) / 100 * POMPA_NEM_KATSAYISI
+        kazanc = kazanc + np.asarray(pompa_plani, dtype=float) * pompa_saatlik[:, None]
+    degisim = kazanc - buharlasma
+
+    # 0-100 kirpmasi yuzunden saat adimlari sirali; her adim N tarla uzerinde vektorel
+    nem = np.empty((n, h + 1))
+    nem[:, 0] = nem0
+    for t in range(h):
+        nem[:, t + 1] = np.clip(nem[:, t] + degisim[:, t], 0.0, 100.0)
+
+    alti = nem[:, 1:] < np.asarray(kritik, dtype=float)[:, None]
+    kritik_saat = np.where(alti.any(axis=1), alti.argmax(axis=1) + 1, -1)
+    return {"nem": nem, "kritik_saat": kritik_saat}
+
+
+# ============================================================
+# 3. DB + HAVA TAHMINI -> GIRDI MATRISLERI
+# ============================================================
+
+def tahmin_matrisleri(konum_anahtarlari: List[tuple], saat: int) -> Dict[tuple, Dict[str, np.ndarray]]:
+    """Her farkli konum icin simdiki saatten baslayan (yagis_mm, sicaklik) dizileri."""
+    koordinatlar = {k: konum_coz(*k) for k in set(konum_anahtarlari)}
+    try:
+        ham = saatlik_ham_veri_toplu([(v[0], v[1]) for v in koordinatlar.values() if v])
+    except Exception:
+        ham = {}
+
+    simdi = np.datetime64(datetime.datetime.now().replace(minute=0, second=0, microsecond=0), "m")
+    sonuc = {}
+    for anahtar, koord in koordinatlar.items():
+        yagis = np.zeros(saat)
+        sicaklik = np.full(saat, VARSAYILAN_SICAKLIK)
+        data = ham.get((round(koord[0], 4), round(koord[1], 4))) if koord else None
+        if data and "hourly" in data:
+            k = saatlik_kolonlar(data["hourly"])
+            secili = np.flatnonzero(~np.isnat(k["zaman"]) & (k["zaman"] >= simdi))[:saat]
+            m = len(secili)
+            yagis[:m] = np.nan_to_num(k["yagis_mm"][secili], nan=0.0)
+            sicaklik[:m] = np.nan_to_num(k["sicaklik"][secili], nan=VARSAYILAN_SICAKLIK)
+        sonuc[anahtar] = {"yagis_mm": yagis, "sicaklik": sicaklik}
+    return sonuc
+
+
+def projeksiyon_girdileri(db: Session, fields: list, saat: int) -> Dict[str, np.ndarray]:
+    """Tarla listesi icin simulasyon girdilerini (N,) / (N, H) dizileri olarak toplar."""
+    field_ids = [f.id for f in fields]
+    son_loglar = son_sensor_loglari(db, field_ids)
+    hizlar = kuruma_hizlari(db, field_ids)
+    anahtarlar = [hava_anahtari(f) for f in fields]
+    tahminler = tahmin_matrisleri(anahtarlar, saat)
+
+    def _esik(f, ad, varsayilan):
+        deger = getattr(plant_catalog.getir(f.plant_type_id), ad, None)
+        return varsayilan if deger is None else deger
+
+    return {
+        "field_ids": np.array(field_ids),
+        "baslangic_nem": np.array([son_loglar[f.id].moisture if f.id in son_loglar else np.nan for f in fields]),
+        "kuruma_hizi": np.array([hizlar[f.id] for f in fields]),
+        "yagis_mm": np.vstack([tahminler[a]["yagis_mm"] for a in anahtarlar]) if fields else np.zeros((0, saat)),
+        "sicaklik": np.vstack([tahminler[a]["sicaklik"] for a in anahtarlar]) if fields else np.zeros((0, saat)),
+        "pompa_debisi": np.array([f.pump_flow_rate or 0.0 for f in fields], dtype=float),
+        "su_fiyati": np.array([f.water_unit_price or 0.0 for f in fields], dtype=float),
+        "kritik": np.array([_esik(f, "critical_moisture", 10.0) for f in fields], dtype=float),
+        "min_nem": np.array([_esik(f, "min_moisture", 30.0) for f in fields], dtype=float),
+        "max_nem": np.array([_esik(f, "max_moisture", 70.0) for f in fields], dtype=float),
+    }
@@ -0,0 +1,140 @@
+"""
+Bildirim Gelen Kutusu
+=====================
+- bildirim_ekle(): bildirimi yazar ve kullanicinin okunmamis sayacini ayni
+  transaction'da artirir (tum bildirim yazanlar bunu kullanmali)
+- Okunmamis sayisi notification_counters tablosundan tek satirla okunur;
+  okundu isaretleme sayaci guncellenen satir sayisi kadar azaltir. Sayaclar uygulama
+  acilisinda sayaclari_yeniden_olustur ile notifications tablosuna esitlenir (sayac
+  tablosundan once yazilmis bildirimler de sayilir)
+- Liste (created_at, id) uzerinde imlec (cursor) ile sayfalanir: OFFSET yok,
+  sayfa maliyeti gelen kutusunun buyuklugunden bagimsiz
+"""
+
+import base64
+import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+import models
+from database import bulk_upsert
+from services import event_bus
+
+
+def _sayac_artir(db: Session, user_id: int, miktar: int) -> None:
+    bulk_upsert(
+        db, models.NotificationCounter, [{"user_id": user_id, "unread_count": miktar}],
+        conflict_cols=["user_id"], increment_cols=["unread_count"],
+    )
+
+
+def bildirim_ekle(db: Session, user_id: int, mesaj: str,
+                  created_at: Optional[datetime.datetime] = None, is_read: bool = False) -> models.Notification:
+    """Bildirimi ekler ve sayaci artirir. Commit ve yayinla() cagirana birakilir."""
+    bildirim = models.Notification(
+        user_id=user_id,
+        message=mesaj,
+        created_at=created_at or datetime.datetime.now(),
+        is_read=is_read,
+    )
+    db.add(bildirim)
+    if not is_read:
+        _sayac_artir(db, user_id, 1)
+    return bildirim
+
+
+def yayinla(bildirimler: List[models.Notification]) -> None:
+    """Commit sonrasi yeni bildirimleri canli akisa iletir."""
+    for b in bildirimler:
+        event_bus.yayinla(b.user_id, "bildirim", {
+            "id": b.id, "message": b.message, "created_at": b.created_at, "is_read": b.is_read,
+        })
+
+
+def okunmamis_sayisi(db: Session, user_id: int) -> int:
+    sayac = db.get(models.NotificationCounter, user_id)
+    if sayac is not None:
+        return sayac.unread_count
+    # Sayaci olmayan kullanici (acilistaki sayaclari_yeniden_olustur'dan sonra eklenmis):
+    # bir kez say ve sakla. Es zamanli ilk istekler ayni satiri eklerse ikincisi atlanir.
+    adet = db.query(func.count(models.Notification.id)).filter(
+        models.Notification.user_id == user_id, models.Notification.is_read.is_(False),
+    ).scalar()
+    bulk_upsert(
+        db, models.NotificationCounter, [{"user_id": user_id, "unread_count": adet}],
+        conflict_cols=["user_id"], update_cols=[],
+    )
+    db.commit()
+    return adet
+
+
+def okundu_isaretle(db: Session, user_id: int, ids: Optional[List[int]] = None) -> int:
+    """ids verilmezse tum okunmamislar. Isaretlenen bildirim sayisini doner."""
+    okunmamis_sayisi(db, user_id)  # sayac yoksa guncellemeden once olustur
+    sorgu = db.query(models.Notification).filter(
+        models.Notification.user_id == user_id, models.Notification.is_read.is_(False),
+    )
+    if ids is not None:
+        sorgu = sorgu.filter(models.Notification.id.in_(ids))
+    adet = sorgu.update({models.Notification.is_read: True}, synchronize_session=False)
+
+    if ids is None:
+        db.query(models.NotificationCounter).filter(models.NotificationCounter.user_id == user_id)\
+            .update({models.NotificationCounter.unread_count: 0}, synchronize_session=False)
+    elif adet:
+        db.query(models.NotificationCounter).filter(models.NotificationCounter.user_id == user_id)\
+            .update({models.NotificationCounter.unread_count: func.max(models.NotificationCounter.unread_count - adet, 0)},
+                    synchronize_session=False)
+    db.commit()
+    return adet
+
+
+def sayaclari_yeniden_olustur(db: Session, commit: bool = True) -> int:
+    """Tum kullanicilarin okunmamis sayaclarini notifications tablosundan hesaplar (commit=False ise commit cagirana birakilir)."""
+    rows = [
+        {"user_id": uid, "unread_count": adet}
+        for uid, adet in db.query(
+            models.User.id,
+            func.count(models.Notification.id).filter(models.Notification.is_read.is_(False)),
+        ).outerjoin(models.Notification, models.Notification.user_id == models.User.id).group_by(models.User.id)
+    ]
+    bulk_upsert(db, models.NotificationCounter, rows, conflict_cols=["user_id"])
+    if commit:
+        db.commit()
+    return len(rows)
+
+
+# ============================================================
+# IMLEC (CURSOR) SAYFALAMA
+# ============================================================
+
+def imlec_olustur(bildirim: models.Notification) -> str:
+    ham = f"{bildirim.created_at.isoformat()}|{bildirim.id}"
+    return base64.urlsafe_b64encode(ham.encode()).decode()
+
+
+def imlec_coz(imlec: str) -> Tuple[datetime.datetime, int]:
+    """Gecersiz imlecte ValueError"""
+    try:
+        zaman, kimlik = base64.urlsafe_b64decode(imlec.encode()).decode().split("|")
+        return datetime.datetime.fromisoformat(zaman), int(kimlik)
+    except Exception as e:
+        raise ValueError("Geçersiz imleç") from e
+
+
+def listele(db: Session, user_id: int, limit: int = 20, imlec: Optional[str] = None,
+            sadece_okunmamis: bool = False) -> Tuple[List[models.Notification], Optional[str]]:
+    """Yeniden eskiye bir sayfa bildirim ve sonraki sayfanin imleci (son sayfada None)."""
+    n = models.Notification
+    sorgu = db.query(n).filter(n.user_id == user_id)
+    if sadece_okunmamis:
+        sorgu = sorgu.filter(n.is_read.is_(False))
+    if imlec:
+        zaman, kimlik = imlec_coz(imlec)
+        sorgu = sorgu.filter(or_(n.created_at < zaman, and_(n.created_at == zaman, n.id < kimlik)))
+
+    kayitlar = sorgu.order_by(n.created_at.desc(), n.id.desc()).limit(limit + 1).all()
+    sonraki = imlec_olustur(kayitlar[limit - 1]) if len(kayitlar) > limit else None
+    return kayitlar[:limit], sonraki
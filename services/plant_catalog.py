@@ -0,0 +1,117 @@
+"""
+Bitki Katalogu (statik referans verisi)
+=======================================
+plant_types tablosu nadiren degisir; uygulama acilisinda bir kez bellege alinir,
+create_plant_type / seed_plant_types sonrasi yenilenir.
+  - Karar motoru, chatbot ve projeksiyon esikleri DB'ye gitmeden buradan okur
+  - tips (JSON string) yuklenirken bir kez ayrisir -> ipuclari
+  - Liste endpoint'i onceden serilestirilmis JSON + ETag ile doner (If-None-Match -> 304)
+"""
+
+import hashlib
+import json
+import threading
+from dataclasses import dataclass, field as dc_field
+from typing import List, Optional, Tuple
+
+import models
+from database import SessionLocal
+
+
+@dataclass(frozen=True)
+class Bitki:
+    """PlantType satirinin degismez kopyasi (ORM nesnesiyle ayni alan adlari)."""
+    id: int
+    name: str
+    min_moisture: float
+    max_moisture: float
+    critical_moisture: Optional[float]
+    max_wait_hours: Optional[int]
+    icon: Optional[str]
+    category: Optional[str]
+    planting_time: Optional[str]
+    harvest_time: Optional[str]
+    water_need: Optional[str]
+    water_amount: Optional[str]
+    soil_type: Optional[str]
+    ideal_temp: Optional[str]
+    tips: Optional[str]
+    ipuclari: Tuple[str, ...] = dc_field(default=(), compare=False)
+
+
+ALANLAR = (
+    "id", "name", "min_moisture", "max_moisture", "critical_moisture", "max_wait_hours",
+    "icon", "category", "planting_time", "harvest_time", "water_need", "water_amount",
+    "soil_type", "ideal_temp", "tips",
+)
+
+_katalog: Optional[dict] = None
+_lock = threading.Lock()
+
+
+def _ipuclari(tips: Optional[str]) -> Tuple[str, ...]:
+    if not tips:
+        return ()
+    try:
+        deger = json.loads(tips)
+    except ValueError:
+        return (tips,)
+    return tuple(str(t) for t in deger) if isinstance(deger, list) else (str(deger),)
+
+
+def _olustur(satirlar: List[models.PlantType]) -> dict:
+    bitkiler = [
+        Bitki(**{ad: getattr(s, ad) for ad in ALANLAR}, ipuclari=_ipuclari(s.tips))
+        for s in sorted(satirlar, key=lambda s: s.id)
+    ]
+    # API cevabi schemas.PlantType alanlariyla ayni (ipuclari haric)
+    liste_json = json.dumps(
+        [{ad: getattr(b, ad) for ad in ALANLAR} for b in bitkiler], ensure_ascii=False,
+    ).encode("utf-8")
+    return {
+        "id": {b.id: b for b in bitkiler},
+        "ad": {b.name: b for b in bitkiler},
+        "liste": bitkiler,
+        "liste_json": liste_json,
+        "etag": '"' + hashlib.sha1(liste_json).hexdigest()[:20] + '"',
+    }
+
+
+def yenile(db=None) -> None:
+    """Katalogu DB'den yeniden yukler (acilista ve bitki ekleme/guncelleme sonrasi)."""
+    global _katalog
+    kendi_oturumu = db is None
+    db = db or SessionLocal()
+    try:
+        yeni = _olustur(db.query(models.PlantType).all())
+    finally:
+        if kendi_oturumu:
+            db.close()
+    with _lock:
+        _katalog = yeni
+
+
+def _al() -> dict:
+    if _katalog is None:
+        yenile()
+    return _katalog
+
+
+def getir(plant_type_id: Optional[int]) -> Optional[Bitki]:
+    if plant_type_id is None:
+        return None
+    return _al()["id"].get(plant_type_id)
+
+
+def ada_gore(ad: str) -> Optional[Bitki]:
+    return _al()["ad"].get(ad)
+
+
+def tumu() -> List[Bitki]:
+    return _al()["liste"]
+
+
+def liste_cevabi() -> Tuple[bytes, str]:
+    """(onceden serilestirilmis JSON, ETag)"""
+    katalog = _al()
+    return katalog["liste_json"], katalog["etag"]
@@ -0,0 +1,103 @@
+"""
+Ortak Su Kaynagi Icin Pompa Planlayici
+======================================
+Ayni kaynaktan beslenen tarlalar icin onumuzdeki saatlerin pompa planini cikarir:
+  - Her tarla hedef nemin (kritik + guvenlik payi) ustunde kalmali
+  - Bir saatte calisan pompalarin toplam debisi kapasiteyi asmamali
+  - Maliyet (litre * su fiyati / 1000 * saatlik tarife carpani) en dusuk olmali
+
+Birimler seed_db.add_irrigation ile ayni: pump_flow_rate saatlik litre,
+water_unit_price 1000 litre (m3) fiyati.
+
+Yontem (son tarih oncelikli acgozlu):
+  1. Mevcut planla tum tarlalari moisture_simulator ile ileri simule et
+  2. Hedefin altina dusen her tarla icin, dusus saatinden once kapasitesi yeten
+     en ucuz saate (esitlikte en gec saate) 1 saatlik pompa ekle
+  3. Ihlal kalmayana ya da PUMP_SCHEDULER_MAX_ITER turuna kadar tekrarla
+
+Her tur tek bir (N, H) simulasyon; toplam is O(tur * N * H) ile sinirli.
+"""
+
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from services.irrigation_stats import sulama_maliyeti, sulama_miktari
+from services.moisture_simulator import nem_projeksiyonu
+
+PUMP_SHARED_CAPACITY = float(os.getenv("PUMP_SHARED_CAPACITY", "300"))  # pump_flow_rate birimiyle
+PUMP_SCHEDULER_MAX_ITER = int(os.getenv("PUMP_SCHEDULER_MAX_ITER", "48"))
+
+
+def pompa_plani_olustur(girdi: Dict[str, np.ndarray], kapasite: Optional[float] = None,
+                        tarife: Optional[np.ndarray] = None, guvenlik_payi: float = 2.0,
+                        max_tur: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    girdi: moisture_simulator.projeksiyon_girdileri ciktisi (sensor verisi olan tarlalar)
+    tarife: (H,) saatlik fiyat carpani; None ise duz tarife
+
+    Dondurur:
+      plan        : (N, H) 0/1 pompa plani
+      nem         : (N, H+1) plana gore nem seyri
+      kullanim    : (H,) saatlik toplam debi
+      cozulemeyen : (N,) bool - kapasite/debi yetmedigi icin hedefin altina dusen tarlalar
+    """
+    kapasite = PUMP_SHARED_CAPACITY if kapasite is None else kapasite
+    max_tur = PUMP_SCHEDULER_MAX_ITER if max_tur is None else max_tur
+
+    n, h = girdi["yagis_mm"].shape
+    debi = girdi["pompa_debisi"]
+    tarife = np.ones(h) if tarife is None else np.asarray(tarife, dtype=float)[:h]
+    hedef = np.minimum(girdi["kritik"] + guvenlik_payi, girdi["max_nem"])
+    # Saat basina pompa maliyeti (tarla x saat)
+    saatlik_maliyet = sulama_maliyeti(sulama_miktari(debi, 60), girdi["su_fiyati"])[:, None] * tarife[None, :]
+    # Esit maliyette en gec saati secmek icin kucuk bir gec-saat indirimi
+    siralama = saatlik_maliyet - np.arange(h)[None, :] * 1e-9
+
+    plan = np.zeros((n, h))
+    kullanim = np.zeros(h)
+    cozulemeyen = np.zeros(n, dtype=bool)
+
+    def _simule():
+        return nem_projeksiyonu(
+            girdi["baslangic_nem"], girdi["kuruma_hizi"], girdi["yagis_mm"],
+            girdi["sicaklik"], debi, hedef, plan,
+        )
+
+    sonuc = _simule()
+    for _ in range(max_tur):
+        ihlal = np.flatnonzero((sonuc["kritik_saat"] >= 0) & ~cozulemeyen)
+        if ihlal.size == 0:
+            break
+        # En yakin son tarihli tarla kapasiteyi once alir
+        for i in ihlal[np.argsort(sonuc["kritik_saat"][ihlal], kind="stable")]:
+            son_saat = int(sonuc["kritik_saat"][i])
+            aday = (
+                (np.arange(h) < son_saat)
+                & (plan[i] == 0)
+                & (kullanim + debi[i] <= kapasite)
+                & (sonuc["nem"][i, :h] < girdi["max_nem"][i])
+            )
+            if debi[i] <= 0 or not aday.any():
+                cozulemeyen[i] = True
+                continue
+            saat = int(np.argmin(np.where(aday, siralama[i], np.inf)))
+            plan[i, saat] = 1.0
+            kullanim[saat] += debi[i]
+        sonuc = _simule()
+
+    # Tur butcesi bittiginde hala ihlal varsa onlar da cozulemeyen sayilir
+    cozulemeyen |= sonuc["kritik_saat"] >= 0
+    return {
+        "plan": plan,
+        "nem": sonuc["nem"],
+        "kullanim": kullanim,
+        "maliyet": (plan * saatlik_maliyet).sum(axis=1),
+        "litre": sulama_miktari(debi, plan.sum(axis=1) * 60),
+        "cozulemeyen": cozulemeyen,
+    }
+
+
+def saat_listesi(plan_satiri: np.ndarray) -> List[int]:
+    return np.flatnonzero(plan_satiri).tolist()
@@ -0,0 +1,95 @@
+"""
+Sureli (TTL) Bellek Ici Onbellek
+=================================
+Hava durumu, karar ve chatbot katmanlarinin paylastigi basit, thread-safe
+anahtar/deger onbellegi. Her onbellek isabet/iskalama sayaclarini tutar ve
+/metrics endpoint'i icin kendini kaydeder.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+# /metrics icin olusturulan tum onbellekler
+_KAYITLI_ONBELLEKLER: List["TTLCache"] = []
+
+_YOK = object()
+
+
+class TTLCache:
+    """Sure asimi olan, istege bagli boyut sinirli onbellek."""
+
+    def __init__(self, ad: str, ttl_seconds: float, max_entries: Optional[int] = None):
+        self.ad = ad
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._veri: Dict[Hashable, tuple] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        _KAYITLI_ONBELLEKLER.append(self)
+
+    def get(self, key: Hashable, default: Any = None,
+            gecerli_mi: Optional[Callable[[Any], bool]] = None) -> Any:
+        """gecerli_mi verilirse ve False donerse kayit iskalama sayilir (surum uyusmazligi)."""
+        now = time.monotonic()
+        with self._lock:
+            kayit = self._veri.get(key, _YOK)
+            if kayit is not _YOK and kayit[0] > now and (gecerli_mi is None or gecerli_mi(kayit[1])):
+                self.hits += 1
+                return kayit[1]
+            if kayit is not _YOK and kayit[0] > now:
+                self.misses += 1
+                return default
+            if kayit is not _YOK:
+                del self._veri[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        simdi = time.monotonic()
+        bitis = simdi + (self.ttl_seconds if ttl is None else ttl)
+        with self._lock:
+            self._veri[key] = (bitis, value, time.time())
+            if self.max_entries and len(self._veri) > self.max_entries:
+                # En erken dolacak kaydi at
+                en_eski = min(self._veri, key=lambda k: self._veri[k][0])
+                del self._veri[en_eski]
+
+    def yazim_zamani(self, key: Hashable) -> Optional[float]:
+        """Gecerli kaydin yazildigi an (epoch). Kayit yoksa / suresi dolduysa None.
+        Isabet/iskalama sayaclarini etkilemez, surum parmak izi icin kullanilir."""
+        with self._lock:
+            kayit = self._veri.get(key)
+            if kayit is None or kayit[0] <= time.monotonic():
+                return None
+            return kayit[2]
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._veri.pop(key, None)
+
+    def invalidate_where(self, kosul: Callable[[Hashable], bool]) -> int:
+        with self._lock:
+            silinecek = [k for k in self._veri if kosul(k)]
+            for k in silinecek:
+                del self._veri[k]
+        return len(silinecek)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._veri.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        toplam = self.hits + self.misses
+        return {
+            "ad": self.ad,
+            "boyut": len(self._veri),
+            "isabet": self.hits,
+            "iskalama": self.misses,
+            "isabet_orani": round(self.hits / toplam, 4) if toplam else None,
+        }
+
+
+def tum_onbellek_istatistikleri() -> List[Dict[str, Any]]:
+    return [c.stats() for c in _KAYITLI_ONBELLEKLER]
@@ -0,0 +1,497 @@
+"""
+Hava Tahmini Servisi
+====================
+Saatlik tahminin cekilmesi, onbellegi, arsivi ve ayristirilmasi. routers/weather.py
+endpoint'leri, sulama karari (irrigation_decision), nem projeksiyonu
+(moisture_simulator), chatbot baglami ve ML egitimi ayni fonksiyonlari kullanir:
+  - konum_coz              : ilce / koordinat -> (enlem, boylam, konum adi)
+  - saatlik_ham_veri_toplu : onbellekte olmayan konumlari WEATHER_BATCH_SIZE'lik
+                             gruplarla tek istekte ceker, forecast_archive'a yazar
+  - onbellegi_isit         : scheduler'in saatlik on yuklemesi (sinirli paralellik)
+  - saatlik_kolonlar       : Open-Meteo 'hourly' nesnesi -> kolon bazli NumPy dizileri
+  - saatlik_tahmin_olustur : /weather/hourly-forecast cevabi (karar motoru da kullanir)
+  - anlik_hava             : /weather/current cevabi
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import models
+from database import SessionLocal, bulk_upsert
+from services.ttl_cache import TTLCache
+from services.weather_provider import get_weather_provider
+
+logger = logging.getLogger("weather")
+
+# Türkiye'deki popüler ilçelerin koordinatları
+ILCE_KOORDINATLARI = {
+    # Ankara İlçeleri
+    "cankaya": {"lat": 39.9032, "lon": 32.8597, "il": "Ankara"},
+    "kecioren": {"lat": 39.9875, "lon": 32.8697, "il": "Ankara"},
+    "mamak": {"lat": 39.9311, "lon": 32.9136, "il": "Ankara"},
+    "etimesgut": {"lat": 39.9456, "lon": 32.6786, "il": "Ankara"},
+    "sincan": {"lat": 39.9697, "lon": 32.5833, "il": "Ankara"},
+    "yenimahalle": {"lat": 39.9667, "lon": 32.8167, "il": "Ankara"},
+    "polatli": {"lat": 39.5844, "lon": 32.1472, "il": "Ankara"},
+    "haymana": {"lat": 39.4319, "lon": 32.4967, "il": "Ankara"},
+    "beypazari": {"lat": 40.1678, "lon": 31.9214, "il": "Ankara"},
+    "cubuk": {"lat": 40.2358, "lon": 33.0286, "il": "Ankara"},
+
+    # İstanbul İlçeleri
+    "kadikoy": {"lat": 40.9811, "lon": 29.0636, "il": "İstanbul"},
+    "besiktas": {"lat": 41.0422, "lon": 29.0056, "il": "İstanbul"},
+    "uskudar": {"lat": 41.0236, "lon": 29.0153, "il": "İstanbul"},
+    "silivri": {"lat": 41.0733, "lon": 28.2478, "il": "İstanbul"},
+
+    # İzmir İlçeleri
+    "bornova": {"lat": 38.4700, "lon": 27.2200, "il": "İzmir"},
+    "karsiyaka": {"lat": 38.4561, "lon": 27.1119, "il": "İzmir"},
+    "odemis": {"lat": 38.2242, "lon": 27.9714, "il": "İzmir"},
+
+    # Konya İlçeleri
+    "selcuklu": {"lat": 37.9400, "lon": 32.4700, "il": "Konya"},
+    "meram": {"lat": 37.8333, "lon": 32.4333, "il": "Konya"},
+    "eregli": {"lat": 37.5167, "lon": 34.0500, "il": "Konya"},
+    "cumra": {"lat": 37.5722, "lon": 32.7744, "il": "Konya"},
+    "karapinar": {"lat": 37.7167, "lon": 33.5500, "il": "Konya"},
+    "cihanbeyli": {"lat": 38.6558, "lon": 32.9278, "il": "Konya"},
+    "aksehir": {"lat": 38.3575, "lon": 31.4158, "il": "Konya"},
+    "beysehir": {"lat": 37.6786, "lon": 31.7250, "il": "Konya"},
+
+    # Antalya İlçeleri
+    "serik": {"lat": 36.9200, "lon": 31.1000, "il": "Antalya"},
+    "kumluca": {"lat": 36.3667, "lon": 30.2833, "il": "Antalya"},
+
+    # Ağrı İlçeleri
+    "patnos": {"lat": 39.2333, "lon": 43.6833, "il": "Ağrı"},
+    "dogubayazit": {"lat": 39.7217, "lon": 44.0867, "il": "Ağrı"},
+
+    # Diğer önemli tarım ilçeleri
+    "tarsus": {"lat": 36.9167, "lon": 34.8833, "il": "Mersin"},
+    "ceyhan": {"lat": 37.0292, "lon": 35.8125, "il": "Adana"},
+    "akhisar": {"lat": 38.9167, "lon": 27.8333, "il": "Manisa"},
+    "alasehir": {"lat": 38.3500, "lon": 28.5167, "il": "Manisa"},
+}
+
+# Saatlik tahmin onbellegi: scheduler her saat basi doldurur, karar endpoint'leri buradan okur
+WEATHER_CACHE_TTL = int(os.getenv("WEATHER_CACHE_TTL", "3900"))  # saniye (1 saat + pay)
+# Open-Meteo tek istekte virgulle ayrilmis coklu konum kabul eder
+WEATHER_BATCH_SIZE = int(os.getenv("WEATHER_BATCH_SIZE", "50"))
+# Ozel tarla koordinatlari bu izgaraya oturtulur, yakin tarlalar ayni tahmini paylasir
+WEATHER_GRID_DEG = float(os.getenv("WEATHER_GRID_DEG", "0.05"))
+# Arsive yalnizca bu kadar saat ilerisi yazilir (uzak ufuk cok degisir, arsivi sisirir)
+FORECAST_ARCHIVE_HOURS = int(os.getenv("FORECAST_ARCHIVE_HOURS", "48"))
+
+_saatlik_onbellek = TTLCache("hava_saatlik", ttl_seconds=WEATHER_CACHE_TTL)
+
+
+# ============================================================
+# 1. KONUM
+# ============================================================
+
+def ilce_normalize(ilce: str) -> str:
+    """Turkce karakterli ilce adini ILCE_KOORDINATLARI anahtarina cevirir"""
+    return ilce.lower().replace("ı", "i").replace("ş", "s").replace("ç", "c").replace("ğ","g").replace("ü","u").replace("ö","o")
+
+
+def grid_yuvarla(deger: float) -> float:
+    """Koordinati WEATHER_GRID_DEG izgarasina yuvarlar (0 ise oldugu gibi birakir)"""
+    if WEATHER_GRID_DEG <= 0:
+        return round(deger, 4)
+    return round(round(deger / WEATHER_GRID_DEG) * WEATHER_GRID_DEG, 4)
+
+
+def konum_coz(ilce: Optional[str] = None, lat: Optional[float] = None, lon: Optional[float] = None) -> Optional[Tuple[float, float, str]]:
+    """Ilce veya koordinattan (enlem, boylam, konum adi) uretir. Bilinmeyen ilcede None doner."""
+    if ilce:
+        koord = ILCE_KOORDINATLARI.get(ilce_normalize(ilce))
+        if not koord:
+            return None
+        return koord["lat"], koord["lon"], f"{ilce.title()}, {koord['il']}"
+    if lat and lon:
+        return grid_yuvarla(lat), grid_yuvarla(lon), f"Koordinat ({lat}, {lon})"
+    # Varsayilan: Ankara merkez
+    return 39.93, 32.85, "Ankara (Varsayılan)"
+
+
+def _konum_anahtari(latitude: float, longitude: float) -> Tuple[float, float]:
+    return (round(latitude, 4), round(longitude, 4))
+
+
+def arsiv_konum_anahtari(latitude: float, longitude: float) -> str:
+    """forecast_archive.location_key degeri"""
+    la, lo = _konum_anahtari(latitude, longitude)
+    return f"{la:.4f},{lo:.4f}"
+
+
+# ============================================================
+# 2. AYRISTIRMA (Open-Meteo 'hourly' -> NumPy)
+# ============================================================
+
+def _kolon(hourly: dict, ad: str, n: int, bos: float = np.nan, eksik: Optional[float] = None) -> np.ndarray:
+    """Saatlik bir alani n uzunlugunda float dizisine cevirir (None -> bos, dizi kisaysa -> eksik, verilmezse bos)"""
+    degerler = hourly.get(ad) or []
+    dizi = np.full(n, bos if eksik is None else eksik, dtype=float)
+    m = min(n, len(degerler))
+    if m:
+        dizi[:m] = np.asarray(degerler[:m], dtype=float)
+        if not np.isnan(bos):
+            dizi[:m][np.isnan(dizi[:m])] = bos
+    return dizi
+
+
+def saatlik_kolonlar(hourly: dict) -> Dict[str, np.ndarray]:
+    """Open-Meteo 'hourly' nesnesini tek seferde kolon bazli NumPy dizilerine ayristirir."""
+    times = hourly.get("time") or []
+    try:
+        zaman = np.array(times, dtype="datetime64[m]")
+    except (TypeError, ValueError):
+        # Bozuk zaman degerleri NaT olur, sonradan maskelenir
+        zaman = pd.to_datetime(pd.Series(times, dtype=object), format="%Y-%m-%dT%H:%M",
+                               errors="coerce").to_numpy("datetime64[m]")
+    n = len(zaman)
+    return {
+        "zaman": zaman,
+        "sicaklik": _kolon(hourly, "temperature_2m", n),
+        "nem": _kolon(hourly, "relative_humidity_2m", n),
+        "yagis_olasiligi": _kolon(hourly, "precipitation_probability", n),
+        "yagis_mm": _kolon(hourly, "precipitation", n),
+        # Eski donguyle ayni: kod hic yoksa 0 (Acik), null ise bilinmeyen kod
+        "kod": _kolon(hourly, "weathercode", n, bos=-1, eksik=0).astype(int),
+        "ruzgar_hizi": _kolon(hourly, "wind_speed_10m", n),
+        "ruzgar_yonu": _kolon(hourly, "wind_direction_10m", n),
+    }
+
+
+def _ham_degerler(hourly: dict, ad: str, indeksler: list, eksik=None) -> list:
+    """Secili saatlerin ham JSON degerleri (int/float tipi Open-Meteo'daki gibi kalir; dizi kisaysa -> eksik)"""
+    degerler = hourly.get(ad) or []
+    n = len(degerler)
+    return [degerler[i] if i < n else eksik for i in indeksler]
+
+
+def _json_liste(dizi: np.ndarray) -> list:
+    """NaN degerleri None yaparak JSON uyumlu liste doner"""
+    return np.where(np.isnan(dizi), None, dizi).tolist()
+
+
+# ============================================================
+# 3. CEKME + ONBELLEK + ARSIV
+# ============================================================
+
+def tahminleri_arsivle(konum_verileri: Dict[Tuple[float, float], dict]) -> int:
+    """
+    Cekilen saatlik tahminleri forecast_archive'a idempotent yazar.
+    Anahtar: (konum, cekilme saati, hedef saat) - ayni saat icindeki tekrar cekimler uzerine yazar.
+    """
+    simdi = datetime.now()
+    cekilme = simdi.replace(minute=0, second=0, microsecond=0)
+    alt_sinir = cekilme - timedelta(hours=1)
+    ust_sinir = cekilme + timedelta(hours=FORECAST_ARCHIVE_HOURS)
+
+    satirlar = []
+    for (la, lo), data in konum_verileri.items():
+        kolonlar = saatlik_kolonlar(data.get("hourly") or {})
+        zaman = kolonlar["zaman"]
+        secili = np.flatnonzero(~np.isnat(zaman)
+                                & (zaman >= np.datetime64(alt_sinir, "m"))
+                                & (zaman <= np.datetime64(ust_sinir, "m")))
+        if not len(secili):
+            continue
+        anahtar = arsiv_konum_anahtari(la, lo)
+        kodlar = kolonlar["kod"][secili]
+        satirlar.extend(
+            {
+                "location_key": anahtar,
+                "issued_at": cekilme,
+                "target_time": hedef,
+                "rain_probability": p,
+                "expected_rain_amount": mm,
+                "temperature": t,
+                "weather_code": k if k >= 0 else None,
+            }
+            for hedef, p, mm, t, k in zip(
+                zaman[secili].astype("datetime64[s]").tolist(),
+                _json_liste(kolonlar["yagis_olasiligi"][secili]),
+                _json_liste(kolonlar["yagis_mm"][secili]),
+                _json_liste(kolonlar["sicaklik"][secili]),
+                kodlar.tolist(),
+            )
+        )
+
+    if not satirlar:
+        return 0
+    db = SessionLocal()
+    try:
+        bulk_upsert(db, models.ForecastArchive, satirlar,
+                    conflict_cols=["location_key", "issued_at", "target_time"])
+        db.commit()
+    finally:
+        db.close()
+    return len(satirlar)
+
+
+def saatlik_ham_veri_toplu(konumlar: Iterable[Tuple[float, float]], yenile: bool = False,
+                           eszamanlilik: int = 1) -> Dict[Tuple[float, float], dict]:
+    """
+    Konum listesinin saatlik ham cevaplarini doner. Onbellekte olmayanlar
+    WEATHER_BATCH_SIZE'lik gruplar halinde tek istekle cekilip konumlara ayrilir.
+    """
+    anahtarlar = list(dict.fromkeys(_konum_anahtari(la, lo) for la, lo in konumlar))
+    sonuc = {}
+    eksik = []
+    for anahtar in anahtarlar:
+        onbellekte = None if yenile else _saatlik_onbellek.get(anahtar)
+        if onbellekte is not None:
+            sonuc[anahtar] = onbellekte
+        else:
+            eksik.append(anahtar)
+
+    gruplar = [eksik[i:i + WEATHER_BATCH_SIZE] for i in range(0, len(eksik), max(1, WEATHER_BATCH_SIZE))]
+
+    def _grup_cek(grup):
+        cevaplar = get_weather_provider().hourly(grup)
+        for anahtar, data in zip(grup, cevaplar):
+            if "hourly" in data:
+                _saatlik_onbellek.set(anahtar, data)
+        try:
+            tahminleri_arsivle(dict(zip(grup, cevaplar)))
+        except Exception as e:
+            # Arsiv yazilamamasi canli cevabi engellememeli
+            logger.warning(f"Tahmin arşivi yazılamadı: {e}")
+        return dict(zip(grup, cevaplar))
+
+    if len(gruplar) <= 1 or eszamanlilik <= 1:
+        for grup in gruplar:
+            sonuc.update(_grup_cek(grup))
+    else:
+        with ThreadPoolExecutor(max_workers=eszamanlilik) as havuz:
+            for parca in havuz.map(_grup_cek, gruplar):
+                sonuc.update(parca)
+    return sonuc
+
+
+def hava_surumu(ilce: Optional[str] = None, lat: Optional[float] = None, lon: Optional[float] = None) -> Optional[float]:
+    """Konumun onbellekteki tahmininin cekilme zamani (karar parmak izi icin). Yoksa None."""
+    konum = konum_coz(ilce, lat, lon)
+    if not konum:
+        return None
+    return _saatlik_onbellek.yazim_zamani(_konum_anahtari(konum[0], konum[1]))
+
+
+def saatlik_ham_veri(latitude: float, longitude: float, yenile: bool = False) -> dict:
+    """Open-Meteo saatlik ham cevabini onbellekten (yoksa API'den) doner."""
+    return saatlik_ham_veri_toplu([(latitude, longitude)], yenile=yenile)[_konum_anahtari(latitude, longitude)]
+
+
+def onbellegi_isit(konumlar: Iterable[Tuple[float, float]], eszamanlilik: int = 4) -> dict:
+    """Verilen koordinatlarin saatlik tahminini toplu isteklerle, sinirli paralellikle onbellege yazar."""
+    konumlar = list(dict.fromkeys(_konum_anahtari(la, lo) for la, lo in konumlar))
+    gruplar = [konumlar[i:i + WEATHER_BATCH_SIZE] for i in range(0, len(konumlar), max(1, WEATHER_BATCH_SIZE))]
+
+    def _cek(grup):
+        try:
+            veriler = saatlik_ham_veri_toplu(grup, yenile=True)
+            return sum(1 for d in veriler.values() if "hourly" in d)
+        except Exception as e:
+            logger.warning(f"Hava tahmini ön yükleme isteği başarısız ({len(grup)} konum): {e}")
+            return 0
+
+    with ThreadPoolExecutor(max_workers=max(1, eszamanlilik)) as havuz:
+        basarili = sum(havuz.map(_cek, gruplar))
+
+    return {"konum_sayisi": len(konumlar), "istek_sayisi": len(gruplar),
+            "basarili": basarili, "hatali": len(konumlar) - basarili}
+
+
+# ============================================================
+# 4. HAVA KODLARI
+# ============================================================
+
+def ruzgar_yonu_text(derece: float) -> str:
+    """Ruzgar yonu derecesini Turkce metne cevirir"""
+    if derece is None:
+        return ""
+    yonler = ["Kuzey", "Kuzeydoğu", "Doğu", "Güneydoğu", "Güney", "Güneybatı", "Batı", "Kuzeybatı"]
+    idx = round(derece / 45) % 8
+    return yonler[idx]
+
+
+# WMO hava durumu kodlari -> Turkce aciklama (modul seviyesinde, her cagrida yeniden kurulmaz)
+HAVA_KODLARI = {
+    0: {"durum": "Açık", "yagis": False, "emoji": "☀️"},
+    1: {"durum": "Az Bulutlu", "yagis": False, "emoji": "🌤️"},
+    2: {"durum": "Parçalı Bulutlu", "yagis": False, "emoji": "⛅"},
+    3: {"durum": "Kapalı", "yagis": False, "emoji": "☁️"},
+    45: {"durum": "Sisli", "yagis": False, "emoji": "🌫️"},
+    48: {"durum": "Kırağılı Sis", "yagis": False, "emoji": "🌫️"},
+    51: {"durum": "Hafif Çisenti", "yagis": True, "emoji": "🌦️"},
+    53: {"durum": "Orta Çisenti", "yagis": True, "emoji": "🌦️"},
+    55: {"durum": "Yoğun Çisenti", "yagis": True, "emoji": "🌧️"},
+    61: {"durum": "Hafif Yağmur", "yagis": True, "emoji": "🌧️"},
+    63: {"durum": "Orta Yağmur", "yagis": True, "emoji": "🌧️"},
+    65: {"durum": "Şiddetli Yağmur", "yagis": True, "emoji": "🌧️"},
+    66: {"durum": "Hafif Dondurucu Yağmur", "yagis": True, "emoji": "🌨️"},
+    67: {"durum": "Şiddetli Dondurucu Yağmur", "yagis": True, "emoji": "🌨️"},
+    71: {"durum": "Hafif Kar", "yagis": True, "emoji": "❄️"},
+    73: {"durum": "Orta Kar", "yagis": True, "emoji": "❄️"},
+    75: {"durum": "Şiddetli Kar", "yagis": True, "emoji": "❄️"},
+    80: {"durum": "Hafif Sağanak", "yagis": True, "emoji": "🌧️"},
+    81: {"durum": "Orta Sağanak", "yagis": True, "emoji": "🌧️"},
+    82: {"durum": "Şiddetli Sağanak", "yagis": True, "emoji": "⛈️"},
+    95: {"durum": "Gök Gürültülü Fırtına", "yagis": True, "emoji": "⛈️"},
+    96: {"durum": "Dolu ile Fırtına", "yagis": True, "emoji": "⛈️"},
+    99: {"durum": "Şiddetli Dolu Fırtınası", "yagis": True, "emoji": "⛈️"},
+}
+BILINMEYEN_HAVA_KODU = {"durum": "Bilinmiyor", "yagis": False, "emoji": "❓"}
+# Vektorel yagis maskesi icin yagisli kodlar
+YAGISLI_KODLAR = np.array(sorted(k for k, v in HAVA_KODLARI.items() if v["yagis"]))
+
+
+def hava_kodu_aciklama(code: int) -> dict:
+    """WMO hava durumu kodunu Turkce aciklamaya cevirir"""
+    return HAVA_KODLARI.get(code, BILINMEYEN_HAVA_KODU)
+
+
+# ============================================================
+# 5. CEVAPLAR (/weather/current, /weather/hourly-forecast)
+# ============================================================
+
+def anlik_hava(ilce: Optional[str] = None, lat: Optional[float] = None, lon: Optional[float] = None) -> dict:
+    """Anlik hava durumu cevabini uretir. Ilce adi veya koordinat verilebilir."""
+
+    # Koordinatlari belirle
+    konum = konum_coz(ilce, lat, lon)
+    if not konum:
+        return {"hata": f"'{ilce}' ilçesi bulunamadı. Mevcut ilçeler: {list(ILCE_KOORDINATLARI.keys())}"}
+    latitude, longitude, lokasyon = konum
+
+    data = get_weather_provider().current(latitude, longitude)
+
+    current = data.get("current", {})
+    temp = current.get("temperature_2m")
+    windspeed = current.get("wind_speed_10m")
+    winddirection = current.get("wind_direction_10m")
+    weather_code = current.get("weather_code", 0)
+    humidity = current.get("relative_humidity_2m")
+    feels_like = current.get("apparent_temperature")
+
+    hava_bilgi = hava_kodu_aciklama(weather_code)
+
+    return {
+        "konum": lokasyon,
+        "koordinat": {"lat": latitude, "lon": longitude},
+        "sicaklik": temp,
+        "hissedilen": feels_like,
+        "nem": humidity,
+        "ruzgar_hizi": windspeed,
+        "ruzgar_yonu": winddirection,
+        "ruzgar_yonu_text": ruzgar_yonu_text(winddirection),
+        "durum": hava_bilgi["durum"],
+        "emoji": hava_bilgi["emoji"],
+        "yagis_var_mi": hava_bilgi["yagis"],
+        "ham_kod": weather_code,
+        # Eski API uyumlulugu icin
+        "location": lokasyon,
+        "current_temp": temp,
+        "is_it_raining": hava_bilgi["yagis"],
+        "condition_code": weather_code
+    }
+
+
+def saatlik_tahmin_olustur(ilce: Optional[str] = None, lat: Optional[float] = None,
+                           lon: Optional[float] = None, saat: int = 24) -> dict:
+    """Saatlik tahmin cevabini uretir. Karar motoru da bu fonksiyonu dogrudan cagirir."""
+
+    # Koordinatlari belirle
+    konum = konum_coz(ilce, lat, lon)
+    if not konum:
+        return {"hata": f"'{ilce}' ilçesi bulunamadı."}
+    latitude, longitude, lokasyon = konum
+
+    data = saatlik_ham_veri(latitude, longitude)
+
+    hourly = data.get("hourly", {})
+    kolonlar = saatlik_kolonlar(hourly)
+    zaman = kolonlar["zaman"]
+
+    # Su anki saatten itibaren al (sadece gelecekteki saatler, en fazla `saat` adet)
+    now = datetime.now()
+    simdi64 = np.datetime64(now, "s")
+    esik = np.datetime64(now - timedelta(hours=1), "s")
+    secili = np.flatnonzero(~np.isnat(zaman) & (zaman >= esik))[:max(saat, 0)]
+
+    zaman_s = zaman[secili]
+    kodlar = kolonlar["kod"][secili]
+    olasilik = np.nan_to_num(kolonlar["yagis_olasiligi"][secili], nan=0.0)
+    kac_saat_sonra = np.trunc((zaman_s - simdi64) / np.timedelta64(1, "h")).astype(int)
+
+    # Yagis varsa kaydet: WMO kodu yagisli ya da olasilik > %50
+    yagis_maskesi = np.isin(kodlar, YAGISLI_KODLAR) | (olasilik > 50)
+
+    # Kod aciklamalari: her farkli kod icin bir kez bakilir
+    benzersiz, ters = np.unique(kodlar, return_inverse=True)
+    aciklamalar = [hava_kodu_aciklama(int(k)) for k in benzersiz.tolist()]
+    aciklama_s = [aciklamalar[i] for i in ters.tolist()]
+
+    # Open-Meteo "2026-02-05T00:00" formatinda veriyor
+    iso = np.datetime_as_string(zaman_s, unit="m").tolist()
+    # Cevaptaki degerler ham JSON'dan alinir (tam sayi olasilik/nem float'a donmez)
+    idx = secili.tolist()
+    olasilik_l = _ham_degerler(hourly, "precipitation_probability", idx, eksik=0)
+
+    saatlik_tahmin = [
+        {
+            "saat": f"{z[11:13]}:00",
+            "tarih": f"{z[8:10]}/{z[5:7]}",
+            "tam_zaman": f"{z}:00",
+            "sicaklik": sicaklik,
+            "nem": nem,
+            "ruzgar_hizi": ruzgar_hizi,
+            "ruzgar_yonu": ruzgar_yonu,
+            "yagis_olasiligi": p,
+            "beklenen_yagis_mm": mm,
+            "durum": bilgi["durum"],
+            "emoji": bilgi["emoji"],
+            "yagis_var_mi": bilgi["yagis"],
+        }
+        for z, sicaklik, nem, ruzgar_hizi, ruzgar_yonu, p, mm, bilgi in zip(
+            iso,
+            _ham_degerler(hourly, "temperature_2m", idx),
+            _ham_degerler(hourly, "relative_humidity_2m", idx),
+            _ham_degerler(hourly, "wind_speed_10m", idx),
+            _ham_degerler(hourly, "wind_direction_10m", idx),
+            olasilik_l,
+            _ham_degerler(hourly, "precipitation", idx, eksik=0),
+            aciklama_s,
+        )
+    ]
+
+    yagis_idx = np.flatnonzero(yagis_maskesi)
+    yagis_saatleri = [
+        {"saat": f"{iso[i][11:13]}:00", "kac_saat_sonra": int(kac_saat_sonra[i]), "olasilik": olasilik_l[i]}
+        for i in yagis_idx.tolist()
+    ]
+    yagis_kac_saat = kac_saat_sonra[yagis_idx]
+
+    # Ilk yagis ne zaman?
+    ilk_yagis = yagis_saatleri[0] if yagis_saatleri else None
+
+    return {
+        "konum": lokasyon,
+        "koordinat": {"lat": latitude, "lon": longitude},
+        "tahmin_saati": now.strftime("%H:%M"),
+        "toplam_saat": len(saatlik_tahmin),
+        "saatlik_tahmin": saatlik_tahmin,
+        "yagis_beklenen_saatler": yagis_saatleri,
+        "ilk_yagis": ilk_yagis,
+        "onumuzdeki_6_saat_yagis": bool(np.any(yagis_kac_saat <= 6)),
+        "onumuzdeki_3_saat_yagis": bool(np.any(yagis_kac_saat <= 3)),
+        "onumuzdeki_1_saat_yagis": bool(np.any(yagis_kac_saat <= 1)),
+    }
@@ -0,0 +1,273 @@
+"""
+Hava Durumu Saglayicilari
+=========================
+services/weather.py upstream'e dogrudan gitmez, buradaki saglayici arayuzunu kullanir:
+
+  - OpenMeteoProvider : Gercek api.open-meteo.com (uzun omurlu HTTP oturumu)
+  - ReplayWeatherProvider : Ag gerektirmeyen, deterministik kayit/sentetik veri
+                            (yuk testi ve CI icin gecikme + hata enjeksiyonu)
+
+Secim WEATHER_PROVIDER ortam degiskeni ile yapilir: "open-meteo" (varsayilan) veya "replay".
+
+Replay ayarlari:
+  WEATHER_REPLAY_DIR         hourly_{lat}_{lon}.json / hourly.json kayitlarinin dizini (opsiyonel)
+  WEATHER_REPLAY_LATENCY_MS  her istege eklenen yapay gecikme
+  WEATHER_REPLAY_ERROR_RATE  0-1 arasi hata orani
+  WEATHER_REPLAY_SEED        hata dizisi ve sentetik veri icin seed
+Enjekte hata karari (seed, istek turu + konum, o konuma kacinci istek) ozetinden turetilir;
+istekler thread havuzunda hangi sirayla gelirse gelsin ayni konum ayni hata dizisini gorur.
+Open-Meteo cevaplarini kayda almak icin WEATHER_RECORD_DIR verilebilir.
+"""
+
+import datetime
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import requests
+
+SAATLIK_PARAMETRELER = "temperature_2m,relative_humidity_2m,precipitation_probability,precipitation,weathercode,wind_speed_10m,wind_direction_10m"
+ANLIK_PARAMETRELER = "temperature_2m,relative_humidity_2m,apparent_temperature,wind_speed_10m,wind_direction_10m,weather_code"
+TAHMIN_GUN = 6
+
+
+class WeatherProviderError(Exception):
+    """Saglayici veri donduremediginde (ag, upstream hatasi, enjekte hata) firlatilir."""
+
+
+def kayit_dosya_adi(latitude: float, longitude: float) -> str:
+    return f"hourly_{latitude:.4f}_{longitude:.4f}.json"
+
+
+class WeatherProvider(ABC):
+    """Saglayici arayuzu. Donen veri Open-Meteo JSON bicimindedir."""
+
+    ad = "base"
+
+    @abstractmethod
+    def hourly(self, konumlar: List[Tuple[float, float]]) -> List[dict]:
+        """Konum sirasiyla saatlik tahmin cevaplari."""
+
+    @abstractmethod
+    def current(self, latitude: float, longitude: float) -> dict:
+        """Anlik hava durumu cevabi ("current" anahtari ile)."""
+
+
+# ============================================================
+# 1. OPEN-METEO
+# ============================================================
+
+class OpenMeteoProvider(WeatherProvider):
+    ad = "open-meteo"
+
+    def __init__(self, base_url: str = "https://api.open-meteo.com/v1/forecast",
+                 timeout: float = 10.0, kayit_dizini: Optional[str] = None):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.kayit_dizini = Path(kayit_dizini) if kayit_dizini else None
+        # Baglanti havuzu: her istekte yeni TCP/TLS kurulmasin
+        self._session = requests.Session()
+
+    def hourly(self, konumlar: List[Tuple[float, float]]) -> List[dict]:
+        params = {
+            "latitude": ",".join(str(la) for la, _ in konumlar),
+            "longitude": ",".join(str(lo) for _, lo in konumlar),
+            "hourly": SAATLIK_PARAMETRELER,
+            "forecast_days": TAHMIN_GUN,
+            "timezone": "Europe/Istanbul",
+        }
+        try:
+            data = self._session.get(self.base_url, params=params, timeout=self.timeout).json()
+        except (requests.RequestException, ValueError) as e:
+            raise WeatherProviderError(f"Open-Meteo erişilemedi: {e}") from e
+
+        # Tek konumda nesne, coklu konumda liste doner
+        if isinstance(data, dict):
+            if data.get("error"):
+                raise WeatherProviderError(f"Open-Meteo hatası: {data.get('reason')}")
+            data = [data]
+        if len(data) != len(konumlar):
+            raise WeatherProviderError(f"Open-Meteo {len(konumlar)} konum yerine {len(data)} sonuç döndü")
+
+        if self.kayit_dizini:
+            self.kayit_dizini.mkdir(parents=True, exist_ok=True)
+            for (la, lo), payload in zip(konumlar, data):
+                with open(self.kayit_dizini / kayit_dosya_adi(la, lo), "w", encoding="utf-8") as f:
+                    json.dump(payload, f, ensure_ascii=False)
+        return data
+
+    def current(self, latitude: float, longitude: float) -> dict:
+        params = {
+            "latitude": latitude,
+            "longitude": longitude,
+            "current": ANLIK_PARAMETRELER,
+            "timezone": "Europe/Istanbul",
+        }
+        try:
+            return self._session.get(self.base_url, params=params, timeout=self.timeout).json()
+        except (requests.RequestException, ValueError) as e:
+            raise WeatherProviderError(f"Open-Meteo erişilemedi: {e}") from e
+
+
+# ============================================================
+# 2. REPLAY / SENTETIK (OFFLINE)
+# ============================================================
+
+class ReplayWeatherProvider(WeatherProvider):
+    """
+    Kayitli Open-Meteo cevaplarini (yoksa sentetik veriyi) bugunun tarihine
+    kaydirarak sunar. Ayni seed + ayni gun = ayni cevap.
+    """
+
+    ad = "replay"
+
+    def __init__(self, fixture_dir: Optional[str] = None, latency_ms: float = 0.0,
+                 error_rate: float = 0.0, seed: int = 42):
+        self.fixture_dir = Path(fixture_dir) if fixture_dir else None
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.seed = seed
+        self._istek_sayilari = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def _hata_mi(self, tur: str, konumlar: List[Tuple[float, float]]) -> bool:
+        """(seed, istek turu + konum(lar), bu anahtara kacinci istek) ozetinden [0, 1) degeri error_rate ile karsilastirir."""
+        anahtar = tur + ":" + ";".join(f"{la:.4f},{lo:.4f}" for la, lo in konumlar)
+        with self._lock:
+            sira = self._istek_sayilari[anahtar]
+            self._istek_sayilari[anahtar] += 1
+        ozet = hashlib.sha256(f"{self.seed}:{anahtar}:{sira}".encode()).hexdigest()[:8]
+        return int(ozet, 16) / 0x100000000 < self.error_rate
+
+    def _istek_simule_et(self, tur: str, konumlar: List[Tuple[float, float]]):
+        if self.latency_ms > 0:
+            time.sleep(self.latency_ms / 1000.0)
+        if self.error_rate > 0 and self._hata_mi(tur, konumlar):
+            raise WeatherProviderError("Replay: enjekte edilmiş upstream hatası")
+
+    def _kayit_oku(self, latitude: float, longitude: float) -> Optional[dict]:
+        if not self.fixture_dir:
+            return None
+        for ad in (kayit_dosya_adi(latitude, longitude), "hourly.json"):
+            yol = self.fixture_dir / ad
+            if yol.exists():
+                with open(yol, "r", encoding="utf-8") as f:
+                    return json.load(f)
+        return None
+
+    @staticmethod
+    def _bugune_kaydir(payload: dict) -> dict:
+        """Kayittaki saat dizisini bugun 00:00'dan baslayacak sekilde kaydirir (saat-of-day korunur)."""
+        hourly = dict(payload.get("hourly") or {})
+        times = hourly.get("time") or []
+        if not times:
+            return payload
+        ilk = datetime.datetime.strptime(times[0], "%Y-%m-%dT%H:%M")
+        bugun = datetime.datetime.now().replace(hour=ilk.hour, minute=0, second=0, microsecond=0)
+        hourly["time"] = [
+            (bugun + datetime.timedelta(hours=i)).strftime("%Y-%m-%dT%H:%M") for i in range(len(times))
+        ]
+        return {**payload, "hourly": hourly}
+
+    def _sentetik(self, latitude: float, longitude: float) -> dict:
+        """Konuma ozel deterministik gunluk sicaklik dongusu + yagis atlari."""
+        tohum = int(hashlib.sha256(f"{self.seed}:{latitude:.4f}:{longitude:.4f}".encode()).hexdigest()[:8], 16)
+        rng = random.Random(tohum)
+        baslangic = datetime.datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        taban = 5 + (42 - latitude) * 2 + rng.uniform(-3, 3)
+
+        # 6 gunde 1-3 yagis epizodu
+        epizotlar = [(rng.randint(0, TAHMIN_GUN * 24 - 6), rng.randint(2, 8)) for _ in range(rng.randint(1, 3))]
+
+        saat_sayisi = TAHMIN_GUN * 24
+        hourly = {k: [] for k in ("time", "temperature_2m", "relative_humidity_2m", "precipitation_probability",
+                                  "precipitation", "weathercode", "wind_speed_10m", "wind_direction_10m")}
+        for i in range(saat_sayisi):
+            zaman = baslangic + datetime.timedelta(hours=i)
+            yagisli = any(b <= i < b + s for b, s in epizotlar)
+            gunluk = math.sin(2 * math.pi * (zaman.hour - 9) / 24)
+            hourly["time"].append(zaman.strftime("%Y-%m-%dT%H:%M"))
+            hourly["temperature_2m"].append(round(taban + 6 * gunluk + rng.uniform(-1, 1), 1))
+            hourly["relative_humidity_2m"].append(int(min(100, max(20, 60 - 15 * gunluk + (25 if yagisli else 0)))))
+            hourly["precipitation_probability"].append(rng.randint(60, 95) if yagisli else rng.randint(0, 25))
+            hourly["precipitation"].append(round(rng.uniform(0.5, 4.0), 1) if yagisli else 0.0)
+            hourly["weathercode"].append(rng.choice([61, 63, 80]) if yagisli else rng.choice([0, 1, 2, 3]))
+            hourly["wind_speed_10m"].append(round(rng.uniform(2, 20), 1))
+            hourly["wind_direction_10m"].append(rng.randint(0, 359))
+
+        return {"latitude": latitude, "longitude": longitude, "timezone": "Europe/Istanbul", "hourly": hourly}
+
+    def _saatlik(self, latitude: float, longitude: float) -> dict:
+        kayit = self._kayit_oku(latitude, longitude)
+        return self._bugune_kaydir(kayit) if kayit else self._sentetik(latitude, longitude)
+
+    def hourly(self, konumlar: List[Tuple[float, float]]) -> List[dict]:
+        self._istek_simule_et("hourly", konumlar)
+        return [self._saatlik(la, lo) for la, lo in konumlar]
+
+    def current(self, latitude: float, longitude: float) -> dict:
+        self._istek_simule_et("current", [(latitude, longitude)])
+        hourly = self._saatlik(latitude, longitude)["hourly"]
+        simdi = datetime.datetime.now().strftime("%Y-%m-%dT%H:00")
+        i = hourly["time"].index(simdi) if simdi in hourly["time"] else 0
+        return {
+            "latitude": latitude,
+            "longitude": longitude,
+            "current": {
+                "time": hourly["time"][i],
+                "temperature_2m": hourly["temperature_2m"][i],
+                "relative_humidity_2m": hourly["relative_humidity_2m"][i],
+                "apparent_temperature": hourly["temperature_2m"][i],
+                "wind_speed_10m": hourly["wind_speed_10m"][i],
+                "wind_direction_10m": hourly["wind_direction_10m"][i],
+                "weather_code": hourly["weathercode"][i],
+            },
+        }
+
+
+# ============================================================
+# 3. AKTIF SAGLAYICI
+# ============================================================
+
+_aktif_saglayici: Optional[WeatherProvider] = None
+_saglayici_lock = threading.Lock()
+
+
+def _ortamdan_saglayici() -> WeatherProvider:
+    tur = os.getenv("WEATHER_PROVIDER", "open-meteo").lower()
+    if tur == "replay":
+        return ReplayWeatherProvider(
+            fixture_dir=os.getenv("WEATHER_REPLAY_DIR") or None,
+            latency_ms=float(os.getenv("WEATHER_REPLAY_LATENCY_MS", "0")),
+            error_rate=float(os.getenv("WEATHER_REPLAY_ERROR_RATE", "0")),
+            seed=int(os.getenv("WEATHER_REPLAY_SEED", "42")),
+        )
+    return OpenMeteoProvider(
+        base_url=os.getenv("OPEN_METEO_URL", "https://api.open-meteo.com/v1/forecast"),
+        timeout=float(os.getenv("WEATHER_TIMEOUT", "10")),
+        kayit_dizini=os.getenv("WEATHER_RECORD_DIR") or None,
+    )
+
+
+def get_weather_provider() -> WeatherProvider:
+    global _aktif_saglayici
+    if _aktif_saglayici is None:
+        with _saglayici_lock:
+            if _aktif_saglayici is None:
+                _aktif_saglayici = _ortamdan_saglayici()
+    return _aktif_saglayici
+
+
+def set_weather_provider(saglayici: WeatherProvider) -> None:
+    """Testlerde / benchmark'ta saglayiciyi degistirmek icin."""
+    global _aktif_saglayici
+    with _saglayici_lock:
+        _aktif_saglayici = saglayici
@@ -0,0 +1,61 @@
+"""services/answer_cache: birebir ve benzer soru eslesmesi."""
+
+import pytest
+
+from services import answer_cache
+
+KAPSAM = ("tarla", 1, "parmakizi")
+
+
+@pytest.fixture(autouse=True)
+def _temiz_onbellek():
+    answer_cache.temizle()
+    yield
+    answer_cache.temizle()
+
+
+@pytest.fixture
+def benzer_eslesme(monkeypatch):
+    monkeypatch.setattr(answer_cache, "ANSWER_CACHE_SEMANTIC", True)
+
+
+def test_varsayilan_birebir_eslesme():
+    assert answer_cache.ANSWER_CACHE_SEMANTIC is False
+
+
+@pytest.mark.parametrize("soru", [
+    "Bugün sulamalı mıyım?",
+    "bugün sulamalı mıyım",
+    "BUGÜN  SULAMALI MIYIM!!",
+])
+def test_normalize_edilmis_soru_isabet(soru):
+    answer_cache.kaydet(KAPSAM, "Bugün sulamalı mıyım?", "cevap")
+    assert answer_cache.bul(KAPSAM, soru) == "cevap"
+
+
+@pytest.mark.parametrize("kayitli, soru", [
+    ("Bugün sulamalı mıyım?", "Bugün sulamamalı mıyım?"),
+    ("Domates çok su ister mi?", "Domates çok su istemez mi?"),
+    ("Buğday bu toprakta yetişir mi?", "Buğday bu toprakta yetişmez mi?"),
+    ("Domates için en iyi toprak hangisi?", "Domates için en kötü toprak hangisi?"),
+])
+@pytest.mark.parametrize("semantik", [False, True])
+def test_zit_anlamli_soru_iskalar(monkeypatch, kayitli, soru, semantik):
+    monkeypatch.setattr(answer_cache, "ANSWER_CACHE_SEMANTIC", semantik)
+    answer_cache.kaydet(KAPSAM, kayitli, "cevap")
+    assert answer_cache.bul(KAPSAM, soru) is None
+
+
+@pytest.mark.parametrize("kayitli, soru", [
+    ("Biber için en uygun sulama saati hangisi?", "Biber için en uygun sulama saati hangisi acaba?"),
+    ("Domates ne kadar su ister?", "Peki domates ne kadar su ister?"),
+    ("Domates ne kadar su ister?", "Ne kadar su ister domates?"),
+])
+def test_dolgu_kelimesi_farki_benzer_eslesmede_isabet(benzer_eslesme, kayitli, soru):
+    answer_cache.kaydet(KAPSAM, kayitli, "cevap")
+    assert answer_cache.bul(KAPSAM, soru) == "cevap"
+
+
+def test_farkli_kapsam_iskalar(benzer_eslesme):
+    answer_cache.kaydet(KAPSAM, "Bugün sulamalı mıyım?", "cevap")
+    assert answer_cache.bul(("tarla", 2, "parmakizi"), "Bugün sulamalı mıyım?") is None
@@ -0,0 +1,43 @@
+"""services/chat_intents: hizli yol siniflandiricisi."""
+
+import pytest
+
+from services import chat_intents
+
+
+@pytest.mark.parametrize("soru, niyet", [
+    ("Nem kaç?", "nem"),
+    ("Toprak nemi ne durumda?", "nem"),
+    ("Nem yüzde kaç", "nem"),
+    ("Sıcaklık kaç derece?", "sicaklik"),
+    ("Tarlada sıcaklık ne?", "sicaklik"),
+    ("Pompa açık mı?", "pompa"),
+    ("Pompa çalışıyor mu?", "pompa"),
+    ("Yağmur ne zaman yağacak?", "yagmur"),
+    ("Yarın yağmur var mı?", "yagmur"),
+    ("Yağış bekleniyor mu?", "yagmur"),
+])
+def test_anlik_soru_sablona_gider(soru, niyet):
+    assert chat_intents.niyet_bul(soru) == niyet
+
+
+@pytest.mark.parametrize("soru", [
+    # gelecek zaman
+    "Yarın sıcaklık kaç olacak?",
+    "Yarın nem kaç?",
+    "Nem ne zaman düşer?",
+    "Pompa ne zaman açılacak?",
+    "Sulamadan sonra nem kaç?",
+    # hedef / olmasi gereken deger
+    "sıcaklık ne olmalı domates için",
+    "Domates için ideal nem ne?",
+    "Pompa ne zaman açılmalı?",
+    "Biber için uygun sıcaklık kaç derece?",
+    # tavsiye / aciklama
+    "Neden nem bu kadar düşük?",
+    "Pompa açık mı, sulama gerekli mi?",
+    # birden fazla niyet
+    "Nem ve sıcaklık kaç?",
+])
+def test_acik_uclu_soru_llme_gider(soru):
+    assert chat_intents.niyet_bul(soru) is None
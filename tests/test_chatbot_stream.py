@@ -0,0 +1,129 @@
+"""routers/chatbot: /chatbot/message/stream SSE akisi (token sirasi, done, hata, istemci kopmasi)."""
+
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers import chatbot
+from services import llm_provider
+from services.llm_provider import LLMProvider, LLMProviderError, StubLLMProvider
+
+MESAJLAR = [
+    {"role": "system", "content": "📊 ANLIK: Nem %30.0, Sıcaklık 12.0°C\nDurum: İDEAL"},
+    {"role": "user", "content": "Tarlam nasıl?"},
+]
+ISTEK = {"user_id": 1, "field_id": 1, "message": "Tarlam nasıl?"}
+
+
+class KayitliSaglayici(LLMProvider):
+    """Verilen parcalari akitir; hata verilirse parcalardan sonra firlatir, kapanisi kaydeder."""
+
+    ad = "test"
+
+    def __init__(self, parcalar, hata=None):
+        self.parcalar = parcalar
+        self.hata = hata
+        self.uretilen = 0
+        self.kapandi = False
+
+    def complete(self, messages):
+        return "".join(self.parcalar)
+
+    def stream(self, messages):
+        try:
+            for p in self.parcalar:
+                self.uretilen += 1
+                yield p
+            if self.hata:
+                raise self.hata
+        finally:
+            self.kapandi = True
+
+
+@pytest.fixture
+def kayitlar(monkeypatch):
+    """DB yerine sabit mesaj listesi; kaydedilen turlar listede toplanir."""
+    kaydedilen = []
+
+    def hazirla(req, db):
+        return list(MESAJLAR), None, None, None
+
+    def kaydet(req, konusma_id, cevap):
+        kaydedilen.append((req.message, cevap))
+        return 42
+
+    monkeypatch.setattr(chatbot, "_mesajlari_hazirla", hazirla)
+    monkeypatch.setattr(chatbot, "_turu_kaydet_yeni_oturum", kaydet)
+    onceki = llm_provider._aktif_saglayici
+    yield kaydedilen
+    llm_provider.set_llm_provider(onceki)
+
+
+@pytest.fixture
+def istemci():
+    app = FastAPI()
+    app.include_router(chatbot.router)
+    app.dependency_overrides[chatbot.get_db] = lambda: None
+    return TestClient(app)
+
+
+def _olaylar(govde: str):
+    olaylar = []
+    for blok in govde.strip().split("\n\n"):
+        satirlar = dict(s.split(": ", 1) for s in blok.splitlines())
+        olaylar.append((satirlar["event"], json.loads(satirlar["data"])))
+    return olaylar
+
+
+def test_tokenlar_sirayla_ve_done(kayitlar, istemci):
+    saglayici = StubLLMProvider()
+    llm_provider.set_llm_provider(saglayici)
+    beklenen = list(saglayici.stream(MESAJLAR))
+
+    cevap = istemci.post("/chatbot/message/stream", json=ISTEK)
+
+    assert cevap.headers["content-type"].startswith("text/event-stream")
+    olaylar = _olaylar(cevap.text)
+    assert [v["content"] for t, v in olaylar if t == "token"] == beklenen
+    assert olaylar[-1] == ("done", {"reply": saglayici.complete(MESAJLAR), "conversation_id": 42})
+    assert kayitlar == [(ISTEK["message"], saglayici.complete(MESAJLAR))]
+
+
+def test_saglayici_hatasi_hata_olayi(kayitlar, istemci):
+    llm_provider.set_llm_provider(KayitliSaglayici(["Merhaba ", "çiftçi"], hata=LLMProviderError("upstream 503")))
+
+    olaylar = _olaylar(istemci.post("/chatbot/message/stream", json=ISTEK).text)
+
+    assert [t for t, _ in olaylar] == ["token", "token", "hata"]
+    assert "upstream 503" in olaylar[-1][1]["detail"]
+    assert kayitlar == []
+
+
+class _KopanIstek:
+    """n kez bagli, sonra kopmus gorunen istek."""
+
+    def __init__(self, n):
+        self.n = n
+
+    async def is_disconnected(self):
+        self.n -= 1
+        return self.n < 0
+
+
+def test_istemci_kopunca_upstream_kapanir_tur_kaydedilmez(kayitlar):
+    saglayici = KayitliSaglayici([f"parca{i} " for i in range(10)])
+    llm_provider.set_llm_provider(saglayici)
+
+    async def calistir():
+        yanit = await chatbot.send_message_stream(chatbot.ChatRequest(**ISTEK), _KopanIstek(2), db=None)
+        return [parca async for parca in yanit.body_iterator]
+
+    gelen = asyncio.run(calistir())
+
+    assert len(gelen) == 2
+    assert saglayici.kapandi
+    assert saglayici.uretilen < len(saglayici.parcalar)
+    assert kayitlar == []